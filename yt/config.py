@@ -51,6 +51,8 @@ ytcfg_defaults = dict(
     thread_field_detection="False",
     ignore_invalid_unit_operation_errors="False",
     chunk_size="1000",
+    field_data_cache_size="0",
+    image_cache_size="0",
     xray_data_dir="/does/not/exist",
     supp_data_dir="/does/not/exist",
     default_colormap="arbre",
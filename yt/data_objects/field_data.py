@@ -1,6 +1,79 @@
+from collections import OrderedDict
+
+
 class YTFieldData(dict):
     """
     A Container object for field data, instead of just having it be a dict.
     """
 
     pass
+
+
+class FieldDataCache:
+    """
+    A memory-bounded, least-recently-used cache of field data shared by all
+    the data objects of a dataset.
+
+    Entries are keyed on the field name, followed by a key identifying the
+    data object that read them (its selector and field parameters), so that
+    two data objects selecting the same data share their fields. Arrays are
+    copied when they are stored and when they are returned, so that
+    modifying the field data of an object does not affect the cache.
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum amount of data held in the cache, in bytes. The cache
+        is disabled when this is 0.
+    """
+
+    def __init__(self, max_size=0):
+        self.max_size = max_size
+        self.size = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get(self, key):
+        """Return a copy of the data stored under key, or None."""
+        data = self._entries.get(key)
+        if data is None:
+            return None
+        self._entries.move_to_end(key)
+        return data.copy()
+
+    def set(self, key, data):
+        """Store a copy of data under key, evicting the least recently used
+        entries to stay below max_size."""
+        self.pop(key)
+        if data.nbytes > self.max_size:
+            return
+        self._entries[key] = data.copy()
+        self.size += data.nbytes
+        while self.size > self.max_size:
+            _, old = self._entries.popitem(last=False)
+            self.size -= old.nbytes
+
+    def pop(self, key):
+        data = self._entries.pop(key, None)
+        if data is not None:
+            self.size -= data.nbytes
+        return data
+
+    def invalidate(self, field=None):
+        """Drop the entries of a given field, or all of them if field is
+        None."""
+        if field is None:
+            self._entries.clear()
+            self.size = 0
+            return
+        for key in [key for key in self._entries if key[0] == field]:
+            self.pop(key)
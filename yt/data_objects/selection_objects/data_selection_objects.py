@@ -32,6 +32,13 @@ from yt.utilities.parallel_tools.parallel_analysis_interface import (
 )
 
 
+def _field_parameter_key(value):
+    if isinstance(value, np.ndarray):
+        units = str(getattr(value, "units", ""))
+        return (units, value.dtype.str, value.shape, value.tobytes())
+    return repr(value)
+
+
 class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface):
     _locked = False
     _sort_by = None
@@ -172,6 +179,18 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface):
                 fields_to_generate.append(field)
                 continue
             fields_to_get.append(field)
+        # Fields already read by an object with the same selection are
+        # taken from the dataset-wide cache
+        cache_key = self._field_data_cache_key()
+        if cache_key is not None:
+            cache = self.ds.field_data_cache
+            for field_list in (fields_to_get, fields_to_generate):
+                for field in field_list[:]:
+                    data = cache.get((field,) + cache_key)
+                    if data is not None:
+                        self.field_data[field] = data
+                        field_list.remove(field)
+            cached_fields = fields_to_get + fields_to_generate
         if len(fields_to_get) == 0 and len(fields_to_generate) == 0:
             return
         elif self._locked:
@@ -197,22 +216,51 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface):
             fluids, self, self._current_chunk
         )
         for f, v in read_fluids.items():
-            self.field_data[f] = self.ds.arr(v, units=finfos[f].units)
-            self.field_data[f].convert_to_units(finfos[f].output_units)
+            self.field_data[f] = self.ds._field_data_in_units(
+                v, finfos[f].units, finfos[f].output_units
+            )
 
         read_particles, gen_particles = self.index._read_particle_fields(
             particles, self, self._current_chunk
         )
 
         for f, v in read_particles.items():
-            self.field_data[f] = self.ds.arr(v, units=finfos[f].units)
-            self.field_data[f].convert_to_units(finfos[f].output_units)
+            self.field_data[f] = self.ds._field_data_in_units(
+                v, finfos[f].units, finfos[f].output_units
+            )
 
         fields_to_generate += gen_fluids + gen_particles
         self._generate_fields(fields_to_generate)
         for field in list(self.field_data.keys()):
             if field not in ofields:
                 self.field_data.pop(field)
+        if cache_key is not None:
+            for field in cached_fields:
+                if field not in self.field_data:
+                    continue
+                cache.set((field,) + cache_key, self.field_data[field])
+
+    def _field_data_cache_key(self):
+        # The dataset-wide cache is only used when the whole object is read
+        # at once, outside of any particle filter
+        if not self.ds.field_data_cache.enabled:
+            return None
+        if self._current_chunk.chunk_type != "all":
+            return None
+        if (
+            self._current_particle_type != "all"
+            or self._current_fluid_type != self.ds.default_fluid_type
+        ):
+            return None
+        try:
+            selector_hash = hash(self.selector)
+        except NotImplementedError:
+            return None
+        field_parameters = tuple(
+            (name, _field_parameter_key(value))
+            for name, value in sorted(self.field_parameters.items())
+        )
+        return (type(self.selector).__name__, selector_hash, field_parameters)
 
     def _generate_fields(self, fields_to_generate):
         index = 0
@@ -259,7 +307,9 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface):
                             units,
                         )
                     try:
-                        fd.convert_to_units(fi.units)
+                        # Skip the (no-op) conversion if the units match
+                        if str(fd.units) != fi.units or fd.dtype.kind != "f":
+                            fd.convert_to_units(fi.units)
                     except AttributeError:
                         # If the field returns an ndarray, coerce to a
                         # dimensionless YTArray and verify that field is
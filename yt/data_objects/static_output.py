@@ -12,6 +12,7 @@ import numpy as np
 from unyt.exceptions import UnitConversionError, UnitParseError
 
 from yt.config import ytcfg
+from yt.data_objects.field_data import FieldDataCache
 from yt.data_objects.particle_filters import filter_registry
 from yt.data_objects.particle_unions import ParticleUnion
 from yt.data_objects.region_expression import RegionExpression
@@ -37,6 +38,7 @@ from yt.geometry.coordinates.api import (
     SpectralCubeCoordinateHandler,
     SphericalCoordinateHandler,
 )
+from yt.geometry.coordinates.image_cache import get_image_cache
 from yt.units import UnitContainer, _wrap_display_ytarray, dimensions
 from yt.units.dimensions import current_mks
 from yt.units.unit_object import Unit, define_unit
@@ -984,11 +986,16 @@ class Dataset(abc.ABC):
 
         """
         # If an optimized version exists on the Index object we'll use that
-        try:
+        if hasattr(self.index, "_find_field_values_at_points"):
             return self.index._find_field_values_at_points(fields, coords)
-        except AttributeError:
-            pass
 
+        out = self._find_field_values_at_each_point(fields, coords)
+        if len(out) == 1:
+            return out[0]
+        else:
+            return out
+
+    def _find_field_values_at_each_point(self, fields, coords):
         fields = list(iter_fields(fields))
         out = []
 
@@ -998,10 +1005,7 @@ class Dataset(abc.ABC):
             out.append(self.arr(np.empty((len(coords),)), funit))
             for coord_index, coord in enumerate(coords):
                 out[field_index][coord_index] = self.point(coord)[field]
-        if len(fields) == 1:
-            return out[0]
-        else:
-            return out
+        return out
 
     # Now all the object related stuff
     def all_data(self, find_max=False, **kwargs):
@@ -1362,6 +1366,92 @@ class Dataset(abc.ABC):
         self._units = UnitContainer(self.unit_registry)
         return self._units
 
+    _unit_conversions = None
+
+    def _get_unit_conversion(self, units, output_units):
+        """Return the output unit, conversion factor and offset to convert
+        data from units to output_units.
+
+        The result is cached for each pair of units and invalidated when
+        the unit registry changes. None is returned when the conversion is
+        not a simple scaling (e.g. between electromagnetic unit systems).
+        """
+        current_uid = self.unit_registry.unit_system_id
+        if self._unit_conversions is None or self._unit_conversions[0] != current_uid:
+            self._unit_conversions = (current_uid, {})
+        cache = self._unit_conversions[1]
+        key = (str(units), str(output_units))
+        if key not in cache:
+            in_unit = Unit(units, registry=self.unit_registry)
+            out_unit = Unit(output_units, registry=self.unit_registry)
+            try:
+                factor, offset = in_unit.get_conversion_factor(out_unit)
+            except UnitConversionError:
+                cache[key] = None
+            else:
+                cache[key] = (out_unit, factor, offset)
+        return cache[key]
+
+    def _field_data_in_units(self, data, units, output_units):
+        """Attach units to freshly read field data, in output_units.
+
+        The conversion is applied by scaling the data buffer in place
+        (when it is writeable) rather than by creating a new array.
+        """
+        conversion = None
+        if type(data) is np.ndarray and data.dtype.kind == "f":
+            conversion = self._get_unit_conversion(units, output_units)
+        if conversion is None:
+            arr = self.arr(data, units=units)
+            arr.convert_to_units(output_units)
+            return arr
+        out_unit, factor, offset = conversion
+        if factor != 1.0:
+            if data.flags.writeable:
+                data *= factor
+            else:
+                data = data * factor
+        if offset:
+            np.subtract(data, offset, data)
+        return self.arr(data, units=out_unit)
+
+    _field_data_cache = None
+
+    @property
+    def field_data_cache(self):
+        """The cache of field data shared by the data objects of this dataset.
+
+        Its size is set by the ``field_data_cache_size`` configuration
+        option (in megabytes). It is emptied when the unit registry changes
+        and when a field is added; use ``invalidate`` to empty it explicitly.
+        """
+        current_uid = self.unit_registry.unit_system_id
+        if self._field_data_cache is None:
+            max_size = ytcfg.getfloat("yt", "field_data_cache_size")
+            self._field_data_cache = (
+                current_uid,
+                FieldDataCache(int(max_size * 1024 ** 2)),
+            )
+        elif self._field_data_cache[0] != current_uid:
+            cache = self._field_data_cache[1]
+            cache.invalidate()
+            self._field_data_cache = (current_uid, cache)
+        return self._field_data_cache[1]
+
+    _image_cache = None
+
+    @property
+    def image_cache(self):
+        """The cache of the images pixelized from the 2D data objects of this
+        dataset, which lets panned and zoomed windows reuse them.
+
+        Its size is set by the ``image_cache_size`` configuration option (in
+        megabytes), and it is disabled by default. Set its ``max_bytes``
+        attribute to enable it for this dataset, and use ``clear`` to empty
+        it.
+        """
+        return get_image_cache(self)
+
     _arr = None
 
     @property
@@ -1510,6 +1600,9 @@ class Dataset(abc.ABC):
         self.field_info._show_field_errors.append(name)
         deps, _ = self.field_info.check_derived_fields([name])
         self.field_dependencies.update(deps)
+        # Cached data may have been derived from a field that was just
+        # overridden
+        self.field_data_cache.invalidate()
 
     def add_mesh_sampling_particle_field(self, sample_field, ptype="all"):
         """Add a new mesh sampling particle field
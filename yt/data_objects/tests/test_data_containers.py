@@ -163,3 +163,46 @@ class TestDataContainers(unittest.TestCase):
 
         for fname in fields_to_test:
             test_this(fname)
+
+    def test_field_data_cache(self):
+        fields = ("density", "velocity_x", "velocity_y", "velocity_z")
+        units = ("g/cm**3", "cm/s", "cm/s", "cm/s")
+        ds = fake_random_ds(16, fields=fields, units=units)
+        cache = ds.field_data_cache
+        cache.max_size = 10 * 1024 ** 2
+
+        sp1 = ds.sphere("c", 0.25)
+        dens = sp1["gas", "density"]
+        assert ("gas", "density") in [key[0] for key in cache._entries]
+
+        # The same selection shares the cached data, but not the buffer
+        sp2 = ds.sphere("c", 0.25)
+        cache_size = len(cache)
+        assert_array_equal(sp2["gas", "density"], dens)
+        assert_equal(len(cache), cache_size)
+        sp2["gas", "density"][:] = 0
+        assert_array_equal(ds.sphere("c", 0.25)["gas", "density"], dens)
+
+        # Objects with a different selection or field parameters do not
+        sp3 = ds.sphere("c", 0.3)
+        assert_equal(sp3["gas", "density"].size > dens.size, True)
+        bv = ds.arr([1.0, 0.0, 0.0], "cm/s")
+        sp4 = ds.sphere("c", 0.25)
+        sp4.set_field_parameter("bulk_velocity", bv)
+        vr = ds.sphere("c", 0.25)["gas", "radial_velocity"]
+        assert np.any(sp4["gas", "radial_velocity"] != vr)
+
+        cache.invalidate(("gas", "density"))
+        assert ("gas", "density") not in [key[0] for key in cache._entries]
+        cache.invalidate()
+        assert_equal(len(cache), 0)
+        assert_equal(cache.size, 0)
+
+        # Entries are evicted to stay within the memory bound
+        cache.max_size = dens.nbytes
+        ds.sphere("c", 0.25)["gas", "density"]
+        ds.sphere("c", 0.25)["index", "ones"]
+        assert_equal([key[0] for key in cache._entries], [("index", "ones")])
+        ds.sphere("c", 0.3)["gas", "density"]
+        assert_equal(len(cache), 1)
+        assert_equal(cache.size, dens.nbytes)
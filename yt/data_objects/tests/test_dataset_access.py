@@ -186,3 +186,34 @@ g30 = "IsolatedGalaxy/galaxy0030/galaxy0030"
 def test_checksum():
     assert fake_random_ds(16).checksum == "notafile"
     assert data_dir_load(g30).checksum == "6169536e4b9f737ce3d3ad440df44c58"
+
+
+def test_field_data_in_units():
+    ds = fake_random_ds(16, length_unit=2)
+    data = np.ones(10)
+    arr = ds._field_data_in_units(data, "code_length", "cm")
+    assert_equal(str(arr.units), "cm")
+    assert_equal(arr.d, 2 * np.ones(10))
+    # The conversion is applied in place
+    assert np.shares_memory(arr, data)
+
+    # Read-only buffers are not modified
+    data = np.ones(10)
+    data.flags.writeable = False
+    arr = ds._field_data_in_units(data, "code_length", "cm")
+    assert_equal(arr.d, 2 * np.ones(10))
+    assert_equal(data, np.ones(10))
+
+    # Integer data is handled like convert_to_units does
+    arr = ds._field_data_in_units(np.ones(10, dtype="int64"), "code_length", "cm")
+    assert_equal(arr.d, 2 * np.ones(10))
+
+    # Same result as convert_to_units, including for offset units
+    for units, output_units in [("code_mass", "Msun"), ("K", "degC"), ("g", "g")]:
+        data = np.arange(10.0)
+        ref = ds.arr(data.copy(), units)
+        ref.convert_to_units(output_units)
+        for _ in range(2):
+            arr = ds._field_data_in_units(data.copy(), units, output_units)
+            assert_equal(str(arr.units), str(ref.units))
+            assert_almost_equal(arr.d, ref.d)
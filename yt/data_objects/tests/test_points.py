@@ -1,7 +1,7 @@
 import numpy as np
 
 import yt
-from yt.testing import assert_equal, fake_random_ds
+from yt.testing import assert_equal, fake_octree_ds, fake_random_ds
 
 
 def setup():
@@ -73,3 +73,42 @@ def test_fast_find_field_values_at_points():
     assert_equal(len(ppos_den_vel), 2)
     assert_equal(ppos_den_vel[0], ppos_den)
     assert_equal(ppos_den_vel[1], ppos_vel)
+
+
+def test_octree_find_field_values_at_points():
+    ds = fake_octree_ds()
+    ad = ds.all_data()
+    ipts = np.random.randint(0, ad["index", "x"].size, size=50)
+    pts = np.stack([ad["index", ax][ipts].to("code_length").d for ax in "xyz"], axis=-1)
+    pts += (np.random.random(pts.shape) - 0.5) * ad["index", "dx"][ipts, None].d
+
+    den, ones = ds.find_field_values_at_points([("gas", "density"), "ones"], pts)
+    assert_equal(den.shape, (50,))
+    assert_equal(ones, 1.0)
+    for p, d in zip(pts, den):
+        assert_equal(d, ds.point(p)["gas", "density"][0])
+
+
+def test_sph_find_field_values_at_points():
+    npart = 1000
+    prng = np.random.RandomState(0x4D3D3D3)
+    pos = prng.random_sample((npart, 3))
+    data = {
+        "particle_position_x": pos[:, 0],
+        "particle_position_y": pos[:, 1],
+        "particle_position_z": pos[:, 2],
+        "particle_mass": np.ones(npart),
+        "density": prng.random_sample(npart) + 0.5,
+        "temperature": prng.random_sample(npart),
+        "smoothing_length": 0.2 * np.ones(npart),
+    }
+    ds = yt.load_particles(data, bbox=np.array([[0, 1], [0, 1], [0, 1]]))
+    pts = prng.random_sample((50, 3))
+
+    fields = [("io", "density"), ("io", "temperature"), ("gas", "density")]
+    vals = ds.find_field_values_at_points(fields, pts)
+    assert_equal(len(vals), 3)
+    for field, val in zip(fields, vals):
+        assert_equal(val.shape, (50,))
+        assert_equal(val, ds.find_field_values_at_points(field, pts))
+    assert_equal(vals[0].d, vals[2].d)
@@ -12,7 +12,7 @@ from yt.frontends.art.definitions import (
     star_struct,
 )
 from yt.units.yt_array import YTArray, YTQuantity
-from yt.utilities.fortran_utils import read_vector, skip
+from yt.utilities.fortran_utils import MemmapFortranFile, read_vector
 from yt.utilities.io_handler import BaseIOHandler
 from yt.utilities.lib.geometry_utils import compute_morton
 from yt.utilities.logger import ytLogger as mylog
@@ -476,15 +476,15 @@ def read_particles(file, Nrow, idxa, idxb, fields):
 
 def read_star_field(file, field=None):
     data = {}
-    with open(file, "rb") as fh:
+    with MemmapFortranFile(file, endian=">") as fh:
         for dtype, variables in star_struct:
             found = (
                 isinstance(variables, tuple) and field in variables
             ) or field == variables
             if found:
-                data[field] = read_vector(fh, dtype[1], dtype[0])
+                data[field] = fh.read_vector(dtype)
             else:
-                skip(fh, endian=">")
+                fh.skip()
     return data.pop(field)
 
 
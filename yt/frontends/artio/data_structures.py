@@ -1,6 +1,6 @@
 import os
 import weakref
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
 import numpy as np
 
@@ -21,6 +21,24 @@ from yt.geometry.geometry_handler import Index, YTDataChunk
 from yt.utilities.exceptions import YTParticleDepositionNotImplemented
 
 
+def sfc_blocks(sfc_ranges, block_size, num_root_cells):
+    """Returns the (start, end) SFC indices, both inclusive, of the blocks of
+    block_size root cells aligned on the SFC which hold sfc_ranges."""
+    blocks = set()
+    for start, end in sfc_ranges:
+        blocks.update(range(start // block_size, end // block_size + 1))
+    return [
+        (b * block_size, min((b + 1) * block_size, num_root_cells) - 1)
+        for b in sorted(blocks)
+    ]
+
+
+def _handler_cells(range_handler):
+    # The number of root and oct cells held by the meshes of a handler
+    num_root_cells = range_handler.sfc_end - range_handler.sfc_start + 1
+    return num_root_cells + 8 * range_handler.total_octs
+
+
 class ARTIOOctreeSubset(OctreeSubset):
     _domain_offset = 0
     domain_id = -1
@@ -152,7 +170,9 @@ class ARTIOIndex(Index):
         self.directory = os.path.dirname(self.index_filename)
 
         self.max_level = ds.max_level
-        self.range_handlers = {}
+        # The handlers of the SFC blocks, least recently used first
+        self.range_handlers = OrderedDict()
+        self._cached_cells = 0
         self.float_type = np.float64
         super(ARTIOIndex, self).__init__(ds, dataset_type)
 
@@ -160,6 +180,37 @@ class ARTIOIndex(Index):
     def max_range(self):
         return self.dataset.max_range
 
+    @property
+    def max_cached_cells(self):
+        return self.dataset.max_cached_cells
+
+    def _get_range_handler(self, start, end):
+        # The handlers are shared by all the data objects which select cells
+        # in their block, and the least recently used are dropped once the
+        # cells of their meshes exceed max_cached_cells.  The chunks still
+        # holding a dropped handler keep it alive until they are released.
+        key = (start, end)
+        if key in self.range_handlers:
+            self.range_handlers.move_to_end(key)
+            return self.range_handlers[key]
+        range_handler = ARTIOSFCRangeHandler(
+            self.ds.domain_dimensions,
+            self.ds.domain_left_edge,
+            self.ds.domain_right_edge,
+            self.ds._handle,
+            start,
+            end,
+        )
+        range_handler.construct_mesh()
+        self.range_handlers[key] = range_handler
+        self._cached_cells += _handler_cells(range_handler)
+        while (
+            self._cached_cells > self.max_cached_cells and len(self.range_handlers) > 1
+        ):
+            _, old = self.range_handlers.popitem(last=False)
+            self._cached_cells -= _handler_cells(old)
+        return range_handler
+
     def _setup_geometry(self):
         mylog.debug("Initializing Geometry Handler empty for now.")
 
@@ -250,23 +301,15 @@ class ARTIOIndex(Index):
                 list_sfc_ranges = self.ds._handle.root_sfc_ranges(
                     dobj.selector, max_range_size=self.max_range
                 )
+            # The ranges are widened to whole blocks of max_range root cells
+            # aligned on the SFC, so that their handlers can be reused by
+            # any other selection within the same blocks.
+            list_sfc_ranges = sfc_blocks(
+                list_sfc_ranges, self.max_range, int(np.prod(self.ds.domain_dimensions))
+            )
             ci = []
-            # v = np.array(list_sfc_ranges)
-            # list_sfc_ranges = [ (v.min(), v.max()) ]
             for (start, end) in list_sfc_ranges:
-                if (start, end) in self.range_handlers.keys():
-                    range_handler = self.range_handlers[(start, end)]
-                else:
-                    range_handler = ARTIOSFCRangeHandler(
-                        self.ds.domain_dimensions,
-                        self.ds.domain_left_edge,
-                        self.ds.domain_right_edge,
-                        self.ds._handle,
-                        start,
-                        end,
-                    )
-                    range_handler.construct_mesh()
-                    self.range_handlers[(start, end)] = range_handler
+                range_handler = self._get_range_handler(start, end)
                 if nz != 2:
                     ci.append(
                         ARTIORootMeshSubset(
@@ -345,6 +388,7 @@ class ARTIODataset(Dataset):
         dataset_type="artio",
         storage_filename=None,
         max_range=1024,
+        max_cached_cells=2 ** 26,
         units_override=None,
         unit_system="cgs",
     ):
@@ -353,6 +397,7 @@ class ARTIODataset(Dataset):
         if self._handle is not None:
             return
         self.max_range = max_range
+        self.max_cached_cells = max_cached_cells
         self.fluid_types += ("artio",)
         self._filename = filename
         self._fileset_prefix = filename[:-4]
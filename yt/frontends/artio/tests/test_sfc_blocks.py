@@ -0,0 +1,12 @@
+from yt.frontends.artio.data_structures import sfc_blocks
+from yt.testing import assert_equal
+
+
+def test_sfc_blocks():
+    # The ranges are widened to the aligned blocks holding them, which are
+    # shared by the ranges in the same block, and the last block is cut at
+    # the end of the root grid
+    ranges = [(3, 7), (10, 12), (20, 35), (60, 62)]
+    assert_equal(sfc_blocks(ranges, 16, 64), [(0, 15), (16, 31), (32, 47), (48, 63)])
+    assert_equal(sfc_blocks([(5, 9)], 16, 10), [(0, 9)])
+    assert_equal(sfc_blocks([(5, 6), (40, 40)], 16, 64), [(0, 15), (32, 47)])
@@ -352,14 +352,45 @@ class BoxlibHierarchy(GridIndex):
         GridIndex.__init__(self, ds, dataset_type)
         self._cache_endianness(self.grids[-1])
 
+    @property
+    def _index_cache_filename(self):
+        return f"{self.header_filename}.npz"
+
     def _parse_index(self):
         """
         read the global header file for an Boxlib plotfile output.
         """
         self.max_level = self.dataset._max_level
+        self.dimensionality = self.dataset.dimensionality
+        # The parsed index is cached, and only parsed again if the header
+        # files change
+        arrays = self._load_index_cache(
+            self._index_cache_filename, [self.header_filename]
+        )
+        if arrays is None:
+            sources, arrays = self._parse_header_files()
+            arrays.update(self._find_grid_children())
+            if self.comm.rank in (0, None):
+                self._save_index_cache(self._index_cache_filename, sources, **arrays)
+        self.level_dds = arrays["level_dds"]
+        self.grid_start_index[:] = arrays["grid_start_index"]
+        self._grid_child_offsets = arrays["child_offsets"]
+        self._grid_child_ids = arrays["child_ids"]
+        self.grids = []
+        for i, (offset, filename) in enumerate(
+            zip(arrays["offsets"], arrays["filenames"].tolist())
+        ):
+            go = self.grid(i, int(offset), os.path.join(self.directory, filename), self)
+            go.Level = int(self.grid_levels[i, 0])
+            self.grids.append(go)
+        self.float_type = "float64"
+
+    def _parse_header_files(self):
+        # Fill the grid arrays from the global header file and the header
+        # files of the levels, returning the names of these files and the
+        # other arrays describing the grids.
         header_file = open(self.header_filename, "r")
 
-        self.dimensionality = self.dataset.dimensionality
         _our_dim_finder = _dim_finder[self.dimensionality - 1]
         DRE = self.dataset.domain_right_edge  # shortcut
         DLE = self.dataset.domain_left_edge  # shortcut
@@ -375,7 +406,7 @@ class BoxlibHierarchy(GridIndex):
                 dx[i].append(DRE[1] - DLE[1])
             if self.dimensionality < 3:
                 dx[i].append(DRE[2] - DLE[1])
-        self.level_dds = np.array(dx, dtype="float64")
+        level_dds = np.array(dx, dtype="float64")
         next(header_file)
         if self.ds.geometry == "cartesian":
             default_ybounds = (0.0, 1.0)
@@ -384,13 +415,13 @@ class BoxlibHierarchy(GridIndex):
             # Now we check for dimensionality issues
             if self.dimensionality != 2:
                 raise RuntimeError("yt needs cylindrical to be 2D")
-            self.level_dds[:, 2] = 2 * np.pi
+            level_dds[:, 2] = 2 * np.pi
             default_zbounds = (0.0, 2 * np.pi)
         elif self.ds.geometry == "spherical":
             # BoxLib only supports 1D spherical, so ensure
             # the other dimensions have the right extent.
-            self.level_dds[:, 1] = np.pi
-            self.level_dds[:, 2] = 2 * np.pi
+            level_dds[:, 1] = np.pi
+            level_dds[:, 2] = 2 * np.pi
             default_ybounds = (0.0, np.pi)
             default_zbounds = (0.0, 2 * np.pi)
         else:
@@ -400,7 +431,9 @@ class BoxlibHierarchy(GridIndex):
 
         # each level is one group with ngrids on it.
         # each grid has self.dimensionality number of lines of 2 reals
-        self.grids = []
+        sources = [self.header_filename]
+        offsets = np.empty(self.num_grids, dtype="int64")
+        filenames = []
         grid_counter = 0
         for level in range(self.max_level + 1):
             vals = next(header_file).split()
@@ -420,9 +453,12 @@ class BoxlibHierarchy(GridIndex):
                 self.grid_left_edge[grid_counter + gi, :] = [xlo, ylo, zlo]
                 self.grid_right_edge[grid_counter + gi, :] = [xhi, yhi, zhi]
             # Now we get to the level header filename, which we open and parse.
-            fn = os.path.join(self.dataset.output_dir, next(header_file).strip())
+            # The names of the files are kept relative to the output directory.
+            level_fn = next(header_file).strip()
+            fn = os.path.join(self.dataset.output_dir, level_fn)
+            sources.append(fn + "_H")
             level_header_file = open(fn + "_H")
-            level_dir = os.path.dirname(fn)
+            level_dir = os.path.dirname(level_fn)
             # We skip the first two lines, which contain BoxLib header file
             # version and 'how' the data was written
             next(level_header_file)
@@ -455,16 +491,51 @@ class BoxlibHierarchy(GridIndex):
             next(level_header_file)
             # Now we iterate over grids to find their offsets in each file.
             for gi in range(ngrids):
-                # Now we get the data file, at which point we're ready to
-                # create the grid.
+                # Now we get the data file and the offset of the grid in it.
                 dummy, filename, offset = next(level_header_file).split()
-                filename = os.path.join(level_dir, filename)
-                go = self.grid(grid_counter + gi, int(offset), filename, self)
-                go.Level = self.grid_levels[grid_counter + gi, :] = level
-                self.grids.append(go)
+                filenames.append(os.path.join(level_dir, filename))
+                offsets[grid_counter + gi] = int(offset)
+                self.grid_levels[grid_counter + gi, :] = level
+            level_header_file.close()
             grid_counter += ngrids
             # already read the filenames above...
-        self.float_type = "float64"
+        header_file.close()
+        arrays = {
+            "level_dds": level_dds,
+            "grid_start_index": self.grid_start_index,
+            "offsets": offsets,
+            "filenames": np.array(filenames, dtype="str"),
+        }
+        return sources, arrays
+
+    def _find_grid_children(self):
+        # The children of the grids, as compressed sparse rows: the children
+        # of grid i are child_ids[child_offsets[i]:child_offsets[i + 1]]
+        counts = np.zeros(self.num_grids, dtype="int64")
+        child_ids = []
+        if self.max_level > 0:
+            mask = np.empty(self.num_grids, dtype="int32")
+            mylog.debug("Identifying child grids")
+            for i in range(self.num_grids):
+                get_box_grids_level(
+                    self.grid_left_edge[i, :],
+                    self.grid_right_edge[i, :],
+                    self.grid_levels[i] + 1,
+                    self.grid_left_edge,
+                    self.grid_right_edge,
+                    self.grid_levels,
+                    mask,
+                )
+                ids = np.flatnonzero(mask)
+                child_ids.append(ids)
+                counts[i] = ids.size
+        child_offsets = np.zeros(self.num_grids + 1, dtype="int64")
+        np.cumsum(counts, out=child_offsets[1:])
+        if len(child_ids) > 0:
+            child_ids = np.concatenate(child_ids)
+        else:
+            child_ids = np.empty(0, dtype="int64")
+        return {"child_offsets": child_offsets, "child_ids": child_ids}
 
     def _cache_endianness(self, test_grid):
         """
@@ -516,20 +587,11 @@ class BoxlibHierarchy(GridIndex):
     def _reconstruct_parent_child(self):
         if self.max_level == 0:
             return
-        mask = np.empty(len(self.grids), dtype="int32")
-        mylog.debug("First pass; identifying child grids")
+        mylog.debug("First pass; setting child grids")
+        offsets = self._grid_child_offsets
         for i, grid in enumerate(self.grids):
-            get_box_grids_level(
-                self.grid_left_edge[i, :],
-                self.grid_right_edge[i, :],
-                self.grid_levels[i] + 1,
-                self.grid_left_edge,
-                self.grid_right_edge,
-                self.grid_levels,
-                mask,
-            )
-            ids = np.where(mask.astype("bool"))  # where is a tuple
-            grid._children_ids = ids[0] + grid._id_offset
+            ids = self._grid_child_ids[offsets[i] : offsets[i + 1]]
+            grid._children_ids = ids + grid._id_offset
         mylog.debug("Second pass; identifying parents")
         for i, grid in enumerate(self.grids):  # Second pass
             for child in grid.Children:
@@ -1,13 +1,17 @@
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
 from yt.frontends.chombo.io import parse_orion_sinks
-from yt.funcs import mylog
+from yt.funcs import get_num_threads, mylog
 from yt.geometry.selection_routines import GridSelector
 from yt.utilities.io_handler import BaseIOHandler
 
+# The number of bytes read to find the end of a FAB header line
+FAB_HEADER_SIZE = 1024
+
 
 def _remove_raw(all_fields, raw_fields):
     centered_fields = set(all_fields)
@@ -16,9 +20,92 @@ def _remove_raw(all_fields, raw_fields):
     return list(centered_fields)
 
 
+def _read_ranges(f, ranges, min_gap, max_size):
+    # Read the (offset, size) ranges of an open file, with one sequential
+    # read for the ranges fewer than min_gap bytes apart, up to max_size
+    # bytes at a time.  The ranges are returned as views of the buffers.
+    order = sorted(range(len(ranges)), key=lambda i: ranges[i][0])
+    out = [None] * len(ranges)
+    i = 0
+    while i < len(order):
+        start = ranges[order[i]][0]
+        stop = start + ranges[order[i]][1]
+        j = i + 1
+        while j < len(order):
+            offset, size = ranges[order[j]]
+            end = max(stop, offset + size)
+            if offset - stop >= min_gap or end - start > max_size:
+                break
+            stop = end
+            j += 1
+        f.seek(start)
+        buf = memoryview(bytearray(stop - start))
+        buf = buf[: f.readinto(buf)]
+        for k in order[i:j]:
+            offset, size = ranges[k]
+            out[k] = buf[offset - start : offset - start + size]
+        i = j
+    return out
+
+
+def read_fab_file(filename, fabs, dtype, min_gap=2 ** 16, max_size=2 ** 26):
+    """Read the components of several FABs of one file.
+
+    The FAB headers that are not known yet are read first, then the
+    components, both with large sequential reads of the file.
+
+    Parameters
+    ----------
+    filename : str
+        The file holding the FABs.
+    fabs : list of (data_offset, header_offset, components)
+        For each FAB, the offset of its data in the file (or -1 if its
+        header still has to be read), the offset of its header, and a list
+        of the (offset in the data, count) of the components to read.
+    dtype : np.dtype
+        The type of the values.
+    min_gap : int, optional
+        The smallest gap, in bytes, between two reads of the file.
+    max_size : int, optional
+        The largest read, in bytes, unless a single component is larger.
+
+    Returns
+    -------
+    The offsets of the data of the FABs, and for each FAB the list of the
+    arrays of its components.
+    """
+    dtype = np.dtype(dtype)
+    data_offsets = [fab[0] for fab in fabs]
+    with open(filename, "rb") as f:
+        unknown = [i for i, offset in enumerate(data_offsets) if offset == -1]
+        headers = _read_ranges(
+            f, [(fabs[i][1], FAB_HEADER_SIZE) for i in unknown], min_gap, max_size
+        )
+        for i, header in zip(unknown, headers):
+            end = header.tobytes().find(b"\n")
+            if end == -1:
+                f.seek(fabs[i][1])
+                f.readline()
+                data_offsets[i] = f.tell()
+            else:
+                data_offsets[i] = fabs[i][1] + end + 1
+        ranges = [
+            (data_offset + offset, count * dtype.itemsize)
+            for data_offset, fab in zip(data_offsets, fabs)
+            for offset, count in fab[2]
+        ]
+        bufs = iter(_read_ranges(f, ranges, min_gap, max_size))
+    arrays = [[np.frombuffer(next(bufs), dtype=dtype) for _ in fab[2]] for fab in fabs]
+    return data_offsets, arrays
+
+
 class IOHandlerBoxlib(BaseIOHandler):
 
     _dataset_type = "boxlib_native"
+    # Ranges of a file fewer than this many bytes apart are read at once,
+    # up to _max_read_size bytes
+    _read_gap = 2 ** 16
+    _max_read_size = 2 ** 26
 
     def __init__(self, ds, *args, **kwargs):
         super(IOHandlerBoxlib, self).__init__(ds)
@@ -48,49 +135,76 @@ class IOHandlerBoxlib(BaseIOHandler):
         ind = 0
         for chunk in chunks:
             data = self._read_chunk_data(chunk, centered_fields)
+            if len(raw_fields) > 0:
+                raw_data = self._read_raw_fields(chunk.objs, raw_fields)
             for g in chunk.objs:
                 for field in fields:
                     if field in centered_fields:
                         ds = data[g.id].pop(field)
                     else:
-                        ds = self._read_raw_field(g, field)
+                        ds = raw_data[g.id].pop(field)
                     nd = g.select(selector, ds, rv[field], ind)
                 ind += nd
                 data.pop(g.id)
         return rv
 
+    def _read_fab_files(self, fabs_by_file, dtype):
+        # The FABs of each file are read by read_fab_file, and the files are
+        # read concurrently
+        def read(filename):
+            return read_fab_file(
+                filename,
+                fabs_by_file[filename],
+                dtype,
+                self._read_gap,
+                self._max_read_size,
+            )
+
+        nthreads = int(get_num_threads()) or os.cpu_count() or 1
+        nthreads = min(nthreads, len(fabs_by_file))
+        if nthreads < 2:
+            return {filename: read(filename) for filename in fabs_by_file}
+        with ThreadPoolExecutor(max_workers=nthreads) as executor:
+            return dict(zip(fabs_by_file, executor.map(read, fabs_by_file)))
+
     def _read_raw_field(self, grid, field):
-        field_name = field[1]
-        base_dir = self.ds.index.raw_file
-
-        nghost = self.ds.index.raw_field_nghost[field_name]
-        box_list = self.ds.index.raw_field_map[field_name][0]
-        fn_list = self.ds.index.raw_field_map[field_name][1]
-        offset_list = self.ds.index.raw_field_map[field_name][2]
-
-        lev = grid.Level
-        filename = base_dir + "Level_%d/" % lev + fn_list[grid.id]
-        offset = offset_list[grid.id]
-        box = box_list[grid.id]
-
-        lo = box[0] - nghost
-        hi = box[1] + nghost
-        shape = hi - lo + 1
-        with open(filename, "rb") as f:
-            f.seek(offset)
-            f.readline()  # always skip the first line
-            arr = np.fromfile(f, "float64", np.product(shape))
-            arr = arr.reshape(shape, order="F")
-        return arr[
-            tuple(
-                [
-                    slice(None)
-                    if (nghost[dim] == 0)
-                    else slice(nghost[dim], -nghost[dim])
-                    for dim in range(self.ds.dimensionality)
+        return self._read_raw_fields([grid], [field])[grid.id][field]
+
+    def _read_raw_fields(self, grids, fields):
+        index = self.ds.index
+        fabs_by_file = defaultdict(list)
+        owners = defaultdict(list)
+        for field in fields:
+            field_name = field[1]
+            nghost = index.raw_field_nghost[field_name]
+            box_list, fn_list, offset_list = index.raw_field_map[field_name]
+            for grid in grids:
+                filename = index.raw_file + "Level_%d/" % grid.Level + fn_list[grid.id]
+                box = box_list[grid.id]
+                lo = box[0] - nghost
+                hi = box[1] + nghost
+                shape = hi - lo + 1
+                # The header of raw FABs is always skipped
+                fabs = fabs_by_file[filename]
+                fabs.append((-1, offset_list[grid.id], [(0, np.product(shape))]))
+                owners[filename].append((grid, field, shape, nghost))
+
+        data = defaultdict(dict)
+        results = self._read_fab_files(fabs_by_file, "float64")
+        for filename, fabs in owners.items():
+            for (grid, field, shape, nghost), (arr,) in zip(fabs, results[filename][1]):
+                arr = arr.reshape(shape, order="F")
+                data[grid.id][field] = arr[
+                    tuple(
+                        [
+                            slice(None)
+                            if (nghost[dim] == 0)
+                            else slice(nghost[dim], -nghost[dim])
+                            for dim in range(self.ds.dimensionality)
+                        ]
+                    )
                 ]
-            )
-        ]
+        return data
 
     def _read_chunk_data(self, chunk, fields):
         data = {}
@@ -103,25 +217,31 @@ class IOHandlerBoxlib(BaseIOHandler):
             grids_by_file[g.filename].append(g)
         dtype = self.ds.index._dtype
         bpr = dtype.itemsize
-        for filename in grids_by_file:
-            grids = grids_by_file[filename]
-            grids.sort(key=lambda a: a._offset)
-            f = open(filename, "rb")
+        # The components of the fields, in the order they are stored in the
+        # FABs
+        comps = [
+            (i, field)
+            for i, field in enumerate(self.ds.index.field_order)
+            if field in fields
+        ]
+        fabs_by_file = {}
+        for filename, grids in grids_by_file.items():
+            fabs = fabs_by_file[filename] = []
             for grid in grids:
-                data[grid.id] = {}
-                local_offset = grid._get_offset(f) - f.tell()
                 count = grid.ActiveDimensions.prod()
-                size = count * bpr
-                for field in self.ds.index.field_order:
-                    if field in fields:
-                        # We read it ...
-                        f.seek(local_offset, os.SEEK_CUR)
-                        v = np.fromfile(f, dtype=dtype, count=count)
-                        v = v.reshape(grid.ActiveDimensions, order="F")
-                        data[grid.id][field] = v
-                        local_offset = 0
-                    else:
-                        local_offset += size
+                components = [(i * count * bpr, count) for i, _ in comps]
+                fabs.append((grid._offset, grid._base_offset, components))
+
+        results = self._read_fab_files(fabs_by_file, dtype)
+        for filename, grids in grids_by_file.items():
+            data_offsets, arrays = results[filename]
+            for grid, data_offset, fab in zip(grids, data_offsets, arrays):
+                # The headers are only decoded once
+                grid._offset = data_offset
+                data[grid.id] = {
+                    field: v.reshape(grid.ActiveDimensions, order="F")
+                    for (_, field), v in zip(comps, fab)
+                }
         return data
 
     def _read_particle_coords(self, chunks, ptf):
@@ -0,0 +1,39 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from yt.frontends.boxlib.io import read_fab_file
+from yt.testing import assert_equal
+
+
+def test_read_fab_file():
+    tmpdir = tempfile.mkdtemp()
+    filename = os.path.join(tmpdir, "Cell_D_00000")
+    np.random.seed(0x4D3D3D3)
+    values, fabs = [], []
+    with open(filename, "wb") as f:
+        for i in range(10):
+            # Three components of 4**3 cells, after a header line of
+            # varying length
+            data = np.random.random((3, 64))
+            header_offset = f.tell()
+            f.write(b"FAB ((8, (64 11 52 0 1 12 0 1023)),(8, (8 7 6 5 4 3 2 1)))")
+            f.write(b"((0,0,0) (3,3,%i) (0,0,0)) 3\n" % (10 ** i))
+            data_offset = f.tell()
+            f.write(data.tobytes())
+            values.append(data)
+            fabs.append((data_offset, header_offset, [(64 * 8, 64), (2 * 64 * 8, 64)]))
+
+    # The headers are read when the offset of the data is not known, and
+    # the FABs can be given in any order
+    unknown = [(-1,) + fab[1:] for fab in fabs[::-1]]
+    for fab_list, order in ((fabs, slice(None)), (unknown, slice(None, None, -1))):
+        for min_gap in (0, 2 ** 16):
+            offsets, arrays = read_fab_file(filename, fab_list, "float64", min_gap)
+            assert_equal(offsets[order], [fab[0] for fab in fabs])
+            for data, (comp1, comp2) in zip(values, arrays[order]):
+                assert_equal(comp1, data[1])
+                assert_equal(comp2, data[2])
+    shutil.rmtree(tmpdir)
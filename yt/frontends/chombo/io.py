@@ -1,9 +1,10 @@
 import re
+from collections import defaultdict
 
 import numpy as np
 
 from yt.geometry.selection_routines import GridSelector
-from yt.utilities.io_handler import BaseIOHandler
+from yt.utilities.io_handler import BaseIOHandler, index_runs
 from yt.utilities.logger import ytLogger as mylog
 
 
@@ -11,7 +12,14 @@ class IOHandlerChomboHDF5(BaseIOHandler):
     _dataset_type = "chombo_hdf5"
     _offset_string = "data:offsets=0"
     _data_string = "data:datatype=0"
-    _offsets = None
+    # Boxes of a chunk fewer than this many boxes apart on disk are read in a
+    # single hyperslab of at most _max_run_boxes boxes, along with the boxes
+    # in between.  As these hyperslabs hold all the components of the boxes,
+    # they are only used when reading at least _coalesce_fraction of the
+    # components.
+    _box_gap = 4
+    _max_run_boxes = 64
+    _coalesce_fraction = 0.5
 
     def __init__(self, ds, *args, **kwargs):
         BaseIOHandler.__init__(self, ds, *args, **kwargs)
@@ -19,31 +27,40 @@ class IOHandlerChomboHDF5(BaseIOHandler):
         self._handle = ds._handle
         self.dim = self._handle["Chombo_global/"].attrs["SpaceDim"]
         self._read_ghost_info()
+        self._offsets = {}
         if self._offset_string not in self._handle["level_0"]:
             self._calculate_offsets()
 
     def _calculate_offsets(self):
         def box_size(corners):
             size = 1
+            # The boxes are stored with their ghost zones
             for idim in range(self.dim):
-                size *= corners[idim + self.dim] - corners[idim] + 1
+                width = corners[idim + self.dim] - corners[idim] + 1
+                size *= width + 2 * self.ghost[idim]
             return size
 
-        self._offsets = {}
         num_comp = self._handle.attrs["num_components"]
         level = 0
         while True:
             lname = "level_%i" % level
             if lname not in self._handle:
                 break
-            boxes = self._handle["level_0"]["boxes"][()]
-            box_sizes = np.array([box_size(box) for box in boxes])
+            boxes = self._handle[lname]["boxes"][()]
+            box_sizes = np.array([box_size(box) for box in boxes], dtype="int64")
 
-            offsets = np.cumsum(box_sizes * num_comp, dtype="int64")
-            offsets -= offsets[0]
+            offsets = np.zeros(len(boxes) + 1, dtype="int64")
+            np.cumsum(box_sizes * num_comp, out=offsets[1:])
             self._offsets[level] = offsets
             level += 1
 
+    def _level_offsets(self, level):
+        # The offsets of the boxes of a level in its data, and of its end
+        if level not in self._offsets:
+            lev = self._handle["level_%i" % level]
+            self._offsets[level] = lev[self._offset_string][()].astype("int64")
+        return self._offsets[level]
+
     def _read_ghost_info(self):
         try:
             self.ghost = tuple(
@@ -87,22 +104,54 @@ class IOHandlerChomboHDF5(BaseIOHandler):
     def _read_data(self, grid, field):
         lstring = "level_%i" % grid.Level
         lev = self._handle[lstring]
-        dims = grid.ActiveDimensions
-        shape = dims + 2 * self.ghost
-        boxsize = shape.prod()
+        boxsize = (grid.ActiveDimensions + 2 * self.ghost).prod()
 
-        if self._offsets is not None:
-            grid_offset = self._offsets[grid.Level][grid._level_id]
-        else:
-            grid_offset = lev[self._offset_string][grid._level_id]
+        grid_offset = self._level_offsets(grid.Level)[grid._level_id]
         start = grid_offset + self.field_dict[field] * boxsize
         stop = start + boxsize
         data = lev[self._data_string][start:stop]
-        data_no_ghost = data.reshape(shape, order="F")
+        return self._strip_ghosts(grid, data)
+
+    def _strip_ghosts(self, grid, data):
+        # The values of one component of a box, without the ghost zones
+        dims = grid.ActiveDimensions
+        data_no_ghost = data.reshape(dims + 2 * self.ghost, order="F")
         ghost_slice = tuple([slice(g, d + g, None) for g, d in zip(self.ghost, dims)])
         ghost_slice = ghost_slice[0 : self.dim]
         return data_no_ghost[ghost_slice]
 
+    def _read_boxes(self, grids, fields):
+        # Yield the grids along with the data of their fields.
+        # The boxes of each level are read with one hyperslab per run of
+        # boxes that are (nearly) adjacent on disk, and only one run is held
+        # in memory at once.
+        num_comp = self._handle.attrs["num_components"]
+        if len(fields) < self._coalesce_fraction * num_comp:
+            for g in grids:
+                yield g, {field: self._read_data(g, field[1]) for field in fields}
+            return
+        by_level = defaultdict(list)
+        for g in grids:
+            by_level[g.Level].append(g)
+        for level, level_grids in sorted(by_level.items()):
+            dset = self._handle["level_%i" % level][self._data_string]
+            offsets = self._level_offsets(level)
+            box_ids = [g._level_id for g in level_grids]
+            runs = index_runs(box_ids, self._box_gap, self._max_run_boxes)
+            for start, stop, positions in runs:
+                base = offsets[start]
+                data = dset[base : offsets[stop]]
+                for i in positions:
+                    g = level_grids[i]
+                    box = data[offsets[g._level_id] - base :]
+                    boxsize = (g.ActiveDimensions + 2 * self.ghost).prod()
+                    rv = {}
+                    for field in fields:
+                        comp = self.field_dict[field[1]] * boxsize
+                        rv[field] = self._strip_ghosts(g, box[comp : comp + boxsize])
+                    yield g, rv
+                del data
+
     def _read_fluid_selection(self, chunks, selector, fields, size):
         rv = {}
         chunks = list(chunks)
@@ -130,13 +179,15 @@ class IOHandlerChomboHDF5(BaseIOHandler):
 
         ind = 0
         for chunk in chunks:
+            # The boxes are read in their order on disk, and their cells are
+            # placed after those of the grids before them in the chunk
+            grid_offsets = {}
             for g in chunk.objs:
-                nd = 0
+                grid_offsets[g.id] = ind
+                ind += g.count(selector)
+            for g, data in self._read_boxes(chunk.objs, fields):
                 for field in fields:
-                    ftype, fname = field
-                    data = self._read_data(g, fname)
-                    nd = g.select(selector, data, rv[field], ind)  # caches
-                ind += nd
+                    g.select(selector, data[field], rv[field], grid_offsets[g.id])
         return rv
 
     def _read_particle_selection(self, chunks, selector, fields):
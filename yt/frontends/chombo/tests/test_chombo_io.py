@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from yt.frontends.chombo.api import ChomboDataset
+from yt.testing import assert_equal, requires_module
+
+FIELDS = ("density", "velocity_x", "velocity_y")
+
+
+def _value(i, j, k, comp):
+    return (comp + 1) * (i + 10 * j + 100 * k)
+
+
+@requires_module("h5py")
+def test_read_boxes():
+    import h5py
+
+    # An 8**3 domain split in 8 boxes of 4**3 cells, stored with a layer of
+    # ghost zones
+    tmpdir = tempfile.mkdtemp()
+    fn = os.path.join(tmpdir, "data.hdf5")
+    corners = [(i, j, k) for k in (0, 4) for j in (0, 4) for i in (0, 4)]
+    boxes = np.array(
+        [c + tuple(v + 3 for v in c) for c in corners],
+        dtype=[(f"{e}_{ax}", "<i4") for e in ("lo", "hi") for ax in "ijk"],
+    )
+    data = []
+    ind = np.indices((6, 6, 6)) - 1
+    for c in corners:
+        for comp in range(len(FIELDS)):
+            values = _value(*(ind[d] + c[d] for d in range(3)), comp)
+            values[0], values[-1] = -1, -1
+            values[:, 0], values[:, -1] = -1, -1
+            values[:, :, 0], values[:, :, -1] = -1, -1
+            data.append(values.ravel(order="F"))
+    with h5py.File(fn, mode="w") as f:
+        f.attrs["num_levels"] = 1
+        f.attrs["num_components"] = len(FIELDS)
+        for comp, field in enumerate(FIELDS):
+            f.attrs[f"component_{comp}"] = np.bytes_(field)
+        f.attrs["time"] = 0.0
+        f.create_group("Chombo_global").attrs["SpaceDim"] = 3
+        level = f.create_group("level_0")
+        level.attrs["dx"] = 1.0 / 8
+        level.attrs["ref_ratio"] = 2
+        level.attrs["prob_domain"] = np.array([0, 0, 0, 7, 7, 7], dtype="int32")
+        level.create_group("data_attributes").attrs["outputGhost"] = [1, 1, 1]
+        level["boxes"] = boxes
+        level["data:datatype=0"] = np.concatenate(data).astype("float64")
+
+    ds = ChomboDataset(fn)
+    ad = ds.all_data()
+    ijk = [(ad["index", ax].d * 8).astype("int64") for ax in "xyz"]
+    # One field is read box by box, and two with the boxes coalesced
+    assert_equal(ad["chombo", "density"], _value(*ijk, 0))
+    ad = ds.all_data()
+    ad.get_data([("chombo", "velocity_x"), ("chombo", "velocity_y")])
+    assert_equal(ad["chombo", "velocity_x"], _value(*ijk, 1))
+    assert_equal(ad["chombo", "velocity_y"], _value(*ijk, 2))
+    sp = ds.sphere([0.4, 0.5, 0.6], 0.3)
+    sp.get_data([("chombo", "velocity_x"), ("chombo", "velocity_y")])
+    sijk = [(sp["index", ax].d * 8).astype("int64") for ax in "xyz"]
+    assert_equal(sp["chombo", "velocity_y"], _value(*sijk, 2))
+    shutil.rmtree(tmpdir)
@@ -1,6 +1,5 @@
 import io
 import os
-import re
 import string
 import time
 import weakref
@@ -8,12 +7,13 @@ from collections import defaultdict
 
 import numpy as np
 from more_itertools import always_iterable
+from numpy.lib.stride_tricks import as_strided
 
 from yt.data_objects.index_subobjects.grid_patch import AMRGridPatch
 from yt.data_objects.static_output import Dataset
 from yt.fields.field_info_container import NullFunc
 from yt.frontends.enzo.misc import cosmology_get_units
-from yt.funcs import get_pbar, iter_fields, setdefaultattr
+from yt.funcs import iter_fields, setdefaultattr
 from yt.geometry.geometry_handler import YTDataChunk
 from yt.geometry.grid_geometry_handler import GridIndex
 from yt.utilities.logger import ytLogger as mylog
@@ -22,6 +22,100 @@ from yt.utilities.on_demand_imports import _h5py as h5py, _libconf as libconf
 from .fields import EnzoFieldInfo
 
 
+class _HierarchyRecords:
+    """
+    The records of an Enzo hierarchy file.  Rather than reading the file
+    line by line, the records are located by comparing the first bytes of
+    all the lines at once, and all the values of a record are then parsed
+    together.
+    """
+
+    _key_size = 8
+
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            data = np.frombuffer(f.read(), dtype="uint8")
+        newlines = np.flatnonzero(data == ord("\n"))
+        line_starts = np.concatenate([[0], newlines + 1])
+        self.line_starts = line_starts[line_starts < data.size]
+        self.line_ends = np.concatenate([newlines, [data.size]])
+        # Every line is viewed as a row as wide as the longest line, which
+        # the file is padded with
+        width = max((self.line_ends - line_starts).max(), self._key_size) + 1
+        self.buf = np.zeros(data.size + width, dtype="uint8")
+        self.buf[: data.size] = data
+        self.rows = as_strided(self.buf, shape=(data.size, width), strides=(1, 1))
+        # The first bytes of every line, compared at once to find records
+        keys = self.rows[:, : self._key_size][self.line_starts]
+        self.line_keys = keys.view("<u8")[:, 0]
+        self.grid_starts = self.find("Grid")[0]
+
+    def find(self, token):
+        """Returns the offsets of the values of the records named *token*,
+        and of the ends of their lines."""
+        name = token.encode()
+        key = np.frombuffer(name[: self._key_size].ljust(self._key_size, b"\0"), "<u8")
+        mask = np.uint64(2 ** (8 * min(len(name), self._key_size)) - 1)
+        starts = self.line_starts[(self.line_keys & mask) == key[0]]
+        for i in range(self._key_size, len(name)):
+            starts = starts[self.buf[starts + i] == name[i]]
+        # The name is followed by the equals sign, possibly padded
+        after = self.buf[starts + len(name)]
+        starts = starts[
+            (after == ord(" ")) | (after == ord("\t")) | (after == ord("="))
+        ]
+        ends = self.line_ends[np.searchsorted(self.line_ends, starts)]
+        return starts + len(name), ends
+
+    def _text(self, starts, ends):
+        # The bytes of the given ranges, one range per row padded with spaces
+        lengths = ends - starts
+        columns = np.arange(lengths.max(initial=0))
+        text = self.rows[:, : columns.size][starts]
+        text[columns >= lengths[:, None]] = ord(" ")
+        return text
+
+    def values(self, token, dtype, count):
+        """Returns the values of the records named *token*, which are
+        written once for each of the *count* grids."""
+        text = self._text(*self.find(token))
+        text[text == ord("=")] = ord(" ")
+        values = np.fromstring(text.tobytes(), dtype=dtype, sep=" ")
+        return values.reshape(count, -1)
+
+    def grid_values(self, token):
+        """Returns the grids having a record named *token*, and the
+        whitespace separated values of these records."""
+        starts, ends = self.find(token)
+        grids = np.searchsorted(self.grid_starts, starts, side="right") - 1
+        text = self._text(starts, ends)
+        text[text == ord("=")] = ord(" ")
+        return grids, [row.tobytes().decode().split() for row in text]
+
+    def grid_names(self, token):
+        """Returns the grids having a record named *token*, and the first
+        value of these records, such as a file name."""
+        starts, ends = self.find(token)
+        grids = np.searchsorted(self.grid_starts, starts, side="right") - 1
+        text = self._text(starts, ends)
+        text[text == ord("=")] = ord(" ")
+        names = text.tobytes().decode().split()
+        if len(names) != starts.size:
+            names = [row.tobytes().decode().split()[0] for row in text]
+        return grids, np.array(names, dtype="object")
+
+    def pointers(self):
+        """Returns the grids the pointers are set on, the grids they point
+        to, and whether these are on the next level."""
+        text = self._text(*self.find("Pointer:"))
+        # Of "Grid[i]->NextGridThisLevel = j", the pointers to the next
+        # level are the ones without a capital T
+        next_level = ~(text == ord("T")).any(axis=1)
+        text[(text < ord("0")) | (text > ord("9"))] = ord(" ")
+        ids = np.fromstring(text.tobytes(), dtype="int64", sep=" ").reshape(-1, 2)
+        return ids[:, 0], ids[:, 1], next_level
+
+
 class EnzoGrid(AMRGridPatch):
     """
     Class representing a single Enzo Grid instance.
@@ -34,39 +128,24 @@ class EnzoGrid(AMRGridPatch):
         """
         # All of the field parameters will be passed to us as needed.
         AMRGridPatch.__init__(self, id, filename=None, index=index)
-        self._children_ids = []
-        self._parent_id = -1
         self.Level = -1
 
     def set_filename(self, filename):
         """
         Intelligently set the filename.
         """
-        if filename is None:
-            self.filename = filename
-            return
-        if self.index._strip_path:
-            self.filename = os.path.join(
-                self.index.directory, os.path.basename(filename)
-            )
-        elif filename[0] == os.path.sep:
-            self.filename = filename
-        else:
-            self.filename = os.path.join(self.index.directory, filename)
-        return
+        self.filename = self.index._get_grid_filename(filename)
 
     def __repr__(self):
         return "EnzoGrid_%04i" % (self.id)
 
     @property
     def Parent(self):
-        if self._parent_id == -1:
-            return None
-        return self.index.grids[self._parent_id - self._id_offset]
+        return self.index._get_grid_parent(self.id - self._id_offset)
 
     @property
     def Children(self):
-        return [self.index.grids[cid - self._id_offset] for cid in self._children_ids]
+        return self.index._get_grid_children(self.id - self._id_offset)
 
     @property
     def NumberOfActiveParticles(self):
@@ -217,20 +296,50 @@ class EnzoHierarchy(GridIndex):
         else:
             raise NotImplementedError
 
+    @property
+    def _index_cache_filename(self):
+        return f"{self.index_filename}.npz"
+
+    @property
+    def _index_sources(self):
+        return [self.index_filename, self.ds.parameter_filename]
+
+    def _load_hierarchy_cache(self):
+        arrays = self._load_index_cache(self._index_cache_filename, self._index_sources)
+        if arrays is None:
+            return False
+        nap = getattr(self, "grid_active_particle_count", {})
+        if any(f"nap_{ptype}" not in arrays for ptype in nap):
+            return False
+        for ptype in nap:
+            nap[ptype][:] = arrays[f"nap_{ptype}"]
+        self._set_grid_parents(arrays["grid_parent_id"])
+        # Grids without files are stored with empty names
+        self.filenames = [fn or None for fn in arrays["filenames"].tolist()]
+        return True
+
+    def _save_hierarchy_cache(self):
+        if self.comm.rank not in (0, None):
+            return
+        arrays = {
+            f"nap_{ptype}": counts
+            for ptype, counts in getattr(self, "grid_active_particle_count", {}).items()
+        }
+        self._save_index_cache(
+            self._index_cache_filename,
+            self._index_sources,
+            grid_parent_id=self.grid_parent_id,
+            filenames=np.array([fn or "" for fn in self.filenames], dtype="str"),
+            **arrays,
+        )
+
     # Sets are sorted, so that won't work!
     def _parse_index(self):
-        def _next_token_line(token, f):
-            for line in f:
-                if line.startswith(token):
-                    return line.split()[2:]
-
-        pattern = r"Pointer: Grid\[(\d*)\]->NextGrid(Next|This)Level = (\d*)\s+$"
-        patt = re.compile(pattern)
-        f = open(self.index_filename, "rt")
-        self.grids = [self.grid(1, self)]
-        self.grids[0].Level = 0
-        si, ei, LE, RE, fn, npart = [], [], [], [], [], []
-        pbar = get_pbar("Parsing Hierarchy ", self.num_grids)
+        # The parsed hierarchy is cached, and only parsed again if the
+        # hierarchy or parameter files change
+        if self._load_hierarchy_cache():
+            return
+        records = _HierarchyRecords(self.index_filename)
         version = self.dataset.parameters.get("VersionNumber", None)
         params = self.dataset.parameters
         if version is None and "Internal" in params:
@@ -252,42 +361,34 @@ class EnzoHierarchy(GridIndex):
             else:
                 nap = None
                 active_particles = False
-        for grid_id in range(self.num_grids):
-            pbar.update(grid_id)
-            # We will unroll this list
-            si.append(_next_token_line("GridStartIndex", f))
-            ei.append(_next_token_line("GridEndIndex", f))
-            LE.append(_next_token_line("GridLeftEdge", f))
-            RE.append(_next_token_line("GridRightEdge", f))
-            nb = int(_next_token_line("NumberOfBaryonFields", f)[0])
-            fn.append([None])
-            if nb > 0:
-                fn[-1] = _next_token_line("BaryonFileName", f)
-            npart.append(int(_next_token_line("NumberOfParticles", f)[0]))
-            # Below we find out what active particles exist in this grid,
-            # and add their counts individually.
-            if active_particles:
-                ptypes = _next_token_line("PresentParticleTypes", f)
-                counts = [int(c) for c in _next_token_line("ParticleTypeCounts", f)]
-                for ptype in self.parameters.get("AppendActiveParticleType", []):
-                    if ptype in ptypes:
-                        nap[ptype].append(counts[ptypes.index(ptype)])
-                    else:
-                        nap[ptype].append(0)
-            if nb == 0 and npart[-1] > 0:
-                fn[-1] = _next_token_line("ParticleFileName", f)
-            for line in f:
-                if len(line) < 2:
-                    break
-                if line.startswith("Pointer:"):
-                    vv = patt.findall(line)[0]
-                    self.__pointer_handler(vv)
-        pbar.finish()
+        si = records.values("GridStartIndex", "int64", self.num_grids)
+        ei = records.values("GridEndIndex", "int64", self.num_grids)
+        LE = records.values("GridLeftEdge", "float64", self.num_grids)
+        RE = records.values("GridRightEdge", "float64", self.num_grids)
+        nb = records.values("NumberOfBaryonFields", "int64", self.num_grids)[:, 0]
+        npart = records.values("NumberOfParticles", "int64", self.num_grids)[:, 0]
+        # The grids without baryon fields are read from their particle file
+        fn = np.full(self.num_grids, None, dtype="object")
+        for token, has_file in (
+            ("ParticleFileName", (nb == 0) & (npart > 0)),
+            ("BaryonFileName", nb > 0),
+        ):
+            gi, names = records.grid_names(token)
+            fn[gi[has_file[gi]]] = names[has_file[gi]]
+        # Below we find out what active particles exist in each grid, and add
+        # their counts individually.
+        if active_particles:
+            gi, ptypes = records.grid_values("PresentParticleTypes")
+            counts = records.grid_values("ParticleTypeCounts")[1]
+            for ptype in self.parameters.get("AppendActiveParticleType", []):
+                nap[ptype] = np.zeros(self.num_grids, dtype="int64")
+                for i, types, count in zip(gi, ptypes, counts):
+                    if ptype in types:
+                        nap[ptype][i] = int(count[types.index(ptype)])
         self._fill_arrays(ei, si, LE, RE, npart, nap)
-        temp_grids = np.empty(self.num_grids, dtype="object")
-        temp_grids[:] = self.grids
-        self.grids = temp_grids
-        self.filenames = fn
+        self._set_grid_parents(self._resolve_pointers(*records.pointers()))
+        self.filenames = fn.tolist()
+        self._save_hierarchy_cache()
 
     def _initialize_grid_arrays(self):
         super(EnzoHierarchy, self)._initialize_grid_arrays()
@@ -311,52 +412,73 @@ class EnzoHierarchy(GridIndex):
             for ptype in nap:
                 self.grid_active_particle_count[ptype].flat[:] = nap[ptype]
 
-    def __pointer_handler(self, m):
-        sgi = int(m[2]) - 1
-        if sgi == -1:
-            return  # if it's 0, then we're done with that lineage
-        # Okay, so, we have a pointer.  We make a new grid, with an id of the length+1
-        # (recall, Enzo grids are 1-indexed)
-        self.grids.append(self.grid(len(self.grids) + 1, self))
-        # We'll just go ahead and make a weakref to cache
-        second_grid = self.grids[sgi]  # zero-indexed already
-        first_grid = self.grids[int(m[0]) - 1]
-        if m[1] == "Next":
-            first_grid._children_ids.append(second_grid.id)
-            second_grid._parent_id = first_grid.id
-            second_grid.Level = first_grid.Level + 1
-        elif m[1] == "This":
-            if first_grid.Parent is not None:
-                first_grid.Parent._children_ids.append(second_grid.id)
-                second_grid._parent_id = first_grid._parent_id
-            second_grid.Level = first_grid.Level
-        self.grid_levels[sgi] = second_grid.Level
+    def _resolve_pointers(self, fgi, sgi, next_level):
+        # Every grid is either the first child of a grid on the level above
+        # (NextGridNextLevel) or the next sibling of a grid on its level
+        # (NextGridThisLevel).  Recall, Enzo grids are 1-indexed, and a
+        # pointer to 0 ends a lineage.
+        keep = sgi > 0
+        fgi, sgi, next_level = fgi[keep] - 1, sgi[keep] - 1, next_level[keep]
+        # Following the siblings back gives the first child of every parent
+        first = np.arange(self.num_grids)
+        first[sgi[~next_level]] = fgi[~next_level]
+        while True:
+            new_first = first[first]
+            if (new_first == first).all():
+                break
+            first = new_first
+        parent_ids = np.full(self.num_grids, -1, dtype="int64")
+        parent_ids[sgi[next_level]] = fgi[next_level]
+        parent_ids = parent_ids[first]
+        # The levels are then assigned from the root grids down
+        has_parent = parent_ids >= 0
+        levels = np.zeros(self.num_grids, dtype="int64")
+        while True:
+            new_levels = np.where(has_parent, levels[parent_ids] + 1, 0)
+            if (new_levels == levels).all():
+                break
+            levels = new_levels
+        self.grid_levels[:, 0] = levels
+        return parent_ids
 
     def _rebuild_top_grids(self, level=0):
         mylog.info("Rebuilding grids on level %s", level)
         cmask = self.grid_levels.flat == (level + 1)
         cmsum = cmask.sum()
         mask = np.zeros(self.num_grids, dtype="bool")
-        for grid in self.select_grids(level):
+        parent_ids = self.grid_parent_id.copy()
+        for gi in np.flatnonzero(self.grid_levels.flat == level):
             mask[:] = 0
-            LE = self.grid_left_edge[grid.id - grid._id_offset]
-            RE = self.grid_right_edge[grid.id - grid._id_offset]
+            LE = self.grid_left_edge[gi]
+            RE = self.grid_right_edge[gi]
             grids, grid_i = self.get_box_grids(LE, RE)
             mask[grid_i] = 1
-            grid._children_ids = []
-            cgrids = self.grids[(mask * cmask).astype("bool")]
-            mylog.info("%s: %s / %s", grid, len(cgrids), cmsum)
-            for cgrid in cgrids:
-                grid._children_ids.append(cgrid.id)
-                cgrid._parent_id = grid.id
+            cgi = np.flatnonzero(mask & cmask)
+            mylog.info("%s: %s / %s", self.grids[gi], cgi.size, cmsum)
+            parent_ids[cgi] = gi
+        self._set_grid_parents(parent_ids)
         mylog.info("Finished rebuilding")
 
+    def _get_grid_filename(self, filename):
+        if filename is None:
+            return filename
+        if self._strip_path:
+            return os.path.join(self.directory, os.path.basename(filename))
+        elif filename[0] == os.path.sep:
+            return filename
+        else:
+            return os.path.join(self.directory, filename)
+
     def _populate_grid_objects(self):
-        for g, f in zip(self.grids, self.filenames):
-            g._prepare_grid()
-            g._setup_dx()
-            g.set_filename(f[0])
+        # The grids mostly share a few files, whose names are only built once
+        filenames = {}
+        self.grid_filenames = np.empty(self.num_grids, dtype="object")
+        for i, fn in enumerate(self.filenames):
+            if fn not in filenames:
+                filenames[fn] = self._get_grid_filename(fn)
+            self.grid_filenames[i] = filenames[fn]
         del self.filenames  # No longer needed.
+        self._setup_grid_objects()
         self.max_level = self.grid_levels.max()
 
     def _detect_active_particle_fields(self):
@@ -371,8 +493,7 @@ class EnzoHierarchy(GridIndex):
                 self.dataset.particle_types = new_ptypes
                 self.dataset.particle_types_raw = new_ptypes
                 continue
-            gs = self.grids[select_grids > 0]
-            g = gs[0]
+            g = self.grids[np.flatnonzero(select_grids)[0]]
             handle = h5py.File(g.filename, mode="r")
             node = handle["/Grid%08i/Particles/" % g.id]
             for ptype in (str(p) for p in node):
@@ -562,30 +683,20 @@ class EnzoHierarchyInMemory(EnzoHierarchy):
     def _parse_index(self):
         self._copy_index_structure()
         mylog.debug("Copying reverse tree")
-        reverse_tree = self.enzo.hierarchy_information["GridParentIDs"].ravel().tolist()
-        # Initial setup:
-        mylog.debug("Reconstructing parent-child relationships")
-        grids = []
-        # We enumerate, so it's 0-indexed id and 1-indexed pid
-        self.filenames = ["-1"] * self.num_grids
-        for id, pid in enumerate(reverse_tree):
-            grids.append(self.grid(id + 1, self))
-            grids[-1].Level = self.grid_levels[id, 0]
-            if pid > 0:
-                grids[-1]._parent_id = pid
-                grids[pid - 1]._children_ids.append(grids[-1].id)
+        reverse_tree = self.enzo.hierarchy_information["GridParentIDs"].ravel()
+        # The parent ids are 1-indexed, with 0 for the grids without a parent
+        self._set_grid_parents(np.where(reverse_tree > 0, reverse_tree - 1, -1))
         self.max_level = self.grid_levels.max()
+
+    def _populate_grid_objects(self):
         mylog.debug("Preparing grids")
-        self.grids = np.empty(len(grids), dtype="object")
-        for i, grid in enumerate(grids):
-            if (i % 1e4) == 0:
-                mylog.debug("Prepared % 7i / % 7i grids", i, self.num_grids)
-            grid.filename = "Inline_processor_%07i" % (self.grid_procs[i, 0])
-            grid._prepare_grid()
-            grid._setup_dx()
-            grid.proc_num = self.grid_procs[i, 0]
-            self.grids[i] = grid
-        mylog.debug("Prepared")
+        self._setup_grid_objects()
+
+    def _create_grid(self, i):
+        grid = super(EnzoHierarchyInMemory, self)._create_grid(i)
+        grid.filename = "Inline_processor_%07i" % (self.grid_procs[i, 0])
+        grid.proc_num = self.grid_procs[i, 0]
+        return grid
 
     def _initialize_grid_arrays(self):
         EnzoHierarchy._initialize_grid_arrays(self)
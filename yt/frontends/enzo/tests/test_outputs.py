@@ -1,3 +1,7 @@
+import os
+import shutil
+import tempfile
+
 import numpy as np
 
 from yt.frontends.enzo.api import EnzoDataset
@@ -284,3 +288,66 @@ def test_nonzero_omega_radiation():
         4,
         err_msg="Simulation time not consistent with cosmology calculator.",
     )
+
+
+_hierarchy = """\
+Grid = 1
+GridRank          = 3
+GridDimensions    = 14 14 14
+GridStartIndex    = 3 3 3
+GridEndIndex      = 10 10 10
+GridLeftEdge      = 0 0 0
+GridRightEdge     = 1 1 1
+NumberOfBaryonFields = 6
+BaryonFileName = ./DD0000/data0000.cpu0000
+NumberOfParticles   = 8
+ParticleFileName = ./DD0000/data0000.cpu0000
+Pointer: Grid[1]->NextGridThisLevel = 0
+Pointer: Grid[1]->NextGridNextLevel = 2
+
+Grid = 2
+GridRank          = 3
+GridDimensions    = 10 10 10
+GridStartIndex    = 3 3 3
+GridEndIndex      = 6 6 6
+GridLeftEdge      = 0.25 0.25 0.25
+GridRightEdge     = 0.5 0.5 0.5
+NumberOfBaryonFields = 0
+NumberOfParticles   = 2
+ParticleFileName = ./DD0000/data0000.cpu0001
+Pointer: Grid[2]->NextGridThisLevel = 3
+Pointer: Grid[2]->NextGridNextLevel = 0
+
+Grid = 3
+GridRank          = 3
+GridDimensions    = 10 10 10
+GridStartIndex    = 3 3 3
+GridEndIndex      = 6 6 6
+GridLeftEdge      = 0.5 0.5 0.5
+GridRightEdge     = 0.75 0.75 0.75
+NumberOfBaryonFields = 0
+NumberOfParticles   = 0
+Pointer: Grid[3]->NextGridThisLevel = 0
+Pointer: Grid[3]->NextGridNextLevel = 0
+"""
+
+
+def test_hierarchy_records():
+    from yt.frontends.enzo.data_structures import _HierarchyRecords
+
+    tmpdir = tempfile.mkdtemp()
+    filename = os.path.join(tmpdir, "data0000.hierarchy")
+    with open(filename, "w") as f:
+        f.write(_hierarchy)
+    records = _HierarchyRecords(filename)
+    assert_equal(records.values("GridEndIndex", "int64", 3)[:, 0], [10, 6, 6])
+    assert_equal(records.values("GridLeftEdge", "float64", 3)[:, 0], [0, 0.25, 0.5])
+    assert_equal(records.values("NumberOfParticles", "int64", 3)[:, 0], [8, 2, 0])
+    grids, names = records.grid_names("ParticleFileName")
+    assert_equal(grids, [0, 1])
+    assert_equal(names[1], "./DD0000/data0000.cpu0001")
+    grid_ids, next_ids, next_level = records.pointers()
+    assert_equal(grid_ids, [1, 1, 2, 2, 3, 3])
+    assert_equal(next_ids, [0, 2, 3, 0, 0, 0])
+    assert_equal(next_level, [False, True, False, True, False, True])
+    shutil.rmtree(tmpdir)
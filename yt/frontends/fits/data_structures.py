@@ -704,19 +704,19 @@ class SkyDataFITSDataset(FITSDataset):
 
 
 class SpectralCubeFITSHierarchy(FITSHierarchy):
+    def _count_grids(self):
+        # Every grid holds at least one channel
+        self.num_grids = min(self.ds.parameters["nprocs"], self.ds.domain_dimensions[2])
+
     def _domain_decomp(self):
+        # The cube is split into slabs of whole channels, as even as possible,
+        # so that reading a range of channels only touches their planes
         dz = self.ds.quan(1.0, "code_length") * self.ds.spectral_factor
-        self.grid_dimensions[:, 2] = np.around(
-            float(self.ds.domain_dimensions[2]) / self.num_grids
-        ).astype("int")
-        self.grid_dimensions[-1, 2] += self.ds.domain_dimensions[2] % self.num_grids
-        self.grid_left_edge[0, 2] = self.ds.domain_left_edge[2]
-        self.grid_left_edge[1:, 2] = (
-            self.ds.domain_left_edge[2] + np.cumsum(self.grid_dimensions[:-1, 2]) * dz
-        )
-        self.grid_right_edge[:, 2] = (
-            self.grid_left_edge[:, 2] + self.grid_dimensions[:, 2] * dz
-        )
+        nz = self.ds.domain_dimensions[2]
+        bounds = np.arange(self.num_grids + 1) * nz // self.num_grids
+        self.grid_dimensions[:, 2] = np.diff(bounds)
+        self.grid_left_edge[:, 2] = self.ds.domain_left_edge[2] + bounds[:-1] * dz
+        self.grid_right_edge[:, 2] = self.ds.domain_left_edge[2] + bounds[1:] * dz
         self.grid_left_edge[:, :2] = self.ds.domain_left_edge[:2]
         self.grid_right_edge[:, :2] = self.ds.domain_right_edge[:2]
         self.grid_dimensions[:, :2] = self.ds.domain_dimensions[:2]
@@ -4,6 +4,16 @@ from yt.utilities.io_handler import BaseIOHandler
 from yt.utilities.logger import ytLogger as mylog
 
 
+def _selected_bounds(mask):
+    # The slices of the bounding box of the selected cells of a grid
+    bounds = []
+    for axis in range(mask.ndim):
+        other = tuple(i for i in range(mask.ndim) if i != axis)
+        selected = np.flatnonzero(mask.any(axis=other))
+        bounds.append(slice(selected[0], selected[-1] + 1))
+    return tuple(bounds)
+
+
 class IOHandlerFITS(BaseIOHandler):
     _particle_reader = False
     _dataset_type = "fits"
@@ -12,6 +22,18 @@ class IOHandlerFITS(BaseIOHandler):
         super(IOHandlerFITS, self).__init__(ds)
         self.ds = ds
         self._handle = ds._handle
+        self._field_views = {}
+
+    def _field_view(self, fname):
+        # The memory-mapped values of a field, indexed as (z, y, x), or as
+        # (y, x) for images.  Nothing is read until the view is sliced.
+        if fname not in self._field_views:
+            index = self.ds.index
+            data = index._file_map[fname][index._ext_map[fname]].data
+            if self.ds.dimensionality != 2 and self.ds.naxis == 4:
+                data = data[index._axis_map[fname]]
+            self._field_views[fname] = data
+        return self._field_views[fname]
 
     def _read_particles(
         self, fields_to_read, type, args, grid_list, count_list, conv_factors
@@ -67,31 +89,36 @@ class IOHandlerFITS(BaseIOHandler):
         dx = self.ds.domain_width / self.ds.domain_dimensions
         for field in fields:
             ftype, fname = field
-            f = self.ds.index._file_map[fname]
-            ds = f[self.ds.index._ext_map[fname]]
+            view = self._field_view(fname)
             bzero, bscale = self.ds.index._scale_map[fname]
+            nan_value = self.ds.nan_mask.get(fname, self.ds.nan_mask.get("all"))
             ind = 0
             for chunk in chunks:
                 for g in chunk.objs:
+                    if g.count(selector) == 0:
+                        continue
+                    # Only the planes, rows and columns holding selected
+                    # cells are read from the file
+                    mask = g._get_selector_mask(selector)
+                    bounds = _selected_bounds(mask)
                     start = ((g.LeftEdge - self.ds.domain_left_edge) / dx).d.astype(
                         "int"
                     )
-                    end = start + g.ActiveDimensions
-                    slices = [slice(start[i], end[i]) for i in range(3)]
+                    slices = [
+                        slice(start[i] + b.start, start[i] + b.stop)
+                        for i, b in enumerate(bounds)
+                    ]
                     if self.ds.dimensionality == 2:
-                        nx, ny = g.ActiveDimensions[:2]
-                        nz = 1
-                        data = np.zeros((nx, ny, nz))
-                        data[:, :, 0] = ds.data[slices[1], slices[0]].T
-                    elif self.ds.naxis == 4:
-                        idx = self.ds.index._axis_map[fname]
-                        data = ds.data[idx, slices[2], slices[1], slices[0]].T
+                        data = view[slices[1], slices[0]].T[:, :, np.newaxis]
                     else:
-                        data = ds.data[slices[2], slices[1], slices[0]].T
-                    if fname in self.ds.nan_mask:
-                        data[np.isnan(data)] = self.ds.nan_mask[fname]
-                    elif "all" in self.ds.nan_mask:
-                        data[np.isnan(data)] = self.ds.nan_mask["all"]
-                    data = bzero + bscale * data
-                    ind += g.select(selector, data.astype("float64"), rv[field], ind)
+                        data = view[slices[2], slices[1], slices[0]].T
+                    data = np.array(data, dtype="float64")
+                    if nan_value is not None:
+                        data[np.isnan(data)] = nan_value
+                    data *= bscale
+                    data += bzero
+                    mask = mask[bounds]
+                    nd = g.count(selector)
+                    rv[field][ind : ind + nd] = data[mask]
+                    ind += nd
         return rv
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from yt.testing import assert_equal, requires_module
+
+
+def _write_cube(filename, raw):
+    from astropy.io import fits
+
+    hdu = fits.PrimaryHDU(raw)
+    header = hdu.header
+    axes = [("RA---TAN", "deg", 0.01), ("DEC--TAN", "deg", 0.01), ("VRAD", "m/s", 1e3)]
+    for i, (ctype, cunit, cdelt) in enumerate(axes):
+        header[f"CTYPE{i + 1}"] = ctype
+        header[f"CUNIT{i + 1}"] = cunit
+        header[f"CRPIX{i + 1}"] = 1.0
+        header[f"CRVAL{i + 1}"] = 10.0
+        header[f"CDELT{i + 1}"] = cdelt
+    header["BUNIT"] = "K"
+    header["BZERO"] = 3.0
+    header["BSCALE"] = 2.0
+    hdu.writeto(filename)
+
+
+def _expected(filename, nan_value):
+    # The values of the cube, read from the HDU and scaled by hand
+    from astropy.io import fits
+
+    with fits.open(filename, do_not_scale_image_data=True) as f:
+        raw = np.array(f[0].data, dtype="float64")
+        bzero, bscale = f[0].header["BZERO"], f[0].header["BSCALE"]
+    raw[np.isnan(raw)] = nan_value
+    return raw * bscale + bzero
+
+
+@requires_module("astropy")
+def test_spectral_cube_channels():
+    from yt.frontends.fits.data_structures import SpectralCubeFITSDataset
+
+    tmpdir = tempfile.mkdtemp()
+    filename = os.path.join(tmpdir, "cube.fits")
+    nz, ny, nx = 11, 6, 5
+    raw = np.arange(nz * ny * nx, dtype="float32").reshape(nz, ny, nx)
+    raw[3, 2, 1] = np.nan
+    raw[7, 0, 4] = np.nan
+    _write_cube(filename, raw)
+    expected = _expected(filename, -5.0)
+
+    ds = SpectralCubeFITSDataset(filename, nprocs=4, nan_mask=-5.0)
+    # The channels are split between the grids without overlapping
+    dims = ds.index.grid_dimensions
+    assert_equal(len(dims), 4)
+    assert_equal(dims[:, 2].sum(), nz)
+    assert_equal(dims[:, 2].max() - dims[:, 2].min() <= 1, True)
+
+    def pixels(dobj):
+        # The indices of the cells of dobj in the cube
+        return tuple(
+            (dobj["index", ax].d - 0.5).astype("int64") for ax in ("z", "y", "x")
+        )
+
+    ad = ds.r[:]
+    assert_equal(ad["fits", "temperature"].d, expected[pixels(ad)])
+    assert_equal(ad["fits", "temperature"].size, nz * ny * nx)
+    for channel in (0, 3, 7, 10):
+        reg = ds.r[:, :, 0.5 + channel : 1.5 + channel]
+        values = reg["fits", "temperature"].d
+        assert_equal(values.size, ny * nx)
+        assert_equal(values, expected[pixels(reg)])
+        assert_equal(values, expected[channel][pixels(reg)[1:]])
+    shutil.rmtree(tmpdir)
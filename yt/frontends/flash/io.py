@@ -3,7 +3,7 @@ from itertools import groupby
 import numpy as np
 
 from yt.geometry.selection_routines import AlwaysSelector
-from yt.utilities.io_handler import BaseIOHandler
+from yt.utilities.io_handler import BaseIOHandler, index_runs
 from yt.utilities.lib.geometry_utils import compute_morton
 
 
@@ -15,11 +15,13 @@ def particle_sequences(grids):
         yield seq[0], seq[-1]
 
 
-def grid_sequences(grids):
-    g_iter = sorted(grids, key=lambda g: g.id)
-    for _k, g in groupby(enumerate(g_iter), lambda i_x1: i_x1[0] - i_x1[1].id):
-        seq = list(v[1] for v in g)
-        yield seq
+def grid_runs(grids, min_gap=1):
+    # The grids sorted by block, and grouped into runs of blocks that are
+    # read at once, as (start, stop, grids)
+    grids = list(grids)
+    blocks = [g.id - g._id_offset for g in grids]
+    for start, stop, positions in index_runs(blocks, min_gap):
+        yield start, stop, [grids[i] for i in positions]
 
 
 def determine_particle_fields(handle):
@@ -38,6 +40,9 @@ def determine_particle_fields(handle):
 class IOHandlerFLASH(BaseIOHandler):
     _particle_reader = False
     _dataset_type = "flash_hdf5"
+    # Blocks of a chunk fewer than this many blocks apart are read in a
+    # single hyperslab, along with the blocks in between
+    _block_gap = 8
 
     def __init__(self, ds):
         super(IOHandlerFLASH, self).__init__(ds)
@@ -54,18 +59,18 @@ class IOHandlerFLASH(BaseIOHandler):
     def io_iter(self, chunks, fields):
         f = self._handle
         for chunk in chunks:
+            runs = list(grid_runs(chunk.objs, self._block_gap))
             for field in fields:
                 # Note that we *prefer* to iterate over the fields on the
                 # outside; here, though, we're iterating over them on the
                 # inside because we may exhaust our chunks.
                 ftype, fname = field
                 ds = f[f"/{fname}"]
-                for gs in grid_sequences(chunk.objs):
-                    start = gs[0].id - gs[0]._id_offset
-                    end = gs[-1].id - gs[-1]._id_offset + 1
+                for start, end, gs in runs:
                     data = ds[start:end, :, :, :]
-                    for i, g in enumerate(gs):
-                        yield field, g, self._read_obj_field(g, field, (data, i))
+                    for g in gs:
+                        offset = g.id - g._id_offset - start
+                        yield field, g, self._read_obj_field(g, field, (data, offset))
 
     def _read_particle_coords(self, chunks, ptf):
         chunks = list(chunks)
@@ -140,15 +145,15 @@ class IOHandlerFLASH(BaseIOHandler):
             rv.update(self._read_particle_selection([chunk], selector, particle_fields))
         if len(fluid_fields) == 0:
             return rv
+        runs = list(grid_runs(chunk.objs, self._block_gap))
         for field in fluid_fields:
             ftype, fname = field
             ds = f[f"/{fname}"]
-            for gs in grid_sequences(chunk.objs):
-                start = gs[0].id - gs[0]._id_offset
-                end = gs[-1].id - gs[-1]._id_offset + 1
+            for start, end, gs in runs:
                 data = ds[start:end, :, :, :].transpose()
-                for i, g in enumerate(gs):
-                    rv[g.id][field] = np.asarray(data[..., i], "=f8")
+                for g in gs:
+                    offset = g.id - g._id_offset - start
+                    rv[g.id][field] = np.asarray(data[..., offset], "=f8")
         return rv
 
 
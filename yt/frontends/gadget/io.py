@@ -1,11 +1,11 @@
 import os
 from collections import defaultdict
+from functools import partial
 
 import numpy as np
 
 from yt.frontends.sph.io import IOHandlerSPH
-from yt.units.yt_array import uconcatenate
-from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
+from yt.utilities.io_handler import read_masked_rows
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
 
@@ -102,26 +102,21 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                     os.remove(hfn)
             else:
                 return
-        positions = []
+        gen = self._smoothing_length_generator(index, hsml_fn)
+        if gen is None:
+            return
+        ptype = self.ds._sph_ptypes[0]
         counts = defaultdict(int)
         for data_file in data_files:
-            for _, ppos in self._yield_coordinates(
-                data_file, needed_ptype=self.ds._sph_ptypes[0]
-            ):
-                counts[data_file.filename] += ppos.shape[0]
-                positions.append(ppos)
-        if not positions:
-            return
+            counts[data_file.filename] += data_file.total_particles[ptype]
         offsets = {}
         offset = 0
         for fn, count in counts.items():
             offsets[fn] = offset
             offset += count
-        kdtree = index.kdtree
-        positions = uconcatenate(positions)[kdtree.idx]
-        hsml = generate_smoothing_length(positions, kdtree, self.ds._num_neighbors)
-        dtype = positions.dtype
-        hsml = hsml[np.argsort(kdtree.idx)].astype(dtype)
+        with h5py.File(data_files[0].filename, mode="r") as f:
+            dtype = f[ptype]["Coordinates"].dtype.newbyteorder("N")
+        hsml = gen.generate()
         mylog.warning("Writing smoothing lengths to hsml files.")
         for i, data_file in enumerate(data_files):
             si, ei = data_file.start, data_file.end
@@ -137,6 +132,8 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                 begin = si + offsets[fn]
                 end = min(ei, d.size) + offsets[fn]
                 d[si:ei] = hsml[begin:end]
+        del hsml
+        gen.cleanup()
 
     def _get_smoothing_length(self, data_file, position_dtype, position_shape):
         ptype = self.ds._sph_ptypes[0]
@@ -158,6 +155,49 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
             hsml[:] = ds
             return hsml
 
+    def _read_selection_positions(self, data_file, ptype, rows=None):
+        # The positions and smoothing lengths used to select particles, for
+        # all the particles of the data file or only those in rows
+        si, ei = data_file.start, data_file.end
+        with h5py.File(data_file.filename, mode="r") as f:
+            ds = f[f"/{ptype}/Coordinates"]
+            if rows is None:
+                coords = ds[si:ei].astype("float64")
+            else:
+                coords = read_masked_rows(ds, si, si + rows.size, rows)
+                coords = coords.astype("float64")
+            if ptype == self.ds._sph_ptypes[0]:
+                hsmls = self._get_smoothing_length(
+                    data_file, ds.dtype, ds.shape
+                ).astype("float64")
+                if rows is not None:
+                    hsmls = hsmls[rows]
+            else:
+                hsmls = 0.0
+        return coords, hsmls
+
+    def _count_particles_chunks(self, psize, chunks, ptf, selector):
+        if getattr(selector, "is_all_data", False):
+            return super()._count_particles_chunks(psize, chunks, ptf, selector)
+        # The selection masks are kept to be reused by _read_particle_fields
+        data_files = set([])
+        for chunk in chunks:
+            for obj in chunk.objs:
+                data_files.update(obj.data_files)
+        for data_file in sorted(data_files, key=lambda x: (x.filename, x.start)):
+            for ptype in sorted(ptf):
+                if data_file.total_particles[ptype] == 0:
+                    continue
+                mask = self._get_particle_mask(
+                    selector,
+                    data_file,
+                    ptype,
+                    partial(self._read_selection_positions, data_file, ptype),
+                )
+                if mask is not None:
+                    psize[ptype] += mask.sum()
+        return dict(psize)
+
     def _read_particle_fields(self, chunks, ptf, selector):
         # Now we have all the sizes, and we can allocate
         data_files = set([])
@@ -171,24 +211,19 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                 if data_file.total_particles[ptype] == 0:
                     continue
                 g = f[f"/{ptype}"]
+                hsmls = None
                 if getattr(selector, "is_all_data", False):
                     mask = slice(None, None, None)
                     mask_sum = data_file.total_particles[ptype]
-                    hsmls = None
                 else:
-                    coords = g["Coordinates"][si:ei].astype("float64")
-                    if ptype == "PartType0":
-                        hsmls = self._get_smoothing_length(
-                            data_file, g["Coordinates"].dtype, g["Coordinates"].shape
-                        ).astype("float64")
-                    else:
-                        hsmls = 0.0
-                    mask = selector.select_points(
-                        coords[:, 0], coords[:, 1], coords[:, 2], hsmls
+                    mask = self._get_particle_mask(
+                        selector,
+                        data_file,
+                        ptype,
+                        partial(self._read_selection_positions, data_file, ptype),
                     )
                     if mask is not None:
                         mask_sum = mask.sum()
-                    del coords
                 if mask is None:
                     continue
                 for field in field_list:
@@ -199,16 +234,18 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                         data[:] = self.ds["Massarr"][ind]
                     elif field in self._element_names:
                         rfield = "ElementAbundance/" + field
-                        data = g[rfield][si:ei][mask, ...]
+                        data = read_masked_rows(g[rfield], si, ei, mask)
                     elif field.startswith("Metallicity_"):
                         col = int(field.rsplit("_", 1)[-1])
-                        data = g["Metallicity"][si:ei, col][mask]
+                        data = read_masked_rows(g["Metallicity"], si, ei, mask, col)
                     elif field.startswith("GFM_Metals_"):
                         col = int(field.rsplit("_", 1)[-1])
-                        data = g["GFM_Metals"][si:ei, col][mask]
+                        data = read_masked_rows(g["GFM_Metals"], si, ei, mask, col)
                     elif field.startswith("Chemistry_"):
                         col = int(field.rsplit("_", 1)[-1])
-                        data = g["ChemistryAbundances"][si:ei, col][mask]
+                        data = read_masked_rows(
+                            g["ChemistryAbundances"], si, ei, mask, col
+                        )
                     elif field == "smoothing_length":
                         # This is for frontends which do not store
                         # the smoothing length on-disk, so we do not
@@ -222,7 +259,7 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                             ).astype("float64")
                         data = hsmls[mask]
                     else:
-                        data = g[field][si:ei][mask, ...]
+                        data = read_masked_rows(g[field], si, ei, mask)
 
                     yield (ptype, field), data
             f.close()
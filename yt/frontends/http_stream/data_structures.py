@@ -5,7 +5,7 @@ import numpy as np
 
 from yt.data_objects.static_output import ParticleDataset, ParticleFile
 from yt.frontends.sph.fields import SPHFieldInfo
-from yt.funcs import get_requests
+from yt.funcs import get_requests, setdefaultattr
 from yt.geometry.particle_geometry_handler import ParticleIndex
 
 
@@ -14,13 +14,22 @@ class HTTPParticleFile(ParticleFile):
 
 
 class HTTPStreamDataset(ParticleDataset):
+    """
+    Particles served over HTTP, with a yt_index.json header at base_url and
+    the raw values of every field at base_url/<file>/<ptype>/<field>.  The
+    fields are fetched over max_connections pooled connections, and the
+    responses are cached, up to cache_size bytes, in memory and optionally
+    in cache_dir.
+    """
+
     _index_class = ParticleIndex
     _file_class = HTTPParticleFile
     _field_info_class = SPHFieldInfo
     _particle_mass_name = "Mass"
     _particle_coordinates_name = "Coordinates"
     _particle_velocity_name = "Velocities"
-    filename_template = ""
+    # The data files are numbered on the server
+    filename_template = "%(num)i"
 
     def __init__(
         self,
@@ -29,10 +38,16 @@ class HTTPStreamDataset(ParticleDataset):
         unit_system="cgs",
         index_order=None,
         index_filename=None,
+        max_connections=8,
+        cache_size=2 ** 28,
+        cache_dir=None,
     ):
         if get_requests() is None:
             raise ImportError("This functionality depends on the requests package")
         self.base_url = base_url
+        self.max_connections = max_connections
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
         super(HTTPStreamDataset, self).__init__(
             "",
             dataset_type=dataset_type,
@@ -79,19 +94,12 @@ class HTTPStreamDataset(ParticleDataset):
 
         self.file_count = header["num_files"]
 
-    def _set_units(self):
-        length_unit = float(self.parameters["units"]["length"])
-        time_unit = float(self.parameters["units"]["time"])
-        mass_unit = float(self.parameters["units"]["mass"])
-        density_unit = mass_unit / length_unit ** 3
-        velocity_unit = length_unit / time_unit
-        self._unit_base = {}
-        self._unit_base["cm"] = 1.0 / length_unit
-        self._unit_base["s"] = 1.0 / time_unit
-        super(HTTPStreamDataset, self)._set_units()
-        self.conversion_factors["velocity"] = velocity_unit
-        self.conversion_factors["mass"] = mass_unit
-        self.conversion_factors["density"] = density_unit
+    def _set_code_unit_attributes(self):
+        units = self.parameters["units"]
+        setdefaultattr(self, "length_unit", self.quan(float(units["length"]), "cm"))
+        setdefaultattr(self, "time_unit", self.quan(float(units["time"]), "s"))
+        setdefaultattr(self, "mass_unit", self.quan(float(units["mass"]), "g"))
+        setdefaultattr(self, "velocity_unit", self.length_unit / self.time_unit)
 
     @classmethod
     def _is_valid(cls, filename, *args, **kwargs):
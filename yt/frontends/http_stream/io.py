@@ -1,8 +1,8 @@
 import numpy as np
 
-from yt.funcs import get_requests, mylog
+from yt.funcs import get_requests
+from yt.utilities.http_fetcher import HTTPFetcher
 from yt.utilities.io_handler import BaseIOHandler
-from yt.utilities.lib.geometry_utils import compute_morton
 
 
 class IOHandlerHTTPStream(BaseIOHandler):
@@ -13,21 +13,38 @@ class IOHandlerHTTPStream(BaseIOHandler):
         if get_requests() is None:
             raise ImportError("This functionality depends on the requests package")
         self._url = ds.base_url
-        # This should eventually manage the IO and cache it
-        self.total_bytes = 0
+        # The connections are pooled, and the responses cached, so that the
+        # positions are only downloaded once for counting, indexing and
+        # reading the particles
+        self._fetcher = HTTPFetcher(
+            max_connections=ds.max_connections,
+            cache_size=ds.cache_size,
+            cache_dir=ds.cache_dir,
+        )
         super(IOHandlerHTTPStream, self).__init__(ds)
 
-    def _open_stream(self, data_file, field):
-        # This does not actually stream yet!
-        ftype, fname = field
-        s = f"{self._url}/{data_file.file_id}/{ftype}/{fname}"
-        mylog.info("Loading URL %s", s)
-        requests = get_requests()
-        resp = requests.get(s)
-        if resp.status_code != 200:
-            raise RuntimeError
-        self.total_bytes += len(resp.content)
-        return resp.content
+    @property
+    def total_bytes(self):
+        return self._fetcher.total_bytes
+
+    def _read_fields(self, data_file, fields):
+        # All the fields of a data file are fetched at once, each as the
+        # range of its file holding the particles of data_file
+        counts = self._count_particles(data_file)
+        urls, byte_ranges, shapes = [], [], []
+        for ftype, fname in fields:
+            urls.append(f"{self._url}/{data_file.filename}/{ftype}/{fname}")
+            shape = (counts[ftype], 3) if fname in self._vector_fields else (-1,)
+            size = 8 * np.prod(shape[1:], dtype="int64")
+            byte_ranges.append(
+                (data_file.start * size, (data_file.start + counts[ftype]) * size)
+            )
+            shapes.append(shape)
+        arrays = self._fetcher.fetch_many(urls, "float64", byte_ranges)
+        return {
+            field: arr.reshape(shape)
+            for field, arr, shape in zip(fields, arrays, shapes)
+        }
 
     def _identify_fields(self, data_file):
         f = []
@@ -42,12 +59,22 @@ class IOHandlerHTTPStream(BaseIOHandler):
             for obj in chunk.objs:
                 data_files.update(obj.data_files)
         for data_file in sorted(data_files, key=lambda x: (x.filename, x.start)):
-            for ptype in ptf:
-                s = self._open_stream(data_file, (ptype, "Coordinates"))
-                c = np.frombuffer(s, dtype="float64")
-                c.shape = (c.shape[0] / 3.0, 3)
+            for ptype, c in self._yield_coordinates(data_file, ptf):
                 yield ptype, (c[:, 0], c[:, 1], c[:, 2])
 
+    def _yield_coordinates(self, data_file, needed_ptype=None):
+        counts = self._count_particles(data_file)
+        ptypes = [
+            ptype
+            for ptype in sorted(counts)
+            if counts[ptype] > 0 and (needed_ptype is None or ptype in needed_ptype)
+        ]
+        data = self._read_fields(
+            data_file, [(ptype, "Coordinates") for ptype in ptypes]
+        )
+        for ptype in ptypes:
+            yield ptype, data[ptype, "Coordinates"]
+
     def _read_particle_fields(self, chunks, ptf, selector):
         # Now we have all the sizes, and we can allocate
         data_files = set([])
@@ -55,43 +82,29 @@ class IOHandlerHTTPStream(BaseIOHandler):
             for obj in chunk.objs:
                 data_files.update(obj.data_files)
         for data_file in sorted(data_files, key=lambda x: (x.filename, x.start)):
-            for ptype, field_list in sorted(ptf.items()):
-                s = self._open_stream(data_file, (ptype, "Coordinates"))
-                c = np.frombuffer(s, dtype="float64")
-                c.shape = (c.shape[0] / 3.0, 3)
+            masks = {}
+            for ptype, c in self._yield_coordinates(data_file, ptf):
                 mask = selector.select_points(c[:, 0], c[:, 1], c[:, 2], 0.0)
-                del c
-                if mask is None:
-                    continue
-                for field in field_list:
-                    s = self._open_stream(data_file, (ptype, field))
-                    c = np.frombuffer(s, dtype="float64")
-                    if field in self._vector_fields:
-                        c.shape = (c.shape[0] / 3.0, 3)
-                    data = c[mask, ...]
-                    yield (ptype, field), data
-
-    def _initialize_index(self, data_file, regions):
-        header = self.ds.parameters
-        ptypes = header["particle_count"][data_file.file_id].keys()
-        pcount = sum(header["particle_count"][data_file.file_id].values())
-        morton = np.empty(pcount, dtype="uint64")
-        ind = 0
-        for ptype in ptypes:
-            s = self._open_stream(data_file, (ptype, "Coordinates"))
-            c = np.frombuffer(s, dtype="float64")
-            c.shape = (c.shape[0] / 3.0, 3)
-            regions.add_data_file(c, data_file.file_id, data_file.ds.filter_bbox)
-            morton[ind : ind + c.shape[0]] = compute_morton(
-                c[:, 0],
-                c[:, 1],
-                c[:, 2],
-                data_file.ds.domain_left_edge,
-                data_file.ds.domain_right_edge,
-                data_file.ds.filter_bbox,
-            )
-            ind += c.shape[0]
-        return morton
+                if mask is not None:
+                    masks[ptype] = mask
+            # The fields of all the selected particle types are then fetched
+            # concurrently
+            fields = [
+                (ptype, field)
+                for ptype, field_list in sorted(ptf.items())
+                if ptype in masks
+                for field in field_list
+            ]
+            data = self._read_fields(data_file, fields)
+            for ptype, field in fields:
+                yield (ptype, field), data[ptype, field][masks[ptype], ...]
 
     def _count_particles(self, data_file):
-        return self.ds.parameters["particle_count"][data_file.file_id]
+        si, ei = data_file.start, data_file.end
+        counts = self.ds.parameters["particle_count"][int(data_file.filename)]
+        if None not in (si, ei):
+            counts = {
+                ptype: int(np.clip(count - si, 0, ei - si))
+                for ptype, count in counts.items()
+            }
+        return counts
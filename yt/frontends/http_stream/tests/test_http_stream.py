@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from yt.frontends.http_stream.api import HTTPStreamDataset
+from yt.testing import assert_almost_equal, assert_equal, requires_module
+from yt.utilities.tests.test_http_fetcher import serve_directory
+
+
+def _write_particle_files(root, counts):
+    # Each field of each data file is served as raw float64 values
+    fields = {}
+    for i, count in enumerate(counts):
+        os.makedirs(os.path.join(root, str(i), "io"))
+        for fname, shape in (("Coordinates", (count, 3)), ("Mass", (count,))):
+            fields[i, fname] = np.random.random(shape)
+            fields[i, fname].tofile(os.path.join(root, str(i), "io", fname))
+    header = {
+        "particle_count": {i: {"io": count} for i, count in enumerate(counts)},
+        "field_list": [["io", "Coordinates"], ["io", "Mass"]],
+        "domain_left_edge": [0.0, 0.0, 0.0],
+        "domain_right_edge": [1.0, 1.0, 1.0],
+        "current_time": 0.0,
+        "cosmological_simulation": 0,
+        "current_redshift": 0.0,
+        "omega_lambda": 0.0,
+        "omega_matter": 0.0,
+        "hubble_constant": 0.0,
+        "num_files": len(counts),
+        "units": {"length": 1.0, "time": 1.0, "mass": 1.0},
+    }
+    with open(os.path.join(root, "yt_index.json"), "w") as f:
+        json.dump(header, f)
+    return fields
+
+
+@requires_module("requests")
+def test_http_stream():
+    tmpdir = tempfile.mkdtemp()
+    fields = _write_particle_files(tmpdir, [1000, 2000, 500])
+    httpd = serve_directory(tmpdir)
+    ds = HTTPStreamDataset(httpd.url)
+    pos = np.concatenate([fields[i, "Coordinates"] for i in range(3)])
+    mass = np.concatenate([fields[i, "Mass"] for i in range(3)])
+
+    ad = ds.all_data()
+    assert_equal(ad["io", "particle_mass"].size, 3500)
+    assert_almost_equal(ad["io", "particle_mass"].sum().d, mass.sum())
+    sp = ds.sphere([0.5, 0.5, 0.5], 0.25)
+    inside = ((pos - 0.5) ** 2).sum(axis=1) <= 0.25 ** 2
+    assert_equal(sp["io", "particle_mass"].size, inside.sum())
+    assert_almost_equal(sp["io", "particle_mass"].sum().d, mass[inside].sum())
+
+    # The positions are only downloaded once, although they are used to
+    # build the index and to select the particles of both data objects
+    urls = [path for path, _ in httpd.requests]
+    assert_equal(sum("Coordinates" in url for url in urls), 3)
+    assert_equal(sum("Mass" in url for url in urls), 3)
+    httpd.shutdown()
+    httpd.server_close()
+    shutil.rmtree(tmpdir)
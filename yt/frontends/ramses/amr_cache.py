@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+
+from yt.funcs import mylog
+
+# Bump this whenever the layout of the cache changes
+AMR_CACHE_VERSION = 1
+
+
+def amr_file_key(amr_fn, min_level, max_level):
+    """Return the key identifying the content of an AMR file.
+
+    The key is built from the file metadata (size and modification time)
+    together with the range of levels that have been read. max_level is the
+    number of levels read, that is the ``nlevelmax`` of the file header
+    capped by the ``max_level`` the dataset is loaded with, so that loading
+    the dataset with a lower ``max_level`` invalidates the cached entries.
+    """
+    st = os.stat(amr_fn)
+    return np.array([st.st_size, st.st_mtime_ns, min_level, max_level], dtype="int64")
+
+
+class RAMSESAMRCache:
+    """A sidecar cache of the oct positions of RAMSES domains.
+
+    For each domain, the cache stores the (cpu, level, count) blocks and
+    the oct positions returned by ``read_amr_positions``, which is enough
+    to rebuild the ``RAMSESOctreeContainer`` without parsing the AMR files
+    again. Entries are validated against the metadata of the AMR file they
+    originate from.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the cache file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._entries = {}
+        self._modified = False
+        self._npz = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with np.load(self.filename) as data:
+                if int(data["version"]) != AMR_CACHE_VERSION:
+                    mylog.debug("Ignoring outdated AMR cache %s", self.filename)
+                    return
+                for domain_id in data["domain_ids"]:
+                    prefix = "domain_%05i" % domain_id
+                    # Only the keys are read here, the (large) position
+                    # arrays are read on demand.
+                    self._entries[int(domain_id)] = (data[f"{prefix}_key"], None, None)
+        except (OSError, ValueError, KeyError) as e:
+            mylog.warning("Could not read AMR cache %s (%s)", self.filename, e)
+            self._entries = {}
+
+    def _read_entry(self, domain_id):
+        key, blocks, pos = self._entries[domain_id]
+        if blocks is None:
+            prefix = "domain_%05i" % domain_id
+            if self._npz is None:
+                self._npz = np.load(self.filename)
+            blocks = self._npz[f"{prefix}_blocks"]
+            pos = self._npz[f"{prefix}_pos"]
+            self._entries[domain_id] = (key, blocks, pos)
+        return key, blocks, pos
+
+    def get(self, domain_id, key):
+        """Return the cached (blocks, pos) of a domain, or None if missing
+        or invalid."""
+        entry = self._entries.get(domain_id)
+        if entry is None or not np.array_equal(entry[0], key):
+            return None
+        try:
+            _, blocks, pos = self._read_entry(domain_id)
+        except (OSError, ValueError, KeyError):
+            return None
+        return blocks, pos
+
+    def set(self, domain_id, key, blocks, pos):
+        self._entries[domain_id] = (key, blocks, pos)
+        self._modified = True
+
+    def close(self):
+        if self._npz is not None:
+            self._npz.close()
+            self._npz = None
+
+    def invalidate(self):
+        """Drop all the entries and remove the cache file."""
+        self.close()
+        self._entries = {}
+        self._modified = False
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def save(self):
+        """Write the cache to disk if any entry has been added.
+
+        Nothing is written if the target directory is not writable.
+        """
+        if not self._modified:
+            return
+        wdir = os.path.dirname(os.path.abspath(self.filename))
+        if not os.access(wdir, os.W_OK):
+            return
+        data = {
+            "version": np.array(AMR_CACHE_VERSION),
+            "domain_ids": np.array(sorted(self._entries), dtype="int64"),
+        }
+        for domain_id in self._entries:
+            key, blocks, pos = self._read_entry(domain_id)
+            prefix = "domain_%05i" % domain_id
+            data[f"{prefix}_key"] = key
+            data[f"{prefix}_blocks"] = blocks
+            data[f"{prefix}_pos"] = pos
+        self.close()
+        # Write to a temporary file first, so that concurrent readers
+        # (e.g. other MPI tasks) never see a partially written cache.
+        tmp_fname = f"{self.filename}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_fname, "wb") as f:
+                np.savez(f, **data)
+            os.replace(tmp_fname, self.filename)
+        except OSError:
+            # Sometimes os mis-reports whether a directory is writable,
+            # So pass if writing the cache file fails.
+            if os.path.exists(tmp_fname):
+                os.remove(tmp_fname)
+            return
+        self._modified = False
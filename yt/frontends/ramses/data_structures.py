@@ -1,6 +1,7 @@
 import os
 import weakref
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from glob import glob
 
 import numpy as np
@@ -18,19 +19,31 @@ from yt.utilities.lib.cosmology_time import friedman
 from yt.utilities.on_demand_imports import _f90nml as f90nml
 from yt.utilities.physical_constants import kb, mp
 
+from .amr_cache import RAMSESAMRCache, amr_file_key
 from .definitions import field_aliases, particle_families, ramses_header
 from .field_handlers import get_field_handlers
 from .fields import _X, RAMSESFieldInfo
 from .hilbert import get_cpu_list
-from .io_utils import fill_hydro, read_amr
+from .io_utils import fill_hydro, read_amr_positions
 from .particle_handlers import get_particle_handlers
 
 
+def _read_domain_amr_positions(amr_fn, amr_offset, amr_header, ngridbound, min_level):
+    """Read the oct positions of a domain AMR file.
+
+    This only relies on picklable arguments so that domains can be
+    parsed in worker processes.
+    """
+    with fpu(amr_fn) as f:
+        f.seek(amr_offset)
+        return read_amr_positions(f, amr_header, ngridbound, min_level)
+
+
 class RAMSESDomainFile:
     _last_mask = None
     _last_selector_id = None
 
-    def __init__(self, ds, domain_id):
+    def __init__(self, ds, domain_id, read_amr=True):
         self.ds = ds
         self.domain_id = domain_id
 
@@ -74,8 +87,10 @@ class RAMSESDomainFile:
             ph.read_header()
             # self._add_ptype(ph.ptype)
 
-        # Load the AMR structure
-        self._read_amr()
+        # Load the AMR structure. When read_amr is False, the caller is
+        # responsible for calling _build_oct_handler.
+        if read_amr:
+            self._read_amr()
 
     _hydro_offset = None
     _level_count = None
@@ -145,13 +160,36 @@ class RAMSESDomainFile:
         ].sum()
         self.total_oct_count = hvals["numbl"][self.ds.min_level :, :].sum(axis=0)
 
+    @property
+    def amr_file_key(self):
+        # The nlevelmax of the header has been capped by the max_level of the
+        # dataset when it was read
+        return amr_file_key(
+            self.amr_fn, self.ds.min_level, self.amr_header["nlevelmax"]
+        )
+
+    def _read_amr_positions(self):
+        return _read_domain_amr_positions(
+            self.amr_fn,
+            self.amr_offset,
+            self.amr_header,
+            self.ngridbound,
+            self.ds.min_level,
+        )
+
     def _read_amr(self):
         """Open the oct file, read in octs level-by-level.
-           For each oct, only the position, index, level and domain
-           are needed - its position in the octree is found automatically.
-           The most important is finding all the information to feed
-           oct_handler.add
+        For each oct, only the position, index, level and domain
+        are needed - its position in the octree is found automatically.
+        The most important is finding all the information to feed
+        oct_handler.add
         """
+        blocks, pos = self._read_amr_positions()
+        self._build_oct_handler(blocks, pos)
+
+    def _build_oct_handler(self, blocks, pos):
+        """Build the oct handler from the oct positions, as returned by
+        ``read_amr_positions``."""
         self.oct_handler = RAMSESOctreeContainer(
             self.ds.domain_dimensions / 2,
             self.ds.domain_left_edge,
@@ -166,19 +204,22 @@ class RAMSESDomainFile:
             self.ngridbound.sum(),
         )
 
-        f = self.amr_file
-        f.seek(self.amr_offset)
-
-        min_level = self.ds.min_level
-        max_level = read_amr(
-            f, self.amr_header, self.ngridbound, min_level, self.oct_handler
-        )
+        max_level = 0
+        start = 0
+        for icpu, ilevel, ng in blocks:
+            # Note that we're adding *grids*, not individual cells.
+            n = self.oct_handler.add(
+                icpu + 1, ilevel, pos[start : start + ng], count_boundary=1
+            )
+            if n > 0:
+                max_level = max(ilevel, max_level)
+            start += ng
 
         self.max_level = max_level
         self.oct_handler.finalize()
 
         # Close AMR file
-        f.close()
+        self.amr_file.close()
 
     def included(self, selector):
         if getattr(selector, "domain_id", None) is not None:
@@ -225,6 +266,26 @@ class RAMSESDomainSubset(OctreeSubset):
                 "of ghost zones, was called with num_ghost_zones=%s" % num_ghost_zones
             )
 
+    _file_index_selector_id = None
+    _file_indices = None
+
+    def _file_index_octs(self, selector):
+        """Return the number of selected cells and their level, cell index
+        and file index.
+
+        The result is cached for the last selector, so that reading the
+        different fluid types of the subset only walks the octree once.
+        """
+        if hash(selector) == self._file_index_selector_id:
+            return self._file_indices
+        cell_count = selector.count_oct_cells(self.oct_handler, self.domain_id)
+        levels, cell_inds, file_inds = self.oct_handler.file_index_octs(
+            selector, self.domain_id, cell_count
+        )
+        self._file_indices = (cell_count, levels, cell_inds, file_inds)
+        self._file_index_selector_id = hash(selector)
+        return self._file_indices
+
     def _fill_no_ghostzones(self, fd, fields, selector, file_handler):
         ndim = self.ds.dimensionality
         # Here we get a copy of the file, which we skip through and read the
@@ -233,11 +294,7 @@ class RAMSESDomainSubset(OctreeSubset):
         all_fields = [f for ft, f in file_handler.field_list]
         fields = [f for ft, f in fields]
         data = {}
-        cell_count = selector.count_oct_cells(self.oct_handler, self.domain_id)
-
-        levels, cell_inds, file_inds = self.oct_handler.file_index_octs(
-            selector, self.domain_id, cell_count
-        )
+        cell_count, levels, cell_inds, file_inds = self._file_index_octs(selector)
 
         # Initializing data container
         for field in fields:
@@ -409,7 +466,10 @@ class RAMSESIndex(OctreeIndex):
         else:
             cpu_list = range(self.dataset["ncpu"])
 
-        self.domains = [RAMSESDomainFile(self.dataset, i + 1) for i in cpu_list]
+        self.domains = [
+            RAMSESDomainFile(self.dataset, i + 1, read_amr=False) for i in cpu_list
+        ]
+        self._read_domains_amr()
         total_octs = sum(
             dom.local_oct_count for dom in self.domains  # + dom.ngridbound.sum()
         )
@@ -421,6 +481,66 @@ class RAMSESIndex(OctreeIndex):
         )
         self.num_grids = total_octs
 
+    def _read_domains_amr(self):
+        """Build the oct handlers of all the domains.
+
+        Domains found in the AMR cache are rebuilt from it, the others are
+        parsed, in worker processes if ``amr_nproc`` > 1, and then added to
+        the cache.
+        """
+        ds = self.dataset
+        cache = None
+        if ds._amr_cache:
+            cache = RAMSESAMRCache(ds.parameter_filename + ".amr_cache.npz")
+
+        to_read = []
+        for dom in self.domains:
+            key = dom.amr_file_key
+            cached = cache.get(dom.domain_id, key) if cache is not None else None
+            if cached is None:
+                to_read.append((dom, key))
+            else:
+                dom._build_oct_handler(*cached)
+
+        if len(to_read) == 0:
+            if cache is not None:
+                cache.close()
+            return
+
+        mylog.debug(
+            "Reading AMR structure of %s domains (%s from cache)",
+            len(self.domains),
+            len(self.domains) - len(to_read),
+        )
+        nproc = min(ds._amr_nproc, len(to_read))
+        if nproc > 1:
+            executor = ProcessPoolExecutor(nproc)
+            all_positions = executor.map(
+                _read_domain_amr_positions,
+                [dom.amr_fn for dom, _ in to_read],
+                [dom.amr_offset for dom, _ in to_read],
+                [dom.amr_header for dom, _ in to_read],
+                [dom.ngridbound for dom, _ in to_read],
+                [ds.min_level] * len(to_read),
+                chunksize=max(1, len(to_read) // (4 * nproc)),
+            )
+        else:
+            executor = None
+            all_positions = (dom._read_amr_positions() for dom, _ in to_read)
+
+        try:
+            for (dom, key), (blocks, pos) in zip(to_read, all_positions):
+                dom._build_oct_handler(blocks, pos)
+                if cache is not None:
+                    cache.set(dom.domain_id, key, blocks, pos)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if cache is not None:
+            cache.save()
+            cache.close()
+
     def _detect_output_fields(self):
         dsl = set([])
 
@@ -570,6 +690,8 @@ class RAMSESDataset(Dataset):
         bbox=None,
         max_level=None,
         max_level_convention=None,
+        amr_cache=True,
+        amr_nproc=1,
     ):
         # Here we want to initiate a traceback, if the reader is not built.
         if isinstance(fields, str):
@@ -586,6 +708,13 @@ class RAMSESDataset(Dataset):
         cosmological:
         If set to None, automatically detect cosmological simulation.
         If a boolean, force its value.
+
+        amr_cache:
+        If True, cache the AMR structure in a file next to the info file
+        so that subsequent loads do not need to parse the AMR files.
+
+        amr_nproc:
+        The number of processes used to parse the AMR files.
         """
 
         self._fields_in_file = fields
@@ -594,6 +723,8 @@ class RAMSESDataset(Dataset):
         self._extra_particle_fields = extra_particle_fields
         self.force_cosmological = cosmological
         self._bbox = bbox
+        self._amr_cache = amr_cache
+        self._amr_nproc = amr_nproc
 
         self._force_max_level = self._sanitize_max_level(
             max_level, max_level_convention
@@ -702,6 +833,11 @@ class RAMSESDataset(Dataset):
     def __repr__(self):
         return self.basename.rsplit(".", 1)[0]
 
+    def close(self):
+        # Close the files kept open by the io handler between reads
+        if self._instantiated_index is not None:
+            self.index.io.close_files()
+
     def _set_code_unit_attributes(self):
         """
         Generates the conversion to various physical _units based on the parameter file
@@ -1,4 +1,5 @@
-from collections import defaultdict
+import weakref
+from collections import OrderedDict, defaultdict
 
 import numpy as np
 
@@ -8,6 +9,7 @@ from yt.utilities.exceptions import (
     YTFileNotParseable,
     YTParticleOutputFormatNotImplemented,
 )
+from yt.utilities.fortran_utils import MemmapFortranFile
 from yt.utilities.io_handler import BaseIOHandler
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.physical_ratios import cm_per_km, cm_per_mpc
@@ -60,7 +62,9 @@ def _ramses_particle_file_handler(fname, foffsets, data_types, subset, fields, c
     """
     tr = {}
     ds = subset.domain.ds
-    with FortranFile(fname) as fd:
+    # The records are read as views of the memory-mapped file, so that
+    # fields are neither copied nor read with one system call per record.
+    with MemmapFortranFile(fname) as fd:
         # We do *all* conversion into boxlen here.
         # This means that no other conversions need to be applied to convert
         # positions into the same domain as the octs themselves.
@@ -72,7 +76,8 @@ def _ramses_particle_file_handler(fname, foffsets, data_types, subset, fields, c
             dt = data_types[field]
             tr[field] = fd.read_vector(dt)
             if field[1].startswith("particle_position"):
-                np.divide(tr[field], ds["boxlen"], tr[field])
+                # Views are read-only, this creates the output array
+                tr[field] = np.divide(tr[field], ds["boxlen"])
             if ds.cosmological_simulation and field[1] == "particle_birth_time":
                 conformal_age = tr[field]
                 tr[field] = convert_ramses_ages(ds, conformal_age)
@@ -82,37 +87,75 @@ def _ramses_particle_file_handler(fname, foffsets, data_types, subset, fields, c
     return tr
 
 
+def _close_files(open_files):
+    # Close the files of a handler, which may already have been freed
+    for fd in open_files.values():
+        fd.close()
+    open_files.clear()
+
+
 class IOHandlerRAMSES(BaseIOHandler):
     _dataset_type = "ramses"
 
+    # Maximum number of fluid files kept open between reads
+    _max_open_files = 32
+
+    def __init__(self, *args, **kwargs):
+        super(IOHandlerRAMSES, self).__init__(*args, **kwargs)
+        self._open_files = OrderedDict()
+        # The files are closed once the handler is freed with its dataset,
+        # if they have not been closed before
+        weakref.finalize(self, _close_files, self._open_files)
+
+    def close_files(self):
+        """Close the fluid files kept open between reads.
+
+        They are opened again by the next reads.
+        """
+        _close_files(self._open_files)
+
+    def _get_fortran_file(self, fname):
+        """Return an open FortranFile, reusing previously opened ones.
+
+        The least recently used files are closed once more than
+        ``_max_open_files`` are open.
+        """
+        fd = self._open_files.pop(fname, None)
+        if fd is None:
+            fd = FortranFile(fname)
+            while len(self._open_files) >= self._max_open_files:
+                _, old_fd = self._open_files.popitem(last=False)
+                old_fd.close()
+        self._open_files[fname] = fd
+        return fd
+
     def _read_fluid_selection(self, chunks, selector, fields, size):
         tr = defaultdict(list)
 
-        # Set of field types
-        ftypes = set(f[0] for f in fields)
+        # Group fields by type to minimize i/o operations
+        fields_by_type = defaultdict(list)
+        for field in fields:
+            fields_by_type[field[0]].append(field)
+
         for chunk in chunks:
-            # Gather fields by type to minimize i/o operations
-            for ft in ftypes:
-                # Get all the fields of the same type
-                field_subs = list(filter(lambda f: f[0] == ft, fields))
-
-                # Loop over subsets
-                for subset in chunk.objs:
-                    fname = None
+            # Loop over subsets, reading all field types of a subset
+            # one after the other so that they share the same file
+            # indices (see RAMSESDomainSubset._file_index_octs)
+            for subset in chunk.objs:
+                for ft, field_subs in fields_by_type.items():
+                    file_handler = None
                     for fh in subset.domain.field_handlers:
                         if fh.ftype == ft:
                             file_handler = fh
-                            fname = fh.fname
                             break
 
-                    if fname is None:
+                    if file_handler is None:
                         raise YTFieldTypeNotFound(ft)
 
-                    # Now we read the entire thing
-                    with FortranFile(fname) as fd:
-                        # This contains the boundary information, so we skim through
-                        # and pick off the right vectors
-                        rv = subset.fill(fd, field_subs, selector, file_handler)
+                    # This contains the boundary information, so we skim through
+                    # and pick off the right vectors
+                    fd = self._get_fortran_file(file_handler.fname)
+                    rv = subset.fill(fd, field_subs, selector, file_handler)
                     for ft, f in field_subs:
                         d = rv.pop(f)
                         mylog.debug(
@@ -18,16 +18,31 @@ ctypedef np.float64_t DOUBLE_t
 @cython.wraparound(False)
 @cython.cdivision(True)
 @cython.nonecheck(False)
-def read_amr(FortranFile f, dict headers,
-             np.ndarray[np.int64_t, ndim=1] ngridbound, INT64_t min_level,
-             RAMSESOctreeContainer oct_handler):
-
-    cdef INT64_t ncpu, nboundary, max_level, nlevelmax, ncpu_and_bound
+def read_amr_positions(FortranFile f, dict headers,
+                       np.ndarray[np.int64_t, ndim=1] ngridbound, INT64_t min_level):
+    """Read the position of the octs of an AMR file.
+
+    The file is expected to be positioned at the beginning of the tree.
+    The octs are returned grouped in blocks of (cpu, level), so that they
+    can be fed to ``RAMSESOctreeContainer.add`` later on (possibly in a
+    different process).
+
+    Returns
+    -------
+    blocks : np.ndarray (nblock, 3)
+        The (icpu, ilevel - min_level, count) of each block, icpu being
+        0-indexed.
+    pos : np.ndarray (noct, 3)
+        The position of the octs, blocks being concatenated.
+    """
+
+    cdef INT64_t ncpu, nboundary, nlevelmax, ncpu_and_bound
     cdef DOUBLE_t nx, ny, nz
-    cdef INT64_t ilevel, icpu, n, ndim, skip_len
-    cdef INT32_t ng, buffer_size
+    cdef INT64_t ilevel, icpu, ndim, skip_len, noct, iblock
+    cdef INT32_t ng
     cdef np.ndarray[np.int32_t, ndim=2] numbl
     cdef np.ndarray[np.float64_t, ndim=2] pos
+    cdef np.ndarray[np.int64_t, ndim=2] blocks
 
     ndim = headers['ndim']
     numbl = headers['numbl']
@@ -38,8 +53,6 @@ def read_amr(FortranFile f, dict headers,
 
     ncpu_and_bound = nboundary + ncpu
 
-    pos = np.empty((0, 3), dtype=np.float64)
-    buffer_size = 0
     # Compute number of fields to skip. This should be 31 in 3 dimensions
     skip_len = (1          # father index
                 + 2*ndim   # neighbor index
@@ -47,8 +60,25 @@ def read_amr(FortranFile f, dict headers,
                 + 2**ndim  # cpu map
                 + 2**ndim  # refinement map
     )
-    # Initialize values
-    max_level = 0
+
+    # Count the octs and blocks we will keep, so that we only allocate once
+    noct = 0
+    iblock = 0
+    for ilevel in range(min_level, nlevelmax):
+        for icpu in range(ncpu_and_bound):
+            if icpu < ncpu:
+                ng = numbl[ilevel, icpu]
+            else:
+                ng = ngridbound[icpu - ncpu + nboundary*ilevel]
+            if ng > 0:
+                noct += ng
+                iblock += 1
+
+    pos = np.empty((noct, 3), dtype="d")
+    blocks = np.empty((iblock, 3), dtype=np.int64)
+
+    noct = 0
+    iblock = 0
     for ilevel in range(nlevelmax):
         for icpu in range(ncpu_and_bound):
             if icpu < ncpu:
@@ -62,25 +92,25 @@ def read_amr(FortranFile f, dict headers,
             # to build the linked list in RAMSES)
             f.skip(3)
 
-            # Allocate more memory if required
-            if ng > buffer_size:
-                pos = np.empty((ng, 3), dtype="d")
-                buffer_size = ng
+            if ilevel < min_level:
+                # Skip positions, father, neighbor, son, cpu map and refinement map
+                f.skip(3 + skip_len)
+                continue
 
-            pos[:ng, 0] = f.read_vector("d") - nx
-            pos[:ng, 1] = f.read_vector("d") - ny
-            pos[:ng, 2] = f.read_vector("d") - nz
+            pos[noct:noct+ng, 0] = f.read_vector("d") - nx
+            pos[noct:noct+ng, 1] = f.read_vector("d") - ny
+            pos[noct:noct+ng, 2] = f.read_vector("d") - nz
 
             # Skip father, neighbor, son, cpu map and refinement map
             f.skip(skip_len)
-            # Note that we're adding *grids*, not individual cells.
-            if ilevel >= min_level:
-                n = oct_handler.add(icpu + 1, ilevel - min_level, pos[:ng, :],
-                                    count_boundary = 1)
-                if n > 0:
-                    max_level = max(ilevel - min_level, max_level)
 
-    return max_level
+            blocks[iblock, 0] = icpu
+            blocks[iblock, 1] = ilevel - min_level
+            blocks[iblock, 2] = ng
+            noct += ng
+            iblock += 1
+
+    return blocks, pos
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -153,6 +183,7 @@ def fill_hydro(FortranFile f,
     cdef INT64_t twotondim
     cdef int ilevel, icpu, ifield, nfields, nlevels, nc, ncpu_selected
     cdef np.ndarray[np.uint8_t, ndim=1] mask
+    cdef np.ndarray[np.uint8_t, ndim=2] to_read
 
     twotondim = 2**ndim
     nfields = len(all_fields)
@@ -162,10 +193,21 @@ def fill_hydro(FortranFile f,
 
     mask = np.array([(field in fields) for field in all_fields], dtype=np.uint8)
 
+    # Only read the (cpu, level) blocks that contain at least one selected
+    # cell, the others would not be used anyway.
+    to_read = np.zeros((ncpu, nlevels), dtype=np.uint8)
+    selected = levels < nlevels
+    if ncpu_selected > 1:
+        to_read[domains[selected] - 1, levels[selected]] = 1
+    else:
+        to_read[:, levels[selected]] = 1
+
     # Loop over levels
     for ilevel in range(nlevels):
         # Loop over cpu domains
         for icpu in cpu_enumerator:
+            if not to_read[icpu, ilevel]:
+                continue
             nc = level_count[icpu, ilevel]
             if nc == 0:
                 continue
@@ -174,10 +216,13 @@ def fill_hydro(FortranFile f,
                 continue
             f.seek(offset)
             tmp = {}
-            # Initalize temporary data container for io
+            # Initalize temporary data container for io, only for the
+            # fields we actually read.
             # note: we use Fortran ordering to reflect the in-file ordering
-            for field in all_fields:
-                tmp[field] = np.empty((nc, twotondim), dtype="float64", order='F')
+            for ifield in range(nfields):
+                if mask[ifield]:
+                    tmp[all_fields[ifield]] = np.empty(
+                        (nc, twotondim), dtype="float64", order='F')
 
             for i in range(twotondim):
                 # Read the selected fields
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from yt.frontends.ramses.amr_cache import RAMSESAMRCache, amr_file_key
+from yt.testing import assert_equal
+
+
+def test_amr_cache_roundtrip():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        amr_fn = os.path.join(tmpdir, "amr_00001.out00001")
+        with open(amr_fn, "wb") as f:
+            f.write(b"\0" * 16)
+        key = amr_file_key(amr_fn, 6, 12)
+        blocks = np.array([[0, 0, 2], [1, 1, 1]], dtype="int64")
+        pos = np.random.random((3, 3))
+
+        fname = os.path.join(tmpdir, "info_00001.txt.amr_cache.npz")
+        cache = RAMSESAMRCache(fname)
+        assert cache.get(1, key) is None
+        cache.set(1, key, blocks, pos)
+        cache.save()
+        assert os.path.exists(fname)
+
+        cache = RAMSESAMRCache(fname)
+        cached_blocks, cached_pos = cache.get(1, key)
+        assert_equal(cached_blocks, blocks)
+        assert_equal(cached_pos, pos)
+        # Missing domain
+        assert cache.get(2, key) is None
+        # Reading fewer levels invalidates the entry
+        assert cache.get(1, amr_file_key(amr_fn, 6, 10)) is None
+
+        # Modifying the AMR file invalidates the entry
+        with open(amr_fn, "ab") as f:
+            f.write(b"\0" * 8)
+        assert cache.get(1, amr_file_key(amr_fn, 6, 12)) is None
+
+        cache.invalidate()
+        assert not os.path.exists(fname)
+    finally:
+        shutil.rmtree(tmpdir)
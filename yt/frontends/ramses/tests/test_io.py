@@ -0,0 +1,38 @@
+import gc
+import os
+import shutil
+import tempfile
+
+from yt.frontends.ramses.io import IOHandlerRAMSES
+from yt.testing import assert_equal, assert_raises
+
+
+def test_open_files():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        fnames = [os.path.join(tmpdir, f"hydro_00001.out{i:05}") for i in range(4)]
+        for fname in fnames:
+            with open(fname, "wb") as f:
+                f.write(b"\0" * 8)
+
+        io = IOHandlerRAMSES(None)
+        io._max_open_files = 2
+        fds = [io._get_fortran_file(fname) for fname in fnames]
+        # Only the most recently used files are kept open
+        assert_equal(list(io._open_files), fnames[2:])
+        assert_raises(ValueError, fds[0].tell)
+        assert io._get_fortran_file(fnames[3]) is fds[3]
+
+        io.close_files()
+        assert_equal(len(io._open_files), 0)
+        assert_raises(ValueError, fds[3].tell)
+        # The files are opened again when needed
+        fd = io._get_fortran_file(fnames[3])
+        assert_equal(fd.tell(), 0)
+
+        # and closed once the handler is freed
+        del io
+        gc.collect()
+        assert_raises(ValueError, fd.tell)
+    finally:
+        shutil.rmtree(tmpdir)
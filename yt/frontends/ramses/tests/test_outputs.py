@@ -610,6 +610,17 @@ def test_max_level():
         assert any(ds.r["index", "grid_level"] == 2)
 
 
+@requires_file(output_00080)
+def test_amr_cache_max_level():
+    # Datasets loaded with a lower max_level do not share the cached AMR
+    # structure of the full dataset
+    keys = []
+    for kwargs in ({}, dict(max_level=2, max_level_convention="yt")):
+        ds = yt.load(output_00080, amr_cache=False, **kwargs)
+        keys.append(ds.index.domains[0].amr_file_key)
+    assert not np.array_equal(keys[0], keys[1])
+
+
 @requires_file(ramses_new_format)
 def test_invalid_max_level():
     invalid_value_args = (
@@ -22,7 +22,7 @@ class IOHandlerSDF(BaseIOHandler):
         chunks = list(chunks)
         data_files = set([])
         assert len(ptf) == 1
-        assert ptf.keys()[0] == "dark_matter"
+        assert list(ptf.keys())[0] == "dark_matter"
         for chunk in chunks:
             for obj in chunk.objs:
                 data_files.update(obj.data_files)
@@ -38,7 +38,7 @@ class IOHandlerSDF(BaseIOHandler):
         chunks = list(chunks)
         data_files = set([])
         assert len(ptf) == 1
-        assert ptf.keys()[0] == "dark_matter"
+        assert list(ptf.keys())[0] == "dark_matter"
         for chunk in chunks:
             for obj in chunk.objs:
                 data_files.update(obj.data_files)
@@ -106,7 +106,7 @@ class IOHandlerHTTPSDF(IOHandlerSDF):
         chunks = list(chunks)
         data_files = set([])
         assert len(ptf) == 1
-        assert ptf.keys()[0] == "dark_matter"
+        assert list(ptf.keys())[0] == "dark_matter"
         for chunk in chunks:
             for obj in chunk.objs:
                 data_files.update(obj.data_files)
@@ -123,7 +123,7 @@ class IOHandlerHTTPSDF(IOHandlerSDF):
         chunks = list(chunks)
         data_files = set([])
         assert len(ptf) == 1
-        assert ptf.keys()[0] == "dark_matter"
+        assert list(ptf.keys())[0] == "dark_matter"
         for chunk in chunks:
             for obj in chunk.objs:
                 data_files.update(obj.data_files)
@@ -154,7 +154,7 @@ class IOHandlerHTTPSDF(IOHandlerSDF):
                     yield (ptype, field), data
 
     def _count_particles(self, data_file):
-        return {"dark_matter": self._handle["x"].http_array.shape}
+        return {"dark_matter": self._handle["x"].size}
 
 
 class IOHandlerSIndexSDF(IOHandlerSDF):
@@ -3,8 +3,13 @@ import os
 import numpy as np
 
 from yt.data_objects.static_output import ParticleDataset
-from yt.funcs import mylog
+from yt.funcs import ensure_numpy_array, iter_fields, mylog
+from yt.geometry.coordinates.cartesian_coordinates import all_data
 from yt.geometry.particle_geometry_handler import ParticleIndex
+from yt.utilities.lib.geometry_utils import get_morton_indices
+from yt.utilities.lib.pixelization_routines import (
+    interpolate_sph_positions_gather_multi,
+)
 
 
 class SPHDataset(ParticleDataset):
@@ -116,12 +121,78 @@ class SPHParticleIndex(ParticleIndex):
             left_edge=self.ds.domain_left_edge,
             right_edge=self.ds.domain_right_edge,
             periodic=np.array(self.ds.periodicity),
-            leafsize=2 * int(self.ds.num_neighbors),
+            leafsize=2 * int(getattr(self.ds, "num_neighbors", 32)),
             data_version=self.ds._file_hash,
         )
         if fname is not None:
             self._kdtree.save(fname)
 
+    def _find_field_values_at_points(self, fields, coords):
+        r"""Find the value of fields at a set of coordinates.
+
+        Returns the values [field1, field2,...] of the fields at the given
+        (x, y, z) points. SPH fields are interpolated from the nearest
+        neighbours of the points, as with the "gather" smoothing style. The
+        particle data are read once for all the fields, the neighbours of a
+        point are searched for once for all the fields, and the points are
+        sorted by Morton key so that consecutive searches visit nearby nodes
+        of the kd-tree. Other fields are found one point at a time.
+        """
+        coords = self.ds.arr(ensure_numpy_array(coords), "code_length")
+        coords = np.ascontiguousarray(coords.reshape((-1, 3)).d, dtype="float64")
+        fields = list(iter_fields(fields))
+        finfos = [self.ds._get_field_info(field) for field in fields]
+        sph_finfos = [finfo for finfo in finfos if finfo.is_sph_field]
+        sph_fields = [f for f, finfo in zip(fields, finfos) if finfo.is_sph_field]
+        other_fields = [f for f in fields if f not in sph_fields]
+
+        out = {}
+        if len(other_fields) > 0:
+            other = self.ds._find_field_values_at_each_point(other_fields, coords)
+            out.update(zip(other_fields, other))
+        if len(sph_fields) > 0:
+            ptype = self.ds._sph_ptypes[0]
+            units = [finfo.units for finfo in sph_finfos]
+            names = [finfo.name[1] for finfo in sph_finfos]
+            pdata = all_data(
+                self.ds,
+                ptype,
+                ["particle_position", "density", "particle_mass", "smoothing_length"]
+                + names,
+                kdtree=True,
+            )
+            quantities = np.stack(
+                [pdata[name].in_units(u).d for name, u in zip(names, units)], axis=1
+            )
+            DLE = self.ds.domain_left_edge.to("code_length").d
+            DRE = self.ds.domain_right_edge.to("code_length").d
+            ipos = (coords - DLE) / (DRE - DLE) * 2 ** 20
+            ipos = np.clip(ipos, 0, 2 ** 20 - 1).astype("uint64")
+            order = np.argsort(get_morton_indices(ipos))
+            buff = np.zeros((coords.shape[0], len(sph_fields)), dtype="float64")
+            interpolate_sph_positions_gather_multi(
+                buff,
+                np.ascontiguousarray(pdata["particle_position"].d),
+                coords[order],
+                pdata["smoothing_length"].d,
+                pdata["particle_mass"].d,
+                pdata["density"].d,
+                quantities,
+                self.kdtree,
+                use_normalization=int(getattr(self.ds, "use_sph_normalization", True)),
+                kernel_name=getattr(self.ds, "kernel_name", "cubic"),
+                num_neigh=getattr(self.ds, "num_neighbors", 32),
+            )
+            values = np.empty_like(buff)
+            values[order] = buff
+            for i, (field, u) in enumerate(zip(sph_fields, units)):
+                out[field] = self.ds.arr(values[:, i], u)
+
+        ret = [out[field] for field in fields]
+        if len(fields) == 1:
+            return ret[0]
+        return ret
+
     @property
     def kdtree(self):
         if hasattr(self, "_kdtree"):
@@ -5,6 +5,7 @@ Generic file-handing functions for SPH data
 
 
 """
+from yt.frontends.sph.smoothing_length import SmoothingLengthGenerator
 from yt.utilities.io_handler import BaseIOHandler
 
 
@@ -31,3 +32,26 @@ class IOHandlerSPH(BaseIOHandler):
             for ptype, (x, y, z), hsml in self._read_particle_coords(chunks, ptf):
                 psize[ptype] += selector.count_points(x, y, z, hsml)
         return dict(psize)
+
+    def _smoothing_length_generator(self, index, scratch_prefix):
+        """Return a SmoothingLengthGenerator for the SPH particles of the
+        dataset, or None if there are no such particles."""
+        ptype = self.ds._sph_ptypes[0]
+        npart = sum(data_file.total_particles[ptype] for data_file in index.data_files)
+        if npart == 0:
+            return None
+
+        def read_positions():
+            for data_file in index.data_files:
+                for _, ppos in self._yield_coordinates(data_file, needed_ptype=ptype):
+                    yield ppos
+
+        return SmoothingLengthGenerator(
+            read_positions,
+            npart,
+            self.ds.domain_left_edge.to("code_length").d,
+            self.ds.domain_right_edge.to("code_length").d,
+            self.ds._num_neighbors,
+            scratch_prefix,
+            key=self.ds._file_hash,
+        )
@@ -0,0 +1,295 @@
+"""
+Out-of-core generation of SPH smoothing lengths
+
+
+
+
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import product
+
+import numpy as np
+
+from yt.funcs import get_num_threads, get_pbar
+from yt.utilities.lib.cykdtree import PyKDTree
+from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
+
+# The maximum number of particles in a block, which bounds the memory used
+# by each thread
+MAX_BLOCK_PARTICLES = 2 ** 22
+# The number of particles read or sorted at once
+CHUNK_SIZE = 2 ** 22
+
+
+class SmoothingLengthGenerator:
+    """Compute the smoothing lengths of a large set of particles.
+
+    The particles are bucketed into a regular grid of spatial blocks, which
+    are processed independently (and concurrently) by building a kd-tree of
+    the particles of a block and of the particles of the neighbouring blocks
+    close enough to it (the halo). The halo is grown until every smoothing
+    length of the block is contained in it, so the result is the same as
+    with a single tree of all the particles. As with such a tree, periodic
+    images of the particles are not searched for neighbours.
+
+    The positions, the particles sorted by block and the smoothing lengths
+    are stored in scratch files (named after scratch_prefix) rather than in
+    memory, and the blocks already processed are recorded, so that an
+    interrupted run resumes where it stopped.
+
+    Parameters
+    ----------
+    read_positions : callable
+        A function returning an iterator over the (N, 3) positions of the
+        particles, in code units.
+    npart : int
+        The total number of particles.
+    left_edge, right_edge : array_like
+        The edges of the domain.
+    n_neighbors : int
+        The number of neighbours used to define the smoothing length.
+    scratch_prefix : str
+        The prefix of the scratch files.
+    key : int, optional
+        An identifier of the particle data (e.g. the dataset file hash),
+        used to decide whether existing scratch files can be reused.
+    nblocks : int, optional
+        The number of blocks per dimension. By default, this is set so that
+        blocks hold about MAX_BLOCK_PARTICLES particles on average.
+    nprocs : int, optional
+        The number of threads processing blocks. By default, this is set by
+        the ``numthreads`` configuration option, or the number of CPUs.
+    """
+
+    def __init__(
+        self,
+        read_positions,
+        npart,
+        left_edge,
+        right_edge,
+        n_neighbors,
+        scratch_prefix,
+        key=0,
+        nblocks=None,
+        nprocs=None,
+    ):
+        self.read_positions = read_positions
+        self.npart = int(npart)
+        self.left_edge = np.array(left_edge, dtype="float64")
+        self.right_edge = np.array(right_edge, dtype="float64")
+        self.n_neighbors = int(n_neighbors)
+        self.scratch_prefix = scratch_prefix
+        self.key = int(key)
+        if nblocks is None:
+            nblocks = int(np.ceil((self.npart / MAX_BLOCK_PARTICLES) ** (1.0 / 3)))
+        self.nblocks = max(nblocks, 1)
+        if nprocs is None:
+            nprocs = int(get_num_threads()) or os.cpu_count() or 1
+        self.nprocs = max(nprocs, 1)
+        self.block_width = (self.right_edge - self.left_edge) / self.nblocks
+
+    def _scratch(self, name):
+        return f"{self.scratch_prefix}.{name}"
+
+    def _open(self, name, shape, dtype, mode):
+        return np.lib.format.open_memmap(
+            self._scratch(name + ".npy"), mode=mode, dtype=dtype, shape=shape
+        )
+
+    @property
+    def _meta(self):
+        return {
+            "key": self.key,
+            "npart": self.npart,
+            "nblocks": self.nblocks,
+            "n_neighbors": self.n_neighbors,
+        }
+
+    def _load_state(self):
+        try:
+            with open(self._scratch("json")) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("meta") != self._meta:
+            return None
+        return state["stage"]
+
+    def _save_state(self, stage):
+        with open(self._scratch("json"), "w") as f:
+            json.dump({"meta": self._meta, "stage": stage}, f)
+
+    def cleanup(self):
+        """Remove the scratch files."""
+        for name in ("json", "pos.npy", "sorted.npy", "order.npy", "hsml.npy"):
+            fn = self._scratch(name)
+            if os.path.exists(fn):
+                os.remove(fn)
+        fn = self._scratch("offsets.npz")
+        if os.path.exists(fn):
+            os.remove(fn)
+
+    def _block_ids(self, pos):
+        ind = ((pos - self.left_edge) / self.block_width).astype("int64")
+        np.clip(ind, 0, self.nblocks - 1, out=ind)
+        return (ind[:, 0] * self.nblocks + ind[:, 1]) * self.nblocks + ind[:, 2]
+
+    def _gather(self):
+        # Stage 1: copy the positions to a scratch file
+        pos = self._open("pos", (self.npart, 3), "float64", "w+")
+        ind = 0
+        for ppos in self.read_positions():
+            pos[ind : ind + ppos.shape[0]] = ppos
+            ind += ppos.shape[0]
+        if ind != self.npart:
+            raise RuntimeError(f"Expected {self.npart} particles, read {ind}")
+        pos.flush()
+
+    def _sort(self):
+        # Stage 2: sort the particles by block (a counting sort, done in
+        # chunks to bound the memory usage)
+        pos = self._open("pos", None, None, "r")
+        nb3 = self.nblocks ** 3
+        counts = np.zeros(nb3, dtype="int64")
+        for i in range(0, self.npart, CHUNK_SIZE):
+            ids = self._block_ids(pos[i : i + CHUNK_SIZE])
+            counts += np.bincount(ids, minlength=nb3)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        spos = self._open("sorted", (self.npart, 3), "float64", "w+")
+        order = self._open("order", (self.npart,), "int64", "w+")
+        cursor = offsets[:-1].copy()
+        for i in range(0, self.npart, CHUNK_SIZE):
+            cpos = pos[i : i + CHUNK_SIZE]
+            ids = self._block_ids(cpos)
+            perm = np.argsort(ids, kind="stable")
+            ids = ids[perm]
+            ccounts = np.bincount(ids, minlength=nb3)
+            cstarts = np.concatenate([[0], np.cumsum(ccounts)[:-1]])
+            dest = cursor[ids] + np.arange(ids.size) - cstarts[ids]
+            spos[dest] = cpos[perm]
+            order[dest] = i + perm
+            cursor += ccounts
+        spos.flush()
+        order.flush()
+        np.savez(
+            self._scratch("offsets.npz"), offsets=offsets, done=np.zeros(nb3, "bool")
+        )
+
+    def _halo(self, spos, offsets, bi, lo, hi):
+        # Gather the particles of the neighbouring blocks within [lo, hi]
+        ranges = []
+        for ax in range(3):
+            i0 = np.floor((lo[ax] - self.left_edge[ax]) / self.block_width[ax])
+            i1 = np.floor((hi[ax] - self.left_edge[ax]) / self.block_width[ax])
+            i0 = int(np.clip(i0, 0, self.nblocks - 1))
+            i1 = int(np.clip(i1, 0, self.nblocks - 1))
+            ranges.append(range(i0, i1 + 1))
+        halo = []
+        for i, j, k in product(*ranges):
+            nbi = (i * self.nblocks + j) * self.nblocks + k
+            if nbi == bi:
+                continue
+            p = spos[offsets[nbi] : offsets[nbi + 1]]
+            halo.append(p[np.all((p >= lo) & (p <= hi), axis=1)])
+        if len(halo) == 0:
+            return np.empty((0, 3), dtype="float64")
+        return np.concatenate(halo)
+
+    def _process_block(self, bi, spos, order, offsets, hsml):
+        own = np.array(spos[offsets[bi] : offsets[bi + 1]])
+        if own.shape[0] == 0:
+            return
+        ind = np.array(np.unravel_index(bi, (self.nblocks,) * 3))
+        # The faces of the block on the domain boundary are pushed to
+        # infinity, so that particles outside of the domain are accounted for
+        lo = self.left_edge + ind * self.block_width
+        lo[ind == 0] = -np.inf
+        hi = self.left_edge + (ind + 1) * self.block_width
+        hi[ind == self.nblocks - 1] = np.inf
+        # Start from twice the mean distance to the n-th neighbour, and stop
+        # once the halo is the whole domain
+        width = self.right_edge - self.left_edge
+        density = self.npart / np.prod(width)
+        h = 2 * (3 * self.n_neighbors / (4 * np.pi * density)) ** (1.0 / 3)
+        h_max = width.max()
+        while True:
+            h = min(h, h_max)
+            pts = np.concatenate([own, self._halo(spos, offsets, bi, lo - h, hi + h)])
+            if pts.shape[0] > self.n_neighbors or h >= h_max:
+                own_hsml = self._smoothing_length(pts)[: own.shape[0]]
+                # A smoothing length is exact if its sphere is contained in
+                # the block and its halo
+                dist = np.minimum(own - (lo - h), (hi + h) - own).min(axis=1)
+                if h >= h_max or np.all(own_hsml <= dist):
+                    break
+            h *= 2
+        hsml[order[offsets[bi] : offsets[bi + 1]]] = own_hsml
+
+    def _smoothing_length(self, pts):
+        # The tree must strictly contain the particles
+        ple, pre = pts.min(axis=0), pts.max(axis=0)
+        pad = 1e-3 * (pre - ple) + 1e-10 * self.block_width
+        kdtree = PyKDTree(
+            pts,
+            left_edge=ple - pad,
+            right_edge=pre + pad,
+            periodic=False,
+            leafsize=2 * self.n_neighbors,
+        )
+        # The progress is reported per block by _compute
+        tree_hsml = generate_smoothing_length(
+            pts[kdtree.idx], kdtree, self.n_neighbors, pbar=None
+        )
+        pts_hsml = np.empty(pts.shape[0])
+        pts_hsml[kdtree.idx.astype("int64")] = tree_hsml
+        return pts_hsml
+
+    def _compute(self):
+        # Stage 3: compute the smoothing lengths block by block
+        spos = self._open("sorted", None, None, "r")
+        order = self._open("order", None, None, "r")
+        hsml_fn = self._scratch("hsml.npy")
+        if os.path.exists(hsml_fn):
+            hsml = self._open("hsml", None, None, "r+")
+        else:
+            hsml = self._open("hsml", (self.npart,), "float64", "w+")
+        with np.load(self._scratch("offsets.npz")) as data:
+            offsets = data["offsets"]
+            done = data["done"].copy()
+        todo = np.flatnonzero(~done)
+        pb = get_pbar("Generating smoothing lengths", todo.size)
+        with ThreadPoolExecutor(max_workers=self.nprocs) as executor:
+            futures = {
+                executor.submit(self._process_block, bi, spos, order, offsets, hsml): bi
+                for bi in todo
+            }
+            for i, future in enumerate(as_completed(futures)):
+                future.result()
+                bi = futures[future]
+                done[bi] = True
+                pb.update(i)
+                # Record the progress, so that an interrupted run resumes
+                # from here
+                hsml.flush()
+                np.savez(self._scratch("offsets.npz"), offsets=offsets, done=done)
+        pb.finish()
+        hsml.flush()
+
+    def generate(self):
+        """Compute the smoothing lengths, returning them as an array (backed
+        by a scratch file) in the order the positions were read."""
+        stage = self._load_state()
+        if stage is None:
+            self._gather()
+            self._save_state("sort")
+            stage = "sort"
+        if stage == "sort":
+            self._sort()
+            self._save_state("compute")
+            stage = "compute"
+        if stage == "compute":
+            self._compute()
+            self._save_state("done")
+        return self._open("hsml", None, None, "r")
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from yt.frontends.sph.smoothing_length import SmoothingLengthGenerator
+from yt.testing import assert_array_almost_equal
+
+
+def _brute_force_smoothing_length(pos, n_neighbors):
+    hsml = np.empty(pos.shape[0])
+    for i in range(0, pos.shape[0], 500):
+        r2 = ((pos[i : i + 500, None, :] - pos[None, :, :]) ** 2).sum(axis=-1)
+        # The particle itself is its first neighbour
+        hsml[i : i + 500] = np.sqrt(np.partition(r2, n_neighbors, axis=1))[
+            :, n_neighbors
+        ]
+    return hsml
+
+
+def test_smoothing_length_generator():
+    np.random.seed(0x4D3D3D3)
+    pos = np.random.random((3000, 3))
+    # Cluster some particles and place others outside of the domain, so that
+    # some blocks need a larger halo
+    pos[:500] = 0.5 + 0.01 * np.random.normal(size=(500, 3))
+    pos[500:600] = 1.0 + 0.5 * np.random.random((100, 3))
+    tmpdir = tempfile.mkdtemp()
+    try:
+        answer = _brute_force_smoothing_length(pos, 32)
+        for nblocks, nprocs in [(1, 1), (4, 1), (4, 3)]:
+            gen = SmoothingLengthGenerator(
+                lambda: (pos[i : i + 1000] for i in range(0, pos.shape[0], 1000)),
+                pos.shape[0],
+                np.zeros(3),
+                np.ones(3),
+                32,
+                os.path.join(tmpdir, "hsml"),
+                nblocks=nblocks,
+                nprocs=nprocs,
+            )
+            assert_array_almost_equal(gen.generate(), answer)
+            gen.cleanup()
+            assert os.listdir(tmpdir) == []
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_smoothing_length_generator_resume():
+    np.random.seed(0x4D3D3D3)
+    pos = np.random.random((2000, 3))
+    answer = _brute_force_smoothing_length(pos, 16)
+    tmpdir = tempfile.mkdtemp()
+
+    def read_positions():
+        read_positions.calls += 1
+        yield pos
+
+    read_positions.calls = 0
+    try:
+        gen = SmoothingLengthGenerator(
+            read_positions,
+            pos.shape[0],
+            np.zeros(3),
+            np.ones(3),
+            16,
+            os.path.join(tmpdir, "hsml"),
+            key=42,
+            nblocks=2,
+        )
+        gen.generate()
+        # A finished run is reused without reading the positions again
+        assert_array_almost_equal(gen.generate(), answer)
+        assert read_positions.calls == 1
+        # Forget about some blocks, as if the run had been interrupted
+        fn = os.path.join(tmpdir, "hsml.offsets.npz")
+        with np.load(fn) as data:
+            offsets, done = data["offsets"], data["done"]
+        done[::2] = False
+        np.savez(fn, offsets=offsets, done=done)
+        gen._save_state("compute")
+        assert_array_almost_equal(gen.generate(), answer)
+        assert read_positions.calls == 1
+        # A different key invalidates the scratch files
+        gen.key = 43
+        assert_array_almost_equal(gen.generate(), answer)
+        assert read_positions.calls == 2
+        gen.cleanup()
+    finally:
+        shutil.rmtree(tmpdir)
@@ -53,8 +53,6 @@ class StreamGrid(AMRGridPatch):
         """
         # All of the field parameters will be passed to us as needed.
         AMRGridPatch.__init__(self, id, filename=None, index=index)
-        self._children_ids = []
-        self._parent_id = -1
         self.Level = -1
 
     def set_filename(self, filename):
@@ -65,13 +63,11 @@ class StreamGrid(AMRGridPatch):
 
     @property
     def Parent(self):
-        if self._parent_id == -1:
-            return None
-        return self.index.grids[self._parent_id - self._id_offset]
+        return self.index._get_grid_parent(self.id - self._id_offset)
 
     @property
     def Children(self):
-        return [self.index.grids[cid - self._id_offset] for cid in self._children_ids]
+        return self.index._get_grid_children(self.id - self._id_offset)
 
 
 class StreamHandler:
@@ -144,40 +140,18 @@ class StreamHierarchy(GridIndex):
         self.grid_procs = self.stream_handler.processor_ids
         self.grid_particle_count[:] = self.stream_handler.particle_count
         mylog.debug("Copying reverse tree")
-        self.grids = []
-        # We enumerate, so it's 0-indexed id and 1-indexed pid
-        for id in range(self.num_grids):
-            self.grids.append(self.grid(id, self))
-            self.grids[id].Level = self.grid_levels[id, 0]
         parent_ids = self.stream_handler.parent_ids
-        if parent_ids is not None:
-            reverse_tree = self.stream_handler.parent_ids.tolist()
-            # Initial setup:
-            for gid, pid in enumerate(reverse_tree):
-                if pid >= 0:
-                    self.grids[gid]._parent_id = pid
-                    self.grids[pid]._children_ids.append(self.grids[gid].id)
-        else:
+        if parent_ids is None:
             mylog.debug("Reconstructing parent-child relationships")
-            self._reconstruct_parent_child()
+            parent_ids = self._reconstruct_parent_child()
+        self._set_grid_parents(parent_ids)
         self.max_level = self.grid_levels.max()
-        mylog.debug("Preparing grids")
-        temp_grids = np.empty(self.num_grids, dtype="object")
-        for i, grid in enumerate(self.grids):
-            if (i % 1e4) == 0:
-                mylog.debug("Prepared % 7i / % 7i grids", i, self.num_grids)
-            grid.filename = None
-            grid._prepare_grid()
-            grid._setup_dx()
-            grid.proc_num = self.grid_procs[i]
-            temp_grids[i] = grid
-        self.grids = temp_grids
-        mylog.debug("Prepared")
 
     def _reconstruct_parent_child(self):
-        mask = np.empty(len(self.grids), dtype="int32")
-        mylog.debug("First pass; identifying child grids")
-        for i, grid in enumerate(self.grids):
+        mask = np.empty(self.num_grids, dtype="int32")
+        parent_ids = np.zeros(self.num_grids, "int64") - 1
+        mylog.debug("Identifying child grids")
+        for i in range(self.num_grids):
             get_box_grids_level(
                 self.grid_left_edge[i, :],
                 self.grid_right_edge[i, :],
@@ -187,17 +161,14 @@ class StreamHierarchy(GridIndex):
                 self.grid_levels,
                 mask,
             )
-            ids = np.where(mask.astype("bool"))
-            grid._children_ids = ids[0]  # where is a tuple
-        mylog.debug("Second pass; identifying parents")
-        self.stream_handler.parent_ids = (
-            np.zeros(self.stream_handler.num_grids, "int64") - 1
-        )
-        for i, grid in enumerate(self.grids):  # Second pass
-            for child in grid.Children:
-                child._parent_id = i
-                # _id_offset = 0
-                self.stream_handler.parent_ids[child.id] = i
+            parent_ids[mask.astype("bool")] = i
+        self.stream_handler.parent_ids = parent_ids
+        return parent_ids
+
+    def _create_grid(self, i):
+        grid = super(StreamHierarchy, self)._create_grid(i)
+        grid.proc_num = self.grid_procs[i]
+        return grid
 
     def _initialize_grid_arrays(self):
         GridIndex._initialize_grid_arrays(self)
@@ -212,8 +183,8 @@ class StreamHierarchy(GridIndex):
         self.field_list = list(fl)
 
     def _populate_grid_objects(self):
-        for g in self.grids:
-            g._setup_dx()
+        mylog.debug("Preparing grids")
+        self._setup_grid_objects()
         self.max_level = self.grid_levels.max()
 
     def _setup_data_io(self):
@@ -224,31 +195,60 @@ class StreamHierarchy(GridIndex):
 
     def _reset_particle_count(self):
         self.grid_particle_count[:] = self.stream_handler.particle_count
-        for i, grid in enumerate(self.grids):
-            grid.NumberOfParticles = self.grid_particle_count[i, 0]
+        for grid in self.grids.created:
+            grid.NumberOfParticles = self.grid_particle_count[grid.id, 0]
 
-    def update_data(self, data):
+    def update_data(self, data, copy=True):
         """
-        Update the stream data with a new data dict. If fields already exist,
-        they will be replaced, but if they do not, they will be added. Fields
-        already in the stream but not part of the data dict will be left
-        alone.
+        Update the stream data with new data dicts, given either as a list
+        with one dict per grid or as a dict mapping the indices of the grids
+        to update to their dicts. If fields already exist, they will be
+        replaced, but if they do not, they will be added. Fields already in
+        the stream but not part of the data dicts will be left alone.
+
+        Only the grids in data are updated, and the field info is only
+        rebuilt when fields are added or change units, so that the data of a
+        running simulation can be updated at every timestep. If copy is
+        False, the arrays are used in place rather than copied. Arrays given
+        as (array, units) tuples are always used in place, as when loading.
         """
-        particle_types = set_particle_types(data[0])
-
-        self.stream_handler.particle_types.update(particle_types)
-        self.ds._find_particle_types()
+        if not isinstance(data, dict):
+            data = dict(enumerate(data))
+        handler = self.stream_handler
+        particle_types = set_particle_types(next(iter(data.values())))
+        handler.particle_types.update(particle_types)
 
-        for i, grid in enumerate(self.grids):
-            field_units, gdata, number_of_particles = process_data(data[i])
-            self.stream_handler.particle_count[i] = number_of_particles
-            self.stream_handler.field_units.update(field_units)
-            for field in gdata:
-                if field in grid.field_data:
+        new_fields = False
+        updated_fields = set()
+        particles_updated = False
+        for i, grid_data in data.items():
+            field_units, gdata, number_of_particles = process_data(grid_data, copy=copy)
+            # Spelling the same units differently only costs a rebuild
+            for field, units in field_units.items():
+                old_units = handler.field_units.get(field)
+                if old_units is None or str(old_units) != str(units):
+                    new_fields = True
+            handler.field_units.update(field_units)
+            # The particles of the grids only holding fluid fields are kept
+            if any(gdata[field].ndim < 3 for field in gdata):
+                handler.particle_count[i] = number_of_particles
+                particles_updated = True
+            new_fields |= any(field not in self.field_list for field in gdata)
+            handler.fields[i].update(gdata)
+            updated_fields.update(gdata)
+        # Only the grids created so far may hold the old data
+        for grid in self.grids.created:
+            if grid.id - grid._id_offset in data:
+                for field in updated_fields:
                     grid.field_data.pop(field, None)
-                self.stream_handler.fields[grid.id][field] = gdata[field]
+        self.ds._invalidate_field_data()
 
-        self._reset_particle_count()
+        if particles_updated:
+            self._reset_particle_count()
+            self.ds._particle_type_counts = None
+        if not new_fields:
+            return
+        self.ds._find_particle_types()
         # We only want to create a superset of fields here.
         for field in self.ds.field_list:
             if field[0] == "all":
@@ -354,6 +354,12 @@ class StreamDataset(Dataset):
         self.particle_types = tuple(particle_types)
         self.particle_types_raw = self.particle_types
 
+    def _invalidate_field_data(self):
+        # The data read before the stream data was updated is dropped, from
+        # the dataset-wide cache and from the object returned by ds.r[:]
+        self.field_data_cache.invalidate()
+        self.r._all_data = None
+
 
 class StreamDictFieldHandler(dict):
     _additional_fields = ()
@@ -378,19 +384,26 @@ class StreamParticleIndex(SPHParticleIndex):
         else:
             self.io = io_registry[self.dataset_type](self.ds)
 
-    def update_data(self, data):
+    def update_data(self, data, copy=True):
         """
         Update the stream data with a new data dict. If fields already exist,
         they will be replaced, but if they do not, they will be added. Fields
         already in the stream but not part of the data dict will be left
         alone.
+
+        The particle index is only rebuilt when the positions, smoothing
+        lengths or numbers of particles change, and the field info when
+        fields are added or change units, so that the particles of a running
+        simulation can be updated at every timestep. If copy is False, the
+        arrays are used in place rather than copied. Arrays given as
+        (array, units) tuples are always used in place, as when loading.
         """
         # Alias
         ds = self.ds
         handler = ds.stream_handler
 
         # Preprocess
-        field_units, data, _ = process_data(data)
+        field_units, data, _ = process_data(data, copy=copy)
         pdata = {}
         for key in data.keys():
             if not isinstance(key, tuple):
@@ -401,19 +414,37 @@ class StreamParticleIndex(SPHParticleIndex):
             pdata[field] = data[key]
         data = pdata  # Drop reference count
         particle_types = set_particle_types(data)
+        fields = handler.fields
+        new_fields = any(field not in fields["stream_file"] for field in data)
+        for field, units in field_units.items():
+            old_units = handler.field_units.get(field)
+            if old_units is None or str(old_units) != str(units):
+                new_fields = True
 
         # Update particle types
         handler.particle_types.update(particle_types)
-        ds._find_particle_types()
+        if new_fields:
+            ds._find_particle_types()
 
         # Update fields
         handler.field_units.update(field_units)
-        fields = handler.fields
         for field in data.keys():
             if field not in fields._additional_fields:
                 fields._additional_fields += (field,)
         fields["stream_file"].update(data)
+        ds._invalidate_field_data()
 
+        # Update particle index
+        moved = any(
+            fname.startswith("particle_position") or fname == "smoothing_length"
+            for _, fname in data
+        )
+        counts = [self.io._count_particles(df) for df in self.data_files]
+        if moved or counts != [df.total_particles for df in self.data_files]:
+            self._reset_particle_index(counts)
+
+        if not new_fields:
+            return
         # Update field list
         for field in self.ds.field_list:
             if field[0] in ["all", "nbody"]:
@@ -421,6 +452,17 @@ class StreamParticleIndex(SPHParticleIndex):
         self._detect_output_fields()
         self.ds.create_field_info()
 
+    def _reset_particle_index(self, counts):
+        # The bitmap index is rebuilt over the new particles, in memory
+        for data_file, count in zip(self.data_files, counts):
+            data_file.total_particles = count
+            data_file.end = data_file.start + max(count.values(), default=0)
+        self._total_particles = None
+        self.ds._particle_type_counts = None
+        if hasattr(self, "_kdtree"):
+            del self._kdtree
+        self._initialize_index()
+
 
 class StreamParticleFile(ParticleFile):
     pass
@@ -135,19 +135,23 @@ def assign_particle_data(ds, pdata, bbox):
         ds.stream_handler.particle_count[gi] = npart
 
 
-def process_data(data, grid_dims=None):
+def process_data(data, grid_dims=None, copy=True):
     new_data, field_units = {}, {}
     for field, val in data.items():
         # val is a data array
         if isinstance(val, np.ndarray):
+            # The bare arrays are only shared with the caller if copy is False,
+            # the (array, units) tuples below always are
+            if copy:
+                val = val.copy()
             # val is a YTArray
             if hasattr(val, "units"):
                 field_units[field] = val.units
-                new_data[field] = val.copy().d
+                new_data[field] = val.d
             # val is a numpy array
             else:
                 field_units[field] = ""
-                new_data[field] = val.copy()
+                new_data[field] = val
 
         # val is a tuple of (data, units)
         elif isinstance(val, tuple) and len(val) == 2:
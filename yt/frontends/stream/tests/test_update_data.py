@@ -1,7 +1,7 @@
 import numpy as np
 
 from yt.data_objects.profiles import create_profile
-from yt.testing import fake_particle_ds, fake_random_ds
+from yt.testing import assert_equal, fake_particle_ds, fake_random_ds
 
 
 def test_update_data_grid():
@@ -27,3 +27,55 @@ def test_update_data_particle():
     assert ("io", "temperature") in ds.field_list
     dd = ds.all_data()
     dd["temperature"]
+
+
+def test_update_data_grid_incremental():
+    ds = fake_random_ds(16, nprocs=8, fields=("density",), units=("g/cm**3",))
+    ds.index
+    ds.field_data_cache.max_size = 10 * 1024 ** 2
+    field_info = ds.field_info
+    old = ds.r[:]["density"].copy()
+    grids = ds.index.grids
+    # Only the given grids are updated, with the arrays passed in
+    dens = {i: np.full(grids[i].ActiveDimensions, 2.0 * (i + 1)) for i in (0, 3)}
+    ds.index.update_data({i: {"density": v} for i, v in dens.items()}, copy=False)
+    for i, grid in enumerate(grids):
+        stored = ds.stream_handler.fields[i]["stream", "density"]
+        if i in dens:
+            assert stored is dens[i]
+            assert_equal(grid["density"], dens[i])
+        else:
+            assert_equal(grid["density"].size, grid.ActiveDimensions.prod())
+    # The data cached before the update is not returned anymore
+    new = ds.r[:]["density"]
+    assert_equal(new.size, old.size)
+    assert_equal(new.max().d, 8.0)
+    # The field info is only rebuilt for new fields
+    assert ds.field_info is field_info
+    ds.index.update_data({5: {"temperature": np.ones(grids[5].ActiveDimensions)}})
+    assert ds.field_info is not field_info
+    assert ("stream", "temperature") in ds.field_list
+
+
+def test_update_data_particle_incremental():
+    npart = 100
+    ds = fake_particle_ds(npart=npart)
+    ds.index
+    field_info = ds.field_info
+    assert ds.r[0.5:, :, :]["io", "particle_mass"].size > 0
+    # Moving the particles rebuilds the index, but not the field info
+    x = np.random.uniform(0.0, 0.25, npart)
+    ds.index.update_data({"particle_position_x": (x, "cm")})
+    assert ds.field_info is field_info
+    assert_equal(ds.r[0.5:, :, :]["io", "particle_mass"].size, 0)
+    assert_equal(ds.r[:0.5, :, :]["io", "particle_mass"].size, npart)
+    # As does changing the number of particles
+    data = {
+        f"particle_position_{ax}": (np.random.uniform(0.5, 1.0, npart // 2), "cm")
+        for ax in "xyz"
+    }
+    data["particle_mass"] = (np.ones(npart // 2), "g")
+    ds.index.update_data(data)
+    assert_equal(ds.particle_type_counts["io"], npart // 2)
+    assert_equal(ds.r[0.5:, :, :]["io", "particle_mass"].size, npart // 2)
+    assert ds.field_info is field_info
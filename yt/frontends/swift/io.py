@@ -1,6 +1,7 @@
 import numpy as np
 
 from yt.frontends.sph.io import IOHandlerSPH
+from yt.utilities.io_handler import read_masked_rows
 from yt.utilities.on_demand_imports import _h5py as h5py
 
 
@@ -103,9 +104,11 @@ class IOHandlerSwift(IOHandlerSPH):
                     continue
                 for field in field_list:
                     if field in ("Mass", "Masses"):
-                        data = g[self.ds._particle_mass_name][si:ei][mask, ...]
+                        data = read_masked_rows(
+                            g[self.ds._particle_mass_name], si, ei, mask
+                        )
                     else:
-                        data = g[field][si:ei][mask, ...]
+                        data = read_masked_rows(g[field], si, ei, mask)
 
                     data.astype("float64", copy=False)
                     yield (ptype, field), data
@@ -8,7 +8,6 @@ from numpy.lib.recfunctions import append_fields
 from yt.frontends.sph.io import IOHandlerSPH
 from yt.frontends.tipsy.definitions import npart_mapping
 from yt.geometry.particle_geometry_handler import CHUNKSIZE
-from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
 from yt.utilities.logger import ytLogger as mylog
 
 
@@ -125,22 +124,17 @@ class IOHandlerTipsyBinary(IOHandlerSPH):
                 os.remove(self.hsml_filename)
             else:
                 return
-        positions = []
-        for data_file in index.data_files:
-            for _, ppos in self._yield_coordinates(
-                data_file, needed_ptype=self.ds._sph_ptypes[0]
-            ):
-                positions.append(ppos)
-        if positions == []:
+        gen = self._smoothing_length_generator(index, self.hsml_filename)
+        if gen is None:
             return
-        kdtree = index.kdtree
-        positions = np.concatenate(positions)[kdtree.idx]
-        hsml = generate_smoothing_length(positions, kdtree, self.ds._num_neighbors)
-        hsml = hsml[np.argsort(kdtree.idx)]
+        hsml = gen.generate()
         dtype = self._pdtypes["Gas"]["Coordinates"][0]
         with open(self.hsml_filename, "wb") as f:
             f.write(struct.pack("q", self.ds._file_hash))
-            f.write(hsml.astype(dtype).tostring())
+            for i in range(0, hsml.size, self._chunksize):
+                f.write(hsml[i : i + self._chunksize].astype(dtype).tostring())
+        del hsml
+        gen.cleanup()
 
     def _read_smoothing_length(self, data_file, count):
         dtype = self._pdtypes["Gas"]["Coordinates"][0]
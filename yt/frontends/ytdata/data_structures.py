@@ -653,8 +653,9 @@ class YTNonspatialGrid(AMRGridPatch):
                 else:
                     v = v.astype(np.float64)
             if convert:
-                self.field_data[f] = self.ds.arr(v, units=finfos[f].units)
-                self.field_data[f].convert_to_units(finfos[f].output_units)
+                self.field_data[f] = self.ds._field_data_in_units(
+                    v, finfos[f].units, finfos[f].output_units
+                )
 
         read_particles, gen_particles = self.index._read_fluid_fields(
             particles, self, self._current_chunk
@@ -668,8 +669,9 @@ class YTNonspatialGrid(AMRGridPatch):
                 else:
                     v = v.astype(np.float64)
             if convert:
-                self.field_data[f] = self.ds.arr(v, units=finfos[f].units)
-                self.field_data[f].convert_to_units(finfos[f].output_units)
+                self.field_data[f] = self.ds._field_data_in_units(
+                    v, finfos[f].units, finfos[f].output_units
+                )
 
         fields_to_generate += gen_fluids + gen_particles
         self._generate_fields(fields_to_generate)
@@ -1,12 +1,13 @@
 import numpy as np
 
 from yt.data_objects.index_subobjects.unstructured_mesh import SemiStructuredMesh
-from yt.funcs import mylog
+from yt.funcs import iter_fields, mylog
 from yt.units.yt_array import YTArray, uconcatenate, uvstack
 from yt.utilities.lib.pixelization_routines import (
     interpolate_sph_grid_gather,
     normalization_2d_utility,
     pixelize_cartesian,
+    pixelize_cartesian_multi,
     pixelize_cartesian_nodal,
     pixelize_element_mesh,
     pixelize_element_mesh_line,
@@ -39,11 +40,7 @@ def _sample_ray(ray, npoints, field):
     field : str or field tuple
         The name of the field to sample
     """
-    start_point = ray.start_point
-    end_point = ray.end_point
-    sample_dr = (end_point - start_point) / (npoints - 1)
-    sample_points = [np.arange(npoints) * sample_dr[i] for i in range(3)]
-    sample_points = uvstack(sample_points).T + start_point
+    sample_points, x = _sample_points(ray.start_point, ray.end_point, npoints)
     ray_coordinates = uvstack([ray[d] for d in "xyz"]).T
     ray_dds = uvstack([ray["d" + d] for d in "xyz"]).T
     ray_field = ray[field]
@@ -57,9 +54,20 @@ def _sample_ray(ray, npoints, field):
         # are two indices if the sampling point happens to fall exactly at
         # a cell boundary
         field_values[i] = ray_field[np.argmax(ray_contains)]
+    return x, field_values
+
+
+def _sample_points(start_point, end_point, npoints):
+    """
+    Private function returning the npoints points sampling the line from
+    start_point to end_point, and their path length along the line.
+    """
+    sample_dr = (end_point - start_point) / (npoints - 1)
+    sample_points = [np.arange(npoints) * sample_dr[i] for i in range(3)]
+    sample_points = uvstack(sample_points).T + start_point
     dr = np.sqrt((sample_dr ** 2).sum())
     x = np.arange(npoints) / (npoints - 1) * (dr * npoints)
-    return x, field_values
+    return sample_points, x
 
 
 def all_data(data, ptype, fields, kdtree=False):
@@ -220,6 +228,56 @@ class CartesianCoordinateHandler(CoordinateHandler):
         else:
             return self._oblique_pixelize(data_source, field, bounds, size, antialias)
 
+    def pixelize_fields(
+        self,
+        dimension,
+        data_source,
+        fields,
+        bounds,
+        size,
+        antialias=True,
+        periodic=True,
+    ):
+        """
+        Method for pixelizing several fields at once. The fields deposited
+        from the cells of the data source share a single pass over the
+        cells, the others are pixelized one at a time.
+        """
+        index = data_source.ds.index
+        if (
+            hasattr(index, "meshes")
+            and not isinstance(index.meshes[0], SemiStructuredMesh)
+        ) or self.axis_id.get(dimension, dimension) >= 3:
+            return super().pixelize_fields(
+                dimension, data_source, fields, bounds, size, antialias, periodic
+            )
+        fields = data_source._determine_fields(fields)
+        grid_fields = [
+            f for f in dict.fromkeys(fields) if self._is_grid_field(data_source, f)
+        ]
+        images = {}
+        if len(grid_fields) > 0:
+            period = self._get_period(dimension)
+            buffs = self._pixelize_grid_fields(
+                data_source,
+                grid_fields,
+                bounds,
+                size,
+                antialias,
+                dimension,
+                periodic,
+                period,
+            )
+            images.update(zip(grid_fields, buffs))
+        return [
+            images[f]
+            if f in images
+            else self.pixelize(
+                dimension, data_source, f, bounds, size, antialias, periodic
+            )
+            for f in fields
+        ]
+
     def pixelize_line(self, field, start_point, end_point, npoints):
         """
         Method for sampling datasets along a line in preparation for
@@ -279,11 +337,68 @@ class CartesianCoordinateHandler(CoordinateHandler):
             )
             arc_length = YTArray(arc_length, start_point.units)
             plot_values = YTArray(plot_values, field_data.units)
+        elif hasattr(index, "_find_field_values_at_points"):
+            arc_lengths, values = self.pixelize_lines(
+                [field], [(start_point, end_point, npoints)]
+            )
+            arc_length, plot_values = arc_lengths[0], values[0][0]
         else:
             ray = self.ds.ray(start_point, end_point)
             arc_length, plot_values = _sample_ray(ray, npoints, field)
         return arc_length, plot_values
 
+    def pixelize_lines(self, fields, lines):
+        """
+        Method for sampling datasets along several lines at once, in
+        preparation for one-dimensional line plots. lines is a list of
+        (start_point, end_point, npoints). Returns the path lengths of the
+        points of each line, and for each line the values of the fields.
+
+        When the index can find the values of fields at a set of points,
+        the points of all the lines are located with a single query and
+        each block of data they touch is read once.
+        """
+        fields = list(iter_fields(fields))
+        index = self.ds.index
+        if (
+            hasattr(index, "meshes")
+            and not isinstance(index.meshes[0], SemiStructuredMesh)
+        ) or not hasattr(index, "_find_field_values_at_points"):
+            return super().pixelize_lines(fields, lines)
+
+        points = []
+        arc_lengths = []
+        for start_point, end_point, npoints in lines:
+            if npoints < 2:
+                raise ValueError(
+                    "Must have at least two sample points in order "
+                    "to draw a line plot."
+                )
+            start_point, end_point = (
+                p.to("code_length")
+                if hasattr(p, "units")
+                else self.ds.arr(p, "code_length", dtype="float64")
+                for p in (start_point, end_point)
+            )
+            line_points, x = _sample_points(start_point, end_point, npoints)
+            points.append(line_points)
+            arc_lengths.append(x)
+        coords = uconcatenate(points).d
+        # Points on the right edge of the domain are sampled from the cells
+        # along that edge
+        DLE = self.ds.domain_left_edge.to("code_length").d
+        DRE = self.ds.domain_right_edge.to("code_length").d
+        coords = np.where(coords == DRE, np.nextafter(DRE, DLE), coords)
+        all_values = index._find_field_values_at_points(fields, coords)
+        if len(fields) == 1:
+            all_values = [all_values]
+        bounds = np.cumsum([0] + [npoints for _, _, npoints in lines])
+        values = [
+            [v[start:end] for v in all_values]
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        return arc_lengths, values
+
     def _ortho_pixelize(
         self, data_source, field, bounds, size, antialias, dim, periodic
     ):
@@ -295,11 +410,7 @@ class CartesianCoordinateHandler(CoordinateHandler):
         # We should be using fcoords
         field = data_source._determine_fields(field)[0]
         finfo = data_source.ds.field_info[field]
-        period = self.period[:2].copy()  # dummy here
-        period[0] = self.period[self.x_axis[dim]]
-        period[1] = self.period[self.y_axis[dim]]
-        if hasattr(period, "in_units"):
-            period = period.in_units("code_length").d
+        period = self._get_period(dim)
 
         buff = np.zeros((size[1], size[0]), dtype="f8")
         particle_datasets = (ParticleDataset, StreamParticlesDataset)
@@ -532,20 +643,87 @@ class CartesianCoordinateHandler(CoordinateHandler):
                 )
             buff = buff.transpose()
         else:
-            pixelize_cartesian(
-                buff,
-                data_source["px"],
-                data_source["py"],
-                data_source["pdx"],
-                data_source["pdy"],
-                data_source[field],
-                bounds,
-                int(antialias),
-                period,
-                int(periodic),
-            )
+            buff = self._pixelize_grid_fields(
+                data_source, [field], bounds, size, antialias, dim, periodic, period
+            )[0]
         return buff
 
+    def _get_period(self, dim):
+        period = self.period[:2].copy()  # dummy here
+        period[0] = self.period[self.x_axis[dim]]
+        period[1] = self.period[self.y_axis[dim]]
+        if hasattr(period, "in_units"):
+            period = period.in_units("code_length").d
+        return period
+
+    def _is_grid_field(self, data_source, field):
+        # Whether a field is pixelized from the cells of the data object by
+        # pixelize_cartesian
+        from yt.frontends.sph.data_structures import ParticleDataset
+        from yt.frontends.stream.data_structures import StreamParticlesDataset
+
+        finfo = self.ds._get_field_info(field)
+        if np.any(finfo.nodal_flag):
+            return False
+        particle_datasets = (ParticleDataset, StreamParticlesDataset)
+        return not (
+            isinstance(data_source.ds, particle_datasets)
+            and data_source.ds.field_info[field].is_sph_field
+        )
+
+    def _pixelize_grid_fields(
+        self, data_source, fields, bounds, size, antialias, dim, periodic, period
+    ):
+        px, py = data_source["px"], data_source["py"]
+        pdx, pdy = data_source["pdx"], data_source["pdy"]
+        data = [data_source[field] for field in fields]
+
+        def _pixelize(buff, bounds, indices):
+            if len(indices) == 1:
+                pixelize_cartesian(
+                    buff[0],
+                    px,
+                    py,
+                    pdx,
+                    pdy,
+                    data[indices[0]],
+                    bounds,
+                    int(antialias),
+                    period,
+                    int(periodic),
+                )
+            else:
+                # The values of the fields of a pixel are stored together
+                stacked = np.zeros(buff.shape[1:] + (len(indices),), dtype="f8")
+                pixelize_cartesian_multi(
+                    stacked,
+                    px,
+                    py,
+                    pdx,
+                    pdy,
+                    np.stack([data[i].d for i in indices], axis=-1),
+                    bounds,
+                    int(antialias),
+                    period,
+                    int(periodic),
+                )
+                buff[:] = np.moveaxis(stacked, -1, 0)
+
+        # Periodic images of the data only depend on the whole window
+        # when it extends beyond the domain
+        DLE = self.ds.domain_left_edge.in_units("code_length").d
+        DRE = self.ds.domain_right_edge.in_units("code_length").d
+        xax, yax = self.x_axis[dim], self.y_axis[dim]
+        allow_partial = not periodic or (
+            DLE[xax] <= bounds[0]
+            and bounds[1] <= DRE[xax]
+            and DLE[yax] <= bounds[2]
+            and bounds[3] <= DRE[yax]
+        )
+        return data_source.ds.image_cache.get_images(
+            _pixelize, fields, data, bounds, size, antialias, allow_partial
+        )
+
     def _oblique_pixelize(self, data_source, field, bounds, size, antialias):
         from yt.frontends.ytdata.data_structures import YTSpatialPlotDataset
 
@@ -3,7 +3,7 @@ from numbers import Number
 
 import numpy as np
 
-from yt.funcs import fix_unitary, is_sequence, validate_width_tuple
+from yt.funcs import fix_unitary, is_sequence, iter_fields, validate_width_tuple
 from yt.units.yt_array import YTArray, YTQuantity
 from yt.utilities.exceptions import YTCoordinateNotImplemented, YTInvalidWidthError
 
@@ -77,9 +77,35 @@ class CoordinateHandler:
         # pixelizer
         raise NotImplementedError
 
+    def pixelize_fields(
+        self, dimension, data_source, fields, bounds, size, antialias=True, *args
+    ):
+        # Pixelize several fields at once, returning a list of images.
+        # Subclasses can override this to share work between the fields.
+        return [
+            self.pixelize(dimension, data_source, field, bounds, size, antialias, *args)
+            for field in fields
+        ]
+
     def pixelize_line(self, field, start_point, end_point, npoints):
         raise NotImplementedError
 
+    def pixelize_lines(self, fields, lines):
+        # Sample several fields along several (start_point, end_point,
+        # npoints) lines, returning the path lengths along each line and the
+        # values of the fields for each line.  Subclasses can override this
+        # to sample all the lines at once.
+        arc_lengths = []
+        values = []
+        for start_point, end_point, npoints in lines:
+            line_values = []
+            for field in iter_fields(fields):
+                x, y = self.pixelize_line(field, start_point, end_point, npoints)
+                line_values.append(y)
+            arc_lengths.append(x)
+            values.append(line_values)
+        return arc_lengths, values
+
     def distance(self, start, end):
         p1 = self.convert_to_cartesian(start)
         p2 = self.convert_to_cartesian(end)
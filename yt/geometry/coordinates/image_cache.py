@@ -0,0 +1,244 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from yt.config import ytcfg
+
+# The tolerance, in pixels, on the alignment of two pixel grids
+_ALIGN_TOL = 1e-6
+
+
+def _as_integer(value):
+    # Return value as an integer if it is close enough to one, else None
+    ivalue = int(np.rint(value))
+    if abs(value - ivalue) > _ALIGN_TOL:
+        return None
+    return ivalue
+
+
+# Protects the creation of the caches of the datasets
+_creation_lock = threading.Lock()
+
+
+def get_image_cache(ds):
+    """Return the image cache of a dataset, creating it if needed.
+
+    Its size is set by the ``image_cache_size`` configuration option, in
+    megabytes.
+    """
+    with _creation_lock:
+        cache = ds._image_cache
+        if cache is None:
+            max_size = ytcfg.getfloat("yt", "image_cache_size")
+            cache = ds._image_cache = ImageCache(int(max_size * 1024 ** 2))
+        return cache
+
+
+class ImageCache:
+    """A cache of the pixelized images of the fields of 2D data objects.
+
+    Besides returning the image of a window that has already been
+    pixelized, the cache builds the antialiased image of a new window from
+    a cached image whose pixels are aligned with its pixels. This is the
+    case when panning by a whole number of pixels, or when zooming out by a
+    whole factor (the cached pixels are then averaged). Only the strips of
+    the window that are not covered by the cached image are then pixelized.
+
+    The images of the data objects of a dataset share the cache
+    ``ds.image_cache``. An image is only used as long as the field array it
+    was pixelized from is alive: the cache holds weak references to the
+    arrays, so that they are freed when a data object clears its field
+    data, and the images of freed arrays are dropped.
+
+    The cache can be shared by threads pixelizing the same data object, the
+    pixelization itself being done outside of its lock.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The maximum size of the cached images. The cache is disabled when
+        this is 0.
+    """
+
+    def __init__(self, max_bytes=0):
+        self.max_bytes = max_bytes
+        self._images = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._images)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def clear(self):
+        """Drop all the cached images."""
+        with self._lock:
+            self._images.clear()
+            self._nbytes = 0
+
+    def _store(self, key, data, buff):
+        # Must be called with the lock held
+        if key in self._images:
+            self._nbytes -= self._images.pop(key)[1].nbytes
+        # Drop the images of the arrays that have been freed
+        for old_key, (ref, old) in list(self._images.items()):
+            if ref() is None:
+                del self._images[old_key]
+                self._nbytes -= old.nbytes
+        if buff.nbytes > self.max_bytes:
+            return
+        self._images[key] = (weakref.ref(data), buff.copy())
+        self._nbytes += buff.nbytes
+        while self._nbytes > self.max_bytes:
+            _, (_, old) = self._images.popitem(last=False)
+            self._nbytes -= old.nbytes
+
+    def _find_overlap(self, key, data, bounds, size):
+        # Find the cached image covering the largest part of the window,
+        # returning it with the range of pixels of the window it covers and
+        # the matching pixels of the cached image.  Must be called with the
+        # lock held.
+        nx, ny = size
+        dx = (bounds[1] - bounds[0]) / nx
+        dy = (bounds[3] - bounds[2]) / ny
+        best = None
+        for (cid, cantialias, _, cbounds, csize), (cref, cbuff) in reversed(
+            self._images.items()
+        ):
+            if cid != key[0] or not cantialias or cref() is not data:
+                continue
+            cnx, cny = csize
+            cdx = (cbounds[1] - cbounds[0]) / cnx
+            cdy = (cbounds[3] - cbounds[2]) / cny
+            mx = _as_integer(dx / cdx)
+            my = _as_integer(dy / cdy)
+            if mx is None or my is None or mx < 1 or my < 1:
+                continue
+            offx = _as_integer((bounds[0] - cbounds[0]) / cdx)
+            offy = _as_integer((bounds[2] - cbounds[2]) / cdy)
+            if offx is None or offy is None:
+                continue
+            # The pixels j0 <= j < j1 of the window are covered by the pixels
+            # offx + j * mx ... offx + (j + 1) * mx - 1 of the cached image
+            j0 = max(0, -(offx // mx))
+            j1 = min(nx, (cnx - offx) // mx)
+            i0 = max(0, -(offy // my))
+            i1 = min(ny, (cny - offy) // my)
+            if j1 <= j0 or i1 <= i0:
+                continue
+            area = (j1 - j0) * (i1 - i0)
+            if best is None or area > best[0]:
+                sub = cbuff[
+                    offy + i0 * my : offy + i1 * my, offx + j0 * mx : offx + j1 * mx
+                ]
+                if mx > 1 or my > 1:
+                    sub = sub.reshape(i1 - i0, my, j1 - j0, mx).mean(axis=(1, 3))
+                best = (area, (i0, i1, j0, j1), sub)
+        return best
+
+    def get_images(
+        self, pixelize, fields, data, bounds, size, antialias, allow_partial
+    ):
+        """Return the images of several fields over a window.
+
+        Parameters
+        ----------
+        pixelize : callable
+            A function pixelizing the fields, called as
+            ``pixelize(buff, bounds, indices)`` to fill the array buff (of
+            shape (len(indices), ny, nx)) with the images of bounds of the
+            fields at the given indices in fields.
+        fields : list of tuples of str
+            The fields.
+        data : list of arrays
+            The values of the fields in the data object. The cached images
+            are only used as long as the values are the same objects.
+        bounds : tuple of floats
+            The window (xmin, xmax, ymin, ymax), in code units.
+        size : tuple of ints
+            The size (nx, ny) of the images.
+        antialias : bool
+            Whether the images are antialiased.
+        allow_partial : bool
+            Whether a window can be assembled from a cached image and
+            newly pixelized strips. This should be False when the
+            pixelization of a pixel depends on the whole window, as is the
+            case with periodic images of the data. Without antialiasing,
+            the value of the pixels on the edges of the cells depends on
+            rounding errors, so only identical windows are reused.
+
+        Returns
+        -------
+        A list of arrays of shape (ny, nx), one per field.
+        """
+        bounds = tuple(float(b) for b in bounds)
+        size = (int(size[0]), int(size[1]))
+        nx, ny = size
+        if not self.enabled:
+            buffs = np.zeros((len(fields), ny, nx), dtype="f8")
+            pixelize(buffs, bounds, list(range(len(fields))))
+            return list(buffs)
+        dx = (bounds[1] - bounds[0]) / nx
+        dy = (bounds[3] - bounds[2]) / ny
+        # The images are keyed on the arrays they are pixelized from, whose
+        # identity is checked against the weak references of the images
+        keys = [
+            (id(fdata), bool(antialias), bool(allow_partial), bounds, size)
+            for fdata in data
+        ]
+        buffs = [None] * len(fields)
+        missing = []
+        for k, (key, fdata) in enumerate(zip(keys, data)):
+            with self._lock:
+                cached = self._images.get(key)
+                if cached is not None and cached[0]() is fdata:
+                    buffs[k] = cached[1].copy()
+                    continue
+                overlap = None
+                if antialias and allow_partial:
+                    overlap = self._find_overlap(key, fdata, bounds, size)
+            if overlap is None:
+                missing.append(k)
+                continue
+            _, (i0, i1, j0, j1), sub = overlap
+            buff = np.zeros((ny, nx), dtype="f8")
+            buff[i0:i1, j0:j1] = sub
+            # Pixelize the rows below and above, and the columns on the left
+            # and the right of the covered pixels
+            strips = [
+                (0, i0, 0, nx),
+                (i1, ny, 0, nx),
+                (i0, i1, 0, j0),
+                (i0, i1, j1, nx),
+            ]
+            for si0, si1, sj0, sj1 in strips:
+                if si1 <= si0 or sj1 <= sj0:
+                    continue
+                strip = np.zeros((1, si1 - si0, sj1 - sj0), dtype="f8")
+                pixelize(
+                    strip,
+                    (
+                        bounds[0] + sj0 * dx,
+                        bounds[0] + sj1 * dx,
+                        bounds[2] + si0 * dy,
+                        bounds[2] + si1 * dy,
+                    ),
+                    [k],
+                )
+                buff[si0:si1, sj0:sj1] = strip[0]
+            buffs[k] = buff
+        if len(missing) > 0:
+            # The fields without a usable cached image are pixelized together
+            new = np.zeros((len(missing), ny, nx), dtype="f8")
+            pixelize(new, bounds, missing)
+            for k, buff in zip(missing, new):
+                buffs[k] = buff
+        with self._lock:
+            for key, fdata, buff in zip(keys, data, buffs):
+                self._store(key, fdata, buff)
+        return buffs
@@ -2,7 +2,7 @@
 
 import numpy as np
 
-from yt.testing import assert_equal, fake_amr_ds
+from yt.testing import assert_allclose, assert_equal, fake_amr_ds
 
 # Our canonical tests are that we can access all of our fields and we can
 # compute our volume correctly.
@@ -26,3 +26,92 @@ def test_cartesian_coordinates():
         assert_equal(dd[fd].max(), (ds.domain_width / ds.domain_dimensions)[i])
         assert_equal(dd[fd], dd[fp])
     assert_equal(dd["cell_volume"].sum(dtype="float64"), ds.domain_width.prod())
+
+
+def test_image_cache():
+    # Panned and zoomed out images built from cached images match the images
+    # pixelized from scratch
+    from yt.visualization.fixed_resolution import FixedResolutionBuffer
+
+    ds = fake_amr_ds(fields=("density",))
+    ds.image_cache.max_bytes = 64 * 1024 ** 2
+    windows = [
+        (0.375, 0.625, 0.375, 0.625),
+        (0.4, 0.65, 0.375, 0.625),
+        (0.4, 0.65, 0.35, 0.6),
+        (0.275, 0.775, 0.225, 0.725),
+        (0.0, 1.0, 0.0, 1.0),
+    ]
+    for antialias in (True, False):
+        sl = ds.slice(2, 0.5)
+        for window in windows:
+            frb = FixedResolutionBuffer(sl, window, (400, 400), antialias=antialias)
+            cached = frb["density"].d
+            ds.image_cache.clear()
+            frb = FixedResolutionBuffer(sl, window, (400, 400), antialias=antialias)
+            assert_allclose(cached, frb["density"].d, rtol=1e-10)
+
+
+def test_image_cache_lifetime():
+    # The cache is disabled by default, and does not keep the images of the
+    # fields cleared by their data objects
+    from yt.visualization.fixed_resolution import FixedResolutionBuffer
+
+    ds = fake_amr_ds(fields=("density",))
+    sl = ds.slice(2, 0.5)
+    FixedResolutionBuffer(sl, (0.0, 1.0, 0.0, 1.0), (64, 64))["density"]
+    assert_equal(len(ds.image_cache), 0)
+
+    ds.image_cache.max_bytes = 1024 ** 2
+    FixedResolutionBuffer(sl, (0.0, 1.0, 0.0, 1.0), (64, 64))["density"]
+    assert_equal(len(ds.image_cache), 1)
+    sl.clear_data()
+    FixedResolutionBuffer(sl, (0.0, 0.5, 0.0, 0.5), (64, 64))["density"]
+    assert_equal(len(ds.image_cache), 1)
+
+
+def test_pixelize_fields():
+    # Fields pixelized together match the fields pixelized one at a time
+    from yt.visualization.fixed_resolution import FixedResolutionBuffer
+
+    fields = ["density", "velocity_x", "velocity_y"]
+    ds = fake_amr_ds(fields=fields)
+    for antialias in (True, False):
+        for window in [(0.2, 0.7, 0.3, 0.8), (-0.1, 0.4, 0.8, 1.3)]:
+            sl = ds.slice(2, 0.5)
+            frb = FixedResolutionBuffer(sl, window, (200, 300), antialias=antialias)
+            frb.load_fields(fields)
+            assert_equal(sorted(frb.keys()), sorted(fields))
+            for field in fields:
+                sl = ds.slice(2, 0.5)
+                ref = FixedResolutionBuffer(sl, window, (200, 300), antialias=antialias)
+                assert_equal(frb[field], ref[field])
+
+
+def test_image_cache_threads():
+    # Threads sharing a cache, which evicts images while others look them
+    # up, get the images pixelized from scratch
+    from concurrent.futures import ThreadPoolExecutor
+
+    from yt.geometry.coordinates.image_cache import ImageCache
+
+    data = [np.zeros(1)]
+
+    def pixelize(buff, bounds, indices):
+        nx, ny = buff.shape[2], buff.shape[1]
+        x = np.linspace(bounds[0], bounds[1], nx, endpoint=False)
+        y = np.linspace(bounds[2], bounds[3], ny, endpoint=False)
+        buff[:] = x[None, :] + 2 * y[:, None]
+
+    def get(i):
+        bounds = (i / 64, i / 64 + 0.5, i / 32, i / 32 + 0.5)
+        (image,) = cache.get_images(
+            pixelize, [("gas", "density")], data, bounds, (64, 64), True, True
+        )
+        ref = np.zeros((1, 64, 64))
+        pixelize(ref, bounds, [0])
+        assert_allclose(image, ref[0], rtol=1e-10)
+
+    cache = ImageCache(max_bytes=4 * 64 * 64 * 8)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(get, list(range(32)) * 8))
@@ -14,13 +14,91 @@ from yt.utilities.definitions import MAXLEVEL
 from yt.utilities.logger import ytLogger as mylog
 
 from .grid_container import GridTree, MatchPointsToGrids
+from .grid_index_cache import load_grid_index, save_grid_index
+
+RECONSTRUCT_INDEX = bool(ytcfg.get("yt", "reconstruct_index"))
+
+
+class GridObjectArray:
+    """An array of the grid objects of an index, created on first access.
+
+    This stands in for the object array of grids of an index whose
+    hierarchy is held in its grid arrays (see
+    GridIndex._setup_grid_objects), so that only the grids that are
+    selected, or otherwise accessed, are ever created. Indexing with an
+    integer returns a grid, and indexing with a slice, a boolean mask or an
+    array of indices returns an object array of grids.
+    """
+
+    ndim = 1
+    dtype = np.dtype("object")
+
+    def __init__(self, index):
+        self._index = weakref.proxy(index)
+        self._grids = np.empty(index.num_grids, dtype="object")
+        self._created = np.zeros(index.num_grids, dtype="bool")
+
+    @property
+    def size(self):
+        return self._grids.size
+
+    @property
+    def shape(self):
+        return self._grids.shape
+
+    def __len__(self):
+        return self._grids.size
+
+    def _get(self, i):
+        if not self._created[i]:
+            self._grids[i] = self._index._create_grid(i)
+            self._created[i] = True
+        return self._grids[i]
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            i = key + self.size if key < 0 else key
+            if not 0 <= i < self.size:
+                raise IndexError(f"Grid index {key} out of range")
+            return self._get(i)
+        ind = np.arange(self.size)[key]
+        if ind.ndim == 0:
+            return self._get(int(ind))
+        for i in np.unique(ind[~self._created[ind]]):
+            self._get(i)
+        return self._grids[ind]
+
+    def __setitem__(self, key, grids):
+        self._grids[key] = grids
+        self._created[key] = True
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self._get(i)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self[:], dtype=dtype)
+
+    def tolist(self):
+        return list(self)
+
+    @property
+    def created(self):
+        """The grids created so far."""
+        return self._grids[self._created].tolist()
 
 
 class GridIndex(Index, abc.ABC):
-    """The index class for patch and block AMR datasets. """
+    """The index class for patch and block AMR datasets."""
 
     float_type = "float64"
     _preload_implemented = False
+    # The parent and children of the grids, for the indexes holding their
+    # hierarchy in arrays (see _set_grid_parents)
+    grid_parent_id = None
+    grid_child_offsets = None
+    grid_child_ids = None
+    grid_filenames = None
     _index_properties = (
         "grid_left_edge",
         "grid_right_edge",
@@ -95,20 +173,125 @@ class GridIndex(Index, abc.ABC):
         self.grid_levels = np.zeros((self.num_grids, 1), "int32")
         self.grid_particle_count = np.zeros((self.num_grids, 1), "int32")
 
+    def _load_index_cache(self, filename, sources):
+        """Fill the grid arrays from the cache written by _save_index_cache.
+
+        The other arrays of the cache are returned, or None if the cache is
+        missing or outdated (see load_grid_index), in which case the index
+        must be parsed.
+        """
+        arrays = load_grid_index(filename, sources)
+        if arrays is None:
+            return None
+        for name in self._index_properties:
+            if name not in arrays or arrays[name].shape != getattr(self, name).shape:
+                return None
+        for name in self._index_properties:
+            getattr(self, name)[:] = arrays.pop(name)
+        return arrays
+
+    def _save_index_cache(self, filename, sources, **arrays):
+        """Cache the grid arrays parsed from the files sources, along with
+        other arrays describing the index, in filename."""
+        for name in self._index_properties:
+            arrays[name] = getattr(self, name)
+        save_grid_index(filename, sources, arrays)
+
+    def _set_grid_parents(self, parent_ids):
+        """Store the hierarchy of the grids in arrays.
+
+        parent_ids holds the position of the parent of each grid in the grid
+        arrays, or -1 for the grids without a parent. The children of the
+        grid i are then grid_child_ids[grid_child_offsets[i]:
+        grid_child_offsets[i + 1]], in the order of the grid arrays.
+        """
+        self.grid_parent_id = np.asarray(parent_ids, dtype="int64").reshape(
+            self.num_grids
+        )
+        children = np.flatnonzero(self.grid_parent_id >= 0)
+        order = np.argsort(self.grid_parent_id[children], kind="stable")
+        self.grid_child_ids = children[order]
+        counts = np.bincount(self.grid_parent_id[children], minlength=self.num_grids)
+        self.grid_child_offsets = np.zeros(self.num_grids + 1, dtype="int64")
+        np.cumsum(counts, out=self.grid_child_offsets[1:])
+
+    def _get_child_indices(self, gi):
+        # The positions of the children of the grids at positions gi
+        starts = self.grid_child_offsets[gi]
+        counts = self.grid_child_offsets[gi + 1] - starts
+        ind = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return self.grid_child_ids[ind + np.arange(ind.size)]
+
+    def _get_grid_parent(self, i):
+        pid = self.grid_parent_id[i]
+        if pid < 0:
+            return None
+        return self.grids[pid]
+
+    def _get_grid_children(self, i):
+        start, end = self.grid_child_offsets[i : i + 2]
+        return list(self.grids[self.grid_child_ids[start:end]])
+
+    def _setup_grid_objects(self):
+        """Set up the grids from the grid arrays, to be created on demand.
+
+        The hierarchy must have been stored with _set_grid_parents. The cell
+        widths of the grids are computed and, if the reconstruct_index
+        option is set, the edges of the grids are clamped to the cells of
+        their parents, tree level by tree level, the way
+        AMRGridPatch._prepare_grid and _setup_dx do it grid by grid. The
+        grid objects, created by _create_grid when first accessed, then
+        only hold views of the arrays.
+        """
+        LE = self.grid_left_edge.d
+        RE = self.grid_right_edge.d
+        domain_width = self.ds.domain_right_edge.d - self.ds.domain_left_edge.d
+        dds = np.empty((self.num_grids, 3), dtype="float64")
+        gi = np.flatnonzero(self.grid_parent_id < 0)
+        dds[gi] = (RE[gi] - LE[gi]) / self.grid_dimensions[gi]
+        while gi.size > 0:
+            if self.ds.dimensionality < 3:
+                dds[gi, 2] = domain_width[2]
+            gi = self._get_child_indices(gi)
+            pi = self.grid_parent_id[gi]
+            dds[gi] = dds[pi] / self.ds.refine_by
+            if RECONSTRUCT_INDEX:
+                LE[gi] = np.rint((LE[gi] - LE[pi]) / dds[pi]) * dds[pi] + LE[pi]
+                RE[gi] = np.rint((RE[gi] - RE[pi]) / dds[pi]) * dds[pi] + RE[pi]
+        self.grid_dds = self.ds.arr(dds, self.grid_left_edge.units)
+        self.grids = GridObjectArray(self)
+
+    def _create_grid(self, i):
+        """Create the object of the grid at position i of the grid arrays."""
+        grid = self.grid(i + self.grid._id_offset, self)
+        grid.Level = self.grid_levels[i, 0]
+        grid.ActiveDimensions = self.grid_dimensions[i]
+        grid.LeftEdge = self.grid_left_edge[i]
+        grid.RightEdge = self.grid_right_edge[i]
+        grid.NumberOfParticles = self.grid_particle_count[i, 0]
+        grid.dds = self.grid_dds[i]
+        if self.grid_filenames is not None:
+            grid.filename = self.grid_filenames[i]
+        return grid
+
     def clear_all_data(self):
         """
         This routine clears all the data currently being held onto by the grids
         and the data io handler.
         """
-        for g in self.grids:
+        grids = getattr(self.grids, "created", self.grids)
+        for g in grids:
             g.clear_data()
         self.io.queue.clear()
 
+    def _get_first_grid(self, level):
+        return self.grids[np.flatnonzero(self.grid_levels.flat == level)[0]]
+
     def get_smallest_dx(self):
         """
         Returns (in code units) the smallest cell size in the simulation.
         """
-        return self.select_grids(self.grid_levels.max())[0].dds[:].min()
+        return self._get_first_grid(self.grid_levels.max()).dds[:].min()
 
     def _get_particle_type_counts(self):
         return {self.ds.particle_types_raw[0]: self.grid_particle_count.sum()}
@@ -214,7 +397,7 @@ class GridIndex(Index, abc.ABC):
                     np.ceil(self.level_stats["numcells"][level] ** (1.0 / 3)),
                 )
             )
-            dx = self.select_grids(level)[0].dds[0]
+            dx = self._get_first_grid(level).dds[0]
         print("-" * 46)
         print(
             "   \t% 6i\t% 14i"
@@ -241,35 +424,35 @@ class GridIndex(Index, abc.ABC):
         r"""Find the value of fields at a set of coordinates.
 
         Returns the values [field1, field2,...] of the fields at the given
-        (x, y, z) points. Returns a numpy array of field values cross coords
+        (x, y, z) points. Returns a numpy array of field values cross coords.
+        The points are located in the grid tree at once, and each grid
+        containing points is read once, for all the fields. Points outside
+        of the grids get NaN values.
         """
         coords = self.ds.arr(ensure_numpy_array(coords), "code_length")
-        grids = self._find_points(coords[:, 0], coords[:, 1], coords[:, 2])[0]
+        coords = coords.reshape((-1, 3))
+        grid_ind = self._find_points(coords[:, 0].d, coords[:, 1].d, coords[:, 2].d)[1]
         fields = list(iter_fields(fields))
-        mark = np.zeros(3, dtype=np.int)
-        out = []
-
-        # create point -> grid mapping
-        grid_index = {}
-        for coord_index, grid in enumerate(grids):
-            if grid not in grid_index:
-                grid_index[grid] = []
-            grid_index[grid].append(coord_index)
-
-        out = []
-        for field in fields:
-            funit = self.ds._get_field_info(field).units
-            out.append(self.ds.arr(np.empty((len(coords))), funit))
-
-        for grid in grid_index:
-            cellwidth = (grid.RightEdge - grid.LeftEdge) / grid.ActiveDimensions
+
+        values = [np.full(coords.shape[0], np.nan) for field in fields]
+        units = [self.ds._get_field_info(field).units for field in fields]
+
+        # Group the points by grid
+        order = np.argsort(grid_ind, kind="stable")
+        gis, starts = np.unique(grid_ind[order], return_index=True)
+        for gi, pts in zip(gis, np.split(order, starts[1:])):
+            if gi < 0:
+                continue
+            grid = self.grids[gi]
+            ind = ((coords[pts] - grid.LeftEdge) / grid.dds).d.astype("int64")
+            ind = np.clip(ind, 0, grid.ActiveDimensions - 1)
+            grid.get_data(fields)
             for field_index, field in enumerate(fields):
-                for coord_index in grid_index[grid]:
-                    mark = (coords[coord_index, :] - grid.LeftEdge) / cellwidth
-                    mark = np.array(mark, dtype="int64")
-                    out[field_index][coord_index] = grid[field][
-                        mark[0], mark[1], mark[2]
-                    ]
+                fdata = grid[field]
+                values[field_index][pts] = fdata[ind[:, 0], ind[:, 1], ind[:, 2]]
+                units[field_index] = fdata.units
+
+        out = [self.ds.arr(v, u) for v, u in zip(values, units)]
         if len(fields) == 1:
             return out[0]
         return out
@@ -292,6 +475,17 @@ class GridIndex(Index, abc.ABC):
 
     def _get_grid_tree(self):
 
+        if self.grid_parent_id is not None:
+            return GridTree(
+                self.num_grids,
+                self.grid_left_edge.d.astype("float64"),
+                self.grid_right_edge.d.astype("float64"),
+                self.grid_dimensions.astype("int32"),
+                self.grid_parent_id,
+                self.grid_levels[:, 0].astype("int64"),
+                np.diff(self.grid_child_offsets),
+            )
+
         left_edge = self.ds.arr(np.zeros((self.num_grids, 3)), "code_length")
         right_edge = self.ds.arr(np.zeros((self.num_grids, 3)), "code_length")
         level = np.zeros((self.num_grids), dtype="int64")
@@ -0,0 +1,105 @@
+"""
+A binary cache of the grid hierarchies parsed from text index files
+
+
+
+"""
+import os
+
+import numpy as np
+
+from yt.utilities.logger import ytLogger as mylog
+
+GRID_INDEX_CACHE_VERSION = 1
+
+
+def _signature(filename, sources):
+    # The files the index was parsed from are recorded relative to the
+    # cache, along with their sizes and modification times
+    cache_dir = os.path.dirname(os.path.abspath(filename))
+    names = [os.path.relpath(os.path.abspath(fn), cache_dir) for fn in sources]
+    stats = [(os.path.getsize(fn), os.path.getmtime(fn)) for fn in sources]
+    return np.array(names, dtype="str"), np.array(stats, dtype="float64")
+
+
+def save_grid_index(filename, sources, arrays):
+    """Write the arrays describing a grid index to filename, unless the
+    target directory is not writable.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the cache file.
+    sources : list of str
+        The files the index was parsed from. The cache is only used as
+        long as their sizes and modification times are unchanged.
+    arrays : dict
+        The arrays describing the index.
+    """
+    wdir = os.path.dirname(os.path.abspath(filename))
+    if not os.access(wdir, os.W_OK):
+        return
+    names, stats = _signature(filename, sources)
+    data = {"version": np.array(GRID_INDEX_CACHE_VERSION)}
+    data["source_names"] = names
+    data["source_stats"] = stats
+    for name, arr in arrays.items():
+        arr = np.asarray(arr)
+        if arr.dtype.kind == "U":
+            # Arrays of strings (typically file names) hold few distinct
+            # values, so only these are stored
+            strings, ids = np.unique(arr, return_inverse=True)
+            data["strings_" + name] = strings
+            data["ids_" + name] = ids
+        else:
+            data["array_" + name] = arr
+    # Write to a temporary file first, so that a concurrent or interrupted
+    # write never leaves a truncated cache behind
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(f, **data)
+        os.replace(tmp, filename)
+    except OSError:
+        # Sometimes os mis-reports whether a directory is writable,
+        # So pass if writing the cache fails.
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_grid_index(filename, sources):
+    """Read the arrays written by save_grid_index.
+
+    None is returned if the cache is missing, unreadable, or outdated: if
+    any of the files the index was parsed from (those recorded in the cache
+    and sources) changed since the cache was written.
+    """
+    if not os.path.exists(filename):
+        return None
+    cache_dir = os.path.dirname(os.path.abspath(filename))
+    try:
+        with np.load(filename) as data:
+            if int(data["version"]) != GRID_INDEX_CACHE_VERSION:
+                mylog.debug("Ignoring outdated grid index cache %s", filename)
+                return None
+            names = [os.path.join(cache_dir, str(n)) for n in data["source_names"]]
+            missing = {os.path.abspath(fn) for fn in sources}
+            missing -= {os.path.abspath(fn) for fn in names}
+            if len(missing) > 0 or not all(os.path.exists(fn) for fn in names):
+                mylog.debug("Ignoring outdated grid index cache %s", filename)
+                return None
+            if not np.array_equal(_signature(filename, names)[1], data["source_stats"]):
+                mylog.debug("Ignoring outdated grid index cache %s", filename)
+                return None
+            arrays = {}
+            for key in data.files:
+                if key.startswith("array_"):
+                    arrays[key[len("array_") :]] = data[key]
+                elif key.startswith("strings_"):
+                    name = key[len("strings_") :]
+                    arrays[name] = data[key][data["ids_" + name]]
+    except (OSError, ValueError, KeyError) as e:
+        mylog.warning("Could not read grid index cache %s (%s)", filename, e)
+        return None
+    mylog.debug("Read grid index from %s", filename)
+    return arrays
@@ -1,9 +1,14 @@
 import numpy as np
 
 from yt.fields.field_detector import FieldDetector
+from yt.funcs import ensure_numpy_array, iter_fields
 from yt.geometry.geometry_handler import Index
+from yt.utilities.lib.geometry_utils import get_morton_indices
 from yt.utilities.logger import ytLogger as mylog
 
+# The number of bits per dimension of the Morton keys of points
+_MORTON_BITS = 20
+
 
 class OctreeIndex(Index):
     """The Index subclass for oct AMR datasets"""
@@ -24,6 +29,89 @@ class OctreeIndex(Index):
     def convert(self, unit):
         return self.dataset.conversion_factors[unit]
 
+    def _find_field_values_at_points(self, fields, coords):
+        r"""Find the value of fields at a set of coordinates.
+
+        Returns the values [field1, field2,...] of the fields at the given
+        (x, y, z) points. Points outside of the domain get NaN values.
+
+        The points are sorted by their Morton key on a grid finer than the
+        root cells. A cell aligned with that grid covers a contiguous range
+        of keys, so the points inside the cells of a chunk are found with a
+        binary search. The cells overlapping the points are read chunk by
+        chunk, each chunk once, with all the fields at once.
+        """
+        coords = self.ds.arr(ensure_numpy_array(coords), "code_length")
+        coords = coords.reshape((-1, 3)).d
+        fields = list(iter_fields(fields))
+        npoints = coords.shape[0]
+        values = [np.full(npoints, np.nan) for field in fields]
+        units = [self.ds._get_field_info(field).units for field in fields]
+
+        DLE = self.ds.domain_left_edge.to("code_length").d
+        DRE = self.ds.domain_right_edge.to("code_length").d
+        dims = self.ds.domain_dimensions
+        inside = np.all((coords >= DLE) & (coords < DRE), axis=1)
+        if inside.any():
+            # Integer positions of the points, with root cells of
+            # 2**level_bits units
+            root_bits = int(np.ceil(np.log2(dims.max())))
+            level_bits = _MORTON_BITS - root_bits
+            scale = dims * 2 ** level_bits / (DRE - DLE)
+            ipos = np.floor((coords - DLE) * scale).astype("int64")
+            ipos = np.clip(ipos, 0, dims * 2 ** level_bits - 1).astype("uint64")
+            keys = get_morton_indices(ipos)
+            points = np.flatnonzero(inside)
+            points = points[np.argsort(keys[points], kind="stable")]
+            keys = keys[points]
+
+            # Only read the cells around the points
+            root_dds = (DRE - DLE) / dims
+            left = np.maximum(coords[points].min(axis=0) - root_dds, DLE)
+            right = np.minimum(coords[points].max(axis=0) + root_dds, DRE)
+            dobj = self.ds.region((left + right) / 2, left, right)
+            for chunk in dobj.chunks([], "io"):
+                chunk.get_data(fields)
+                center = np.stack(
+                    [chunk["index", ax].to("code_length").d for ax in "xyz"], axis=1
+                )
+                width = np.stack(
+                    [chunk["index", f"d{ax}"].to("code_length").d for ax in "xyz"],
+                    axis=1,
+                )
+                if center.shape[0] == 0:
+                    continue
+                # The range of keys covered by each cell: the aligned cube of
+                # side 2**k containing it
+                iwidth = np.maximum((width * scale).max(axis=1), 1)
+                side = 2 ** np.ceil(np.log2(iwidth) - 1e-6).astype("uint64")
+                icenter = np.floor((center - DLE) * scale).astype("uint64")
+                icorner = icenter & ~(side - 1)[:, None]
+                start = get_morton_indices(icorner)
+                lo = np.searchsorted(keys, start, side="left")
+                hi = np.searchsorted(keys, start + side ** 3, side="left")
+                count = hi - lo
+                if count.sum() == 0:
+                    continue
+                cells = np.repeat(np.arange(center.shape[0]), count)
+                offsets = np.cumsum(count) - count
+                ind = np.arange(cells.size) - offsets[cells] + lo[cells]
+                pts = points[ind]
+                # Check that the points are inside the cells
+                rel = coords[pts] - center[cells]
+                half = width[cells] / 2
+                match = np.all((rel >= -half) & (rel < half), axis=1)
+                pts, cells = pts[match], cells[match]
+                for field_index, field in enumerate(fields):
+                    fdata = chunk[field]
+                    values[field_index][pts] = fdata[cells]
+                    units[field_index] = fdata.units
+
+        out = [self.ds.arr(v, u) for v, u in zip(values, units)]
+        if len(fields) == 1:
+            return out[0]
+        return out
+
     def _add_mesh_sampling_particle_field(self, deposit_field, ftype, ptype):
         units = self.ds.field_info[ftype, deposit_field].units
         take_log = self.ds.field_info[ftype, deposit_field].take_log
@@ -10,6 +10,7 @@ from yt.data_objects.index_subobjects.particle_container import ParticleContaine
 from yt.funcs import get_pbar, only_on_root
 from yt.geometry.geometry_handler import Index, YTDataChunk
 from yt.geometry.particle_oct_container import ParticleBitmap
+from yt.geometry.particle_order import ParticleOrder
 from yt.utilities.lib.fnv_hash import fnv_hash
 from yt.utilities.logger import ytLogger as mylog
 
@@ -19,6 +20,8 @@ CHUNKSIZE = 64 ** 3
 class ParticleIndex(Index):
     """The Index subclass for particle datasets"""
 
+    particle_order = None
+
     def __init__(self, ds, dataset_type):
         self.dataset_type = dataset_type
         self.dataset = weakref.proxy(ds)
@@ -185,6 +188,52 @@ class ParticleIndex(Index):
                     pass
             rflag = self.regions.check_bitmasks()
 
+        self.particle_order = ParticleOrder.load(
+            self._particle_order_filename,
+            ds.domain_left_edge,
+            ds.domain_right_edge,
+            ds._file_hash,
+        )
+
+    @property
+    def _particle_order_filename(self):
+        return self.ds.parameter_filename + ".morton.npz"
+
+    def sort_particles(self, order=None):
+        """Compute the Morton ordering of the particles of every data file.
+
+        The ordering is saved in a sidecar file next to the dataset and
+        loaded automatically afterwards. It lets the IO handlers only read
+        the positions of the particles close to a selection rather than
+        those of every particle in the files it touches.
+
+        Parameters
+        ----------
+        order : int, optional
+            The number of levels of the Morton grid used to sort the
+            particles. Defaults to the coarse index order of the dataset.
+        """
+        ds = self.ds
+        if order is None:
+            order = ds.index_order[0]
+        porder = ParticleOrder(
+            ds.domain_left_edge, ds.domain_right_edge, order, ds._file_hash
+        )
+        pb = get_pbar("Sorting particles", len(self.data_files))
+        for i, data_file in enumerate(self.data_files):
+            pb.update(i)
+            for ptype, pos in self.io._yield_coordinates(data_file):
+                if hasattr(ds, "_sph_ptypes") and ptype == ds._sph_ptypes[0]:
+                    hsml = self.io._get_smoothing_length(
+                        data_file, pos.dtype, pos.shape
+                    )
+                else:
+                    hsml = None
+                porder.add(data_file.file_id, ptype, pos, hsml)
+        pb.finish()
+        porder.save(self._particle_order_filename)
+        self.particle_order = porder
+
     def _initialize_coarse_index(self):
         pb = get_pbar("Initializing coarse index ", len(self.data_files))
         for i, data_file in enumerate(self.data_files):
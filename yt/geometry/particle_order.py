@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+
+from yt.funcs import mylog
+from yt.utilities.lib.geometry_utils import get_morton_indices
+
+# Bump this whenever the layout of the sidecar file changes
+PARTICLE_ORDER_VERSION = 1
+
+
+class ParticleOrder:
+    """The Morton ordering of the particles of the data files of a dataset.
+
+    For each data file and particle type, this stores the permutation that
+    sorts the particles by the Morton index of the cell containing them (on
+    a grid of 2**order cells per dimension), the offsets of the occupied
+    cells in the sorted particles and a sphere bounding the particles of
+    each cell (including their smoothing lengths). This is enough to find
+    the particles of a data file that may be selected by a selector without
+    reading their positions.
+
+    Parameters
+    ----------
+    left_edge, right_edge : array_like
+        The edges of the domain, in code units.
+    order : int
+        The number of levels of the Morton grid.
+    file_hash : int
+        The hash of the dataset files, used to validate the sidecar file.
+    """
+
+    def __init__(self, left_edge, right_edge, order, file_hash):
+        self.left_edge = np.array(left_edge, dtype="float64")
+        self.right_edge = np.array(right_edge, dtype="float64")
+        self.order = order
+        self.file_hash = file_hash
+        self._entries = {}
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def add(self, file_id, ptype, pos, hsml=None):
+        """Compute the ordering of the particles of a given type in a data
+        file from their positions (and smoothing lengths)."""
+        if pos.shape[0] == 0:
+            return
+        nmax = 1 << self.order
+        dds = (self.right_edge - self.left_edge) / nmax
+        ind = ((pos - self.left_edge) / dds).astype("int64")
+        np.clip(ind, 0, nmax - 1, out=ind)
+        keys = get_morton_indices(ind.astype("uint64"))
+        perm = np.argsort(keys, kind="stable")
+        keys = keys[perm]
+        starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        # Bound the particles of each cell by a sphere, rather than using
+        # the cell itself, so that particles outside of the domain and
+        # smoothing lengths are accounted for.
+        spos = pos[perm].astype("float64", copy=False)
+        le = np.minimum.reduceat(spos, starts, axis=0)
+        re = np.maximum.reduceat(spos, starts, axis=0)
+        centers = 0.5 * (le + re)
+        radii = 0.5 * np.sqrt(((re - le) ** 2).sum(axis=1))
+        if hsml is not None:
+            radii += np.maximum.reduceat(hsml[perm].astype("float64"), starts)
+        offsets = np.append(starts, keys.size)
+        self._entries[file_id, ptype] = (perm, offsets, centers, radii)
+
+    def select_rows(self, selector, file_id, ptype):
+        """Return the mask of the particles of a given type in a data file
+        that may be selected by selector, or None if this data file is not
+        known."""
+        entry = self._entries.get((file_id, ptype))
+        if entry is None:
+            return None
+        perm, offsets, centers, radii = entry
+        rows = np.zeros(perm.size, dtype="bool")
+        cells = selector.select_points(
+            centers[:, 0], centers[:, 1], centers[:, 2], radii
+        )
+        if cells is not None:
+            rows[perm[np.repeat(cells, np.diff(offsets))]] = True
+        return rows
+
+    def save(self, filename):
+        """Write the ordering to disk, unless the target directory is not
+        writable."""
+        wdir = os.path.dirname(os.path.abspath(filename))
+        if not os.access(wdir, os.W_OK):
+            return
+        keys = sorted(self._entries)
+        data = {
+            "version": np.array(PARTICLE_ORDER_VERSION),
+            "file_hash": np.array(self.file_hash, dtype="int64"),
+            "order": np.array(self.order),
+            "left_edge": self.left_edge,
+            "right_edge": self.right_edge,
+            "file_ids": np.array([k[0] for k in keys], dtype="int64"),
+            "ptypes": np.array([k[1] for k in keys], dtype="str"),
+        }
+        for i, key in enumerate(keys):
+            perm, offsets, centers, radii = self._entries[key]
+            data[f"perm_{i}"] = perm
+            data[f"offsets_{i}"] = offsets
+            data[f"centers_{i}"] = centers
+            data[f"radii_{i}"] = radii
+        try:
+            with open(filename, "wb") as f:
+                np.savez(f, **data)
+        except OSError:
+            # Sometimes os mis-reports whether a directory is writable,
+            # So pass if writing the sidecar file fails.
+            pass
+
+    @classmethod
+    def load(cls, filename, left_edge, right_edge, file_hash):
+        """Read an ordering from disk, returning None if the file is missing
+        or does not match the dataset."""
+        if not os.path.exists(filename):
+            return None
+        try:
+            with np.load(filename) as data:
+                if (
+                    int(data["version"]) != PARTICLE_ORDER_VERSION
+                    or int(data["file_hash"]) != file_hash
+                    or not np.array_equal(data["left_edge"], left_edge)
+                    or not np.array_equal(data["right_edge"], right_edge)
+                ):
+                    mylog.debug("Ignoring outdated particle order %s", filename)
+                    return None
+                porder = cls(left_edge, right_edge, int(data["order"]), file_hash)
+                for i, (file_id, ptype) in enumerate(
+                    zip(data["file_ids"], data["ptypes"])
+                ):
+                    porder._entries[int(file_id), str(ptype)] = (
+                        data[f"perm_{i}"],
+                        data[f"offsets_{i}"],
+                        data[f"centers_{i}"],
+                        data[f"radii_{i}"],
+                    )
+        except (OSError, ValueError, KeyError) as e:
+            mylog.warning("Could not read particle order %s (%s)", filename, e)
+            return None
+        return porder
@@ -144,3 +144,30 @@ def test_grid_arrays_view():
     assert_equal(grid_arr["right_edge"], ds.index.grid_right_edge)
     assert_equal(grid_arr["dims"], ds.index.grid_dimensions)
     assert_equal(grid_arr["level"], ds.index.grid_levels[:, 0])
+
+
+def test_lazy_grids():
+    """The grid objects are only created when accessed"""
+    test_ds = setup_test_ds()
+    index = test_ds.index
+    assert_equal(len(index.grids.created), 0)
+
+    # Only the grid intersecting the region, and its child (to mask the
+    # refined cells), are created
+    reg = test_ds.box([0.0, 0.0, 0.0], [0.2, 0.2, 0.2])
+    reg["density"]
+    assert_equal([g.id for g in index.grids.created], [0, 1])
+    assert index.grids[0] is index.grids.created[0]
+
+    for i, grid in enumerate(index.grids):
+        assert_equal(grid.id - grid._id_offset, i)
+        assert_equal(grid.LeftEdge, index.grid_left_edge[i])
+        assert_equal(grid.RightEdge, index.grid_right_edge[i])
+        assert_equal(grid.dds, (grid.RightEdge - grid.LeftEdge) / 16)
+        assert_equal(grid.Level, index.grid_levels[i, 0])
+        for child in grid.Children:
+            assert child.Parent is grid
+    assert_equal(len(index.grids.created), index.num_grids)
+    assert_equal([g.id for g in index.grids[index.grid_levels.flat == 2]], [2, 3])
+    assert_equal(index.grids[-1].id, 5)
+    assert_raises(IndexError, index.grids.__getitem__, 6)
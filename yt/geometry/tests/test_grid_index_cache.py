@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from yt.geometry.grid_index_cache import load_grid_index, save_grid_index
+from yt.testing import assert_equal
+
+
+def test_grid_index_cache():
+    tmpdir = tempfile.mkdtemp()
+    source = os.path.join(tmpdir, "index")
+    with open(source, "w") as f:
+        f.write("grids\n")
+    cache = os.path.join(tmpdir, "index.npz")
+    arrays = {
+        "grid_left_edge": np.random.random((10, 3)),
+        "grid_levels": np.arange(10, dtype="int32"),
+        "filenames": np.array(["a", "b"] * 5),
+    }
+
+    assert load_grid_index(cache, [source]) is None
+    save_grid_index(cache, [source], arrays)
+    loaded = load_grid_index(cache, [source])
+    assert_equal(set(loaded), set(arrays))
+    for name, arr in arrays.items():
+        assert_equal(loaded[name], arr)
+        assert_equal(loaded[name].dtype, arr.dtype)
+
+    # Sources that were not recorded invalidate the cache
+    other = os.path.join(tmpdir, "other")
+    with open(other, "w") as f:
+        f.write("\n")
+    assert load_grid_index(cache, [source, other]) is None
+
+    # So do changes to the recorded sources
+    with open(source, "a") as f:
+        f.write("more grids\n")
+    assert load_grid_index(cache, [source]) is None
+    shutil.rmtree(tmpdir)
@@ -1,12 +1,15 @@
 import os
+import shutil
+import tempfile
 
 import numpy as np
 
 import yt.units.dimensions as dimensions
 from yt.geometry.oct_container import _ORDER_MAX
 from yt.geometry.particle_oct_container import ParticleBitmap, ParticleOctreeContainer
+from yt.geometry.particle_order import ParticleOrder
 from yt.geometry.selection_routines import RegionSelector
-from yt.testing import assert_array_equal, assert_equal, assert_true
+from yt.testing import assert_array_equal, assert_equal, assert_true, fake_random_ds
 from yt.units.unit_registry import UnitRegistry
 from yt.units.yt_array import YTArray
 from yt.utilities.lib.geometry_utils import (
@@ -785,3 +788,35 @@ def fake_decomp(
         pickle.dump(pos, fd)
         fd.close()
     return pos
+
+
+def test_particle_order():
+    ds = fake_random_ds(16)
+    np.random.seed(int(0x4D3D3D3))
+    pos = np.random.random((4096, 3))
+    hsml = np.random.random(4096) * 0.02
+    porder = ParticleOrder([0.0, 0.0, 0.0], [1.0, 1.0, 1.0], 3, 42)
+    porder.add(0, "io", pos, hsml)
+    porder.add(0, "stars", pos)
+    for dobj in (ds.sphere("c", 0.1), ds.region("c", [0.2] * 3, [0.4] * 3)):
+        selector = dobj.selector
+        for ptype, radii in (("io", hsml), ("stars", 0.0)):
+            rows = porder.select_rows(selector, 0, ptype)
+            mask = selector.select_points(pos[:, 0], pos[:, 1], pos[:, 2], radii)
+            # Every selected particle is a candidate, but not every particle
+            assert_true(np.all(rows[mask]))
+            assert_true(rows.sum() < rows.size)
+    assert_equal(porder.select_rows(selector, 1, "io"), None)
+
+    tmpdir = tempfile.mkdtemp()
+    fn = os.path.join(tmpdir, "test.morton.npz")
+    try:
+        porder.save(fn)
+        porder2 = ParticleOrder.load(fn, [0.0, 0.0, 0.0], [1.0, 1.0, 1.0], 42)
+        assert_array_equal(
+            porder2.select_rows(selector, 0, "io"),
+            porder.select_rows(selector, 0, "io"),
+        )
+        assert_equal(ParticleOrder.load(fn, [0.0] * 3, [1.0] * 3, 43), None)
+    finally:
+        shutil.rmtree(tmpdir)
@@ -983,6 +983,22 @@ class YTMapserverCmd(YTCommand):
             default=None,
             help="IP Address to bind on",
         ),
+        dict(
+            longname="--cache-dir",
+            action="store",
+            type=str,
+            dest="cache_dir",
+            default=None,
+            help="Directory where rendered tiles are cached",
+        ),
+        dict(
+            longname="--precompute",
+            action="store",
+            type=int,
+            dest="precompute",
+            default=-1,
+            help="Render the tiles of all zoom levels up to this one on startup",
+        ),
         dict(short="ds", nargs=1, type=str, help="The dataset to load."),
     )
 
@@ -1040,26 +1056,37 @@ class YTMapserverCmd(YTCommand):
         p.set_log("all", args.takelog)
         p.set_cmap("all", args.cmap)
 
-        PannableMapServer(p.data_source, args.field, args.takelog, args.cmap)
+        server = PannableMapServer(
+            p.data_source,
+            args.field,
+            args.takelog,
+            args.cmap,
+            cache_dir=args.cache_dir,
+        )
         try:
-            import bottle
-        except ImportError as e:
-            raise ImportError(
-                "The mapserver functionality requires the bottle "
-                "package to be installed. Please install using `pip "
-                "install bottle`."
-            ) from e
-        bottle.debug(True)
-        if args.host is not None:
-            colonpl = args.host.find(":")
-            if colonpl >= 0:
-                port = int(args.host.split(":")[-1])
-                args.host = args.host[:colonpl]
+            if args.precompute >= 0:
+                server.precompute(args.precompute)
+            try:
+                import bottle
+            except ImportError as e:
+                raise ImportError(
+                    "The mapserver functionality requires the bottle "
+                    "package to be installed. Please install using `pip "
+                    "install bottle`."
+                ) from e
+            bottle.debug(True)
+            if args.host is not None:
+                colonpl = args.host.find(":")
+                if colonpl >= 0:
+                    port = int(args.host.split(":")[-1])
+                    args.host = args.host[:colonpl]
+                else:
+                    port = 8080
+                bottle.run(server="auto", host=args.host, port=port)
             else:
-                port = 8080
-            bottle.run(server="auto", host=args.host, port=port)
-        else:
-            bottle.run(server="auto")
+                bottle.run(server="auto")
+        finally:
+            server.shutdown()
 
 
 class YTPastebinCmd(YTCommand):
@@ -335,3 +335,207 @@ def read_record(f, rspec, endian="="):
         vv[a] = vals[pos : pos + n]
         pos += n
     return vv
+
+
+class MemmapFortranFile:
+    r"""This class reads files written in Fortran-record format through a
+    memory map.
+
+    Records are returned as read-only NumPy views of the mapped file, so
+    that reading a record costs neither a system call nor a copy. The
+    offsets and sizes of all records are computed once per file (see
+    :meth:`record_offsets`), which allows random access to the records by
+    index.
+
+    The reading interface mimics the one of
+    :class:`yt.utilities.cython_fortran_utils.FortranFile`, so that this
+    class can be used in its place. Note that since the arrays returned are
+    views, they cannot be modified in place; copy them first if needed.
+
+    Parameters
+    ----------
+    fname : str
+        The file to read.
+    endian : str
+        '=' is native, '>' is big, '<' is little endian
+
+    Examples
+    --------
+
+    >>> with MemmapFortranFile("fort.3") as f:
+    ...     rv = f.read_vector("d")  # Read a float64 array
+    ...     rv = f.read_record(3, "i")  # Read the 4th record as int32
+    """
+
+    _header_size = 4
+
+    def __init__(self, fname, endian="="):
+        self.name = fname
+        self.endian = endian
+        self._header_fmt = f"{endian}i"
+        if os.path.getsize(fname) > 0:
+            self._map = np.memmap(fname, dtype="uint8", mode="r")
+        else:
+            # Empty files cannot be memory-mapped
+            self._map = np.empty(0, dtype="uint8")
+        self._pos = 0
+        self._offsets = None
+        self._sizes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def _check_open(self):
+        if self._map is None:
+            raise ValueError("I/O operation on closed file.")
+
+    def _record_size(self, pos):
+        """Return the size of the record starting at pos, checking that
+        its header and footer agree."""
+        hs = self._header_size
+        if pos + hs > self._map.size:
+            raise IOError(f"Cannot read past the end of the file {self.name}.")
+        (s1,) = struct.unpack_from(self._header_fmt, self._map, pos)
+        if s1 < 0 or pos + s1 + 2 * hs > self._map.size:
+            raise IOError(
+                "An error occured while reading a Fortran record. "
+                "Got an invalid record size %s at offset %s" % (s1, pos)
+            )
+        (s2,) = struct.unpack_from(self._header_fmt, self._map, pos + hs + s1)
+        if s1 != s2:
+            raise IOError(
+                "An error occured while reading a Fortran record. "
+                "Got a different size at the beginning and at the "
+                "end of the record: %s %s" % (s1, s2)
+            )
+        return s1
+
+    def _view(self, offset, size, dtype):
+        dtype = np.dtype(dtype)
+        if self.endian != "=":
+            dtype = dtype.newbyteorder(self.endian)
+        if size % dtype.itemsize != 0:
+            raise ValueError(
+                "Size obtained (%s) does not match with the expected "
+                "size (%s) of multi-item record" % (size, dtype.itemsize)
+            )
+        return self._map[offset : offset + size].view(dtype)
+
+    def record_offsets(self):
+        """Return the offsets (in bytes, excluding the record header) and
+        sizes (in bytes) of all the records of the file.
+
+        The table is computed on first call and reused afterwards.
+        """
+        self._check_open()
+        if self._offsets is None:
+            hs = self._header_size
+            offsets = []
+            sizes = []
+            pos = 0
+            while pos < self._map.size:
+                size = self._record_size(pos)
+                offsets.append(pos + hs)
+                sizes.append(size)
+                pos += size + 2 * hs
+            self._offsets = np.array(offsets, dtype="int64")
+            self._sizes = np.array(sizes, dtype="int64")
+        return self._offsets, self._sizes
+
+    def record_index(self, pos):
+        """Return the index of the record starting at byte offset pos (as
+        returned by :meth:`tell`)."""
+        offsets, _ = self.record_offsets()
+        i = np.searchsorted(offsets, pos + self._header_size)
+        if i == offsets.size or offsets[i] != pos + self._header_size:
+            raise ValueError(f"No record starts at offset {pos} in {self.name}.")
+        return int(i)
+
+    def read_record(self, irecord, dtype):
+        """Return a view of the irecord-th record of the file."""
+        offsets, sizes = self.record_offsets()
+        return self._view(offsets[irecord], sizes[irecord], dtype)
+
+    def read_vector(self, dtype):
+        """Read the record at the current position and return it as a
+        read-only view with the given dtype."""
+        self._check_open()
+        size = self._record_size(self._pos)
+        data = self._view(self._pos + self._header_size, size, dtype)
+        self._pos += size + 2 * self._header_size
+        return data
+
+    def read_int(self):
+        """Read a record containing a single int32 and return it."""
+        data = self.read_vector("i")
+        if data.size != 1:
+            raise ValueError(f"Expected a record of length 1, got {data.size}")
+        return int(data[0])
+
+    def read_attrs(self, attrs):
+        """Read the records according to a definition of attributes, see
+        :meth:`yt.utilities.cython_fortran_utils.FortranFile.read_attrs`."""
+        data = {}
+        for a in attrs:
+            if len(a) == 3:
+                key, n, dtype = a
+                optional = False
+            else:
+                key, n, dtype, optional = a
+            tmp = self.read_vector(dtype)
+            if len(tmp) == 0 and optional:
+                continue
+            if n == 1:
+                if len(tmp) != 1:
+                    raise ValueError(
+                        "Expected a record of length %s, got %s (%s)"
+                        % (n, len(tmp), key)
+                    )
+                data[key] = tmp[0]
+            else:
+                if len(tmp) != n and n != -1:
+                    raise ValueError(
+                        "Expected a record of length %s, got %s (%s)"
+                        % (n, len(tmp), key)
+                    )
+                if isinstance(key, tuple):
+                    for ikey in range(n):
+                        data[key[ikey]] = tmp[ikey]
+                else:
+                    data[key] = tmp
+        return data
+
+    def skip(self, n=1):
+        """Skip n records."""
+        self._check_open()
+        for _ in range(n):
+            size = self._record_size(self._pos)
+            self._pos += size + 2 * self._header_size
+        return 0
+
+    def tell(self):
+        """Return current stream position."""
+        self._check_open()
+        return self._pos
+
+    def seek(self, pos, whence=os.SEEK_SET):
+        """Change stream position, see :meth:`io.IOBase.seek`."""
+        self._check_open()
+        if whence == os.SEEK_SET:
+            self._pos = pos
+        elif whence == os.SEEK_CUR:
+            self._pos += pos
+        elif whence == os.SEEK_END:
+            self._pos = self._map.size + pos
+        else:
+            raise ValueError(f"whence argument can be 0, 1, or 2. Got {whence}")
+        return self._pos
+
+    def close(self):
+        """Release the memory map. Views previously returned remain valid."""
+        self._map = None
+        self._offsets = None
+        self._sizes = None
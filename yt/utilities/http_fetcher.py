@@ -0,0 +1,205 @@
+"""
+Pooled, concurrent and cached fetching of binary data over HTTP
+
+
+
+
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from yt.funcs import get_requests
+from yt.utilities.logger import ytLogger as mylog
+
+# The size of the pieces responses are streamed in
+CHUNK_SIZE = 2 ** 20
+
+
+class HTTPFetcher:
+    """Fetch binary arrays over HTTP.
+
+    The requests are made over a pool of keep-alive connections, several
+    of them can be issued at once, and the responses are streamed straight
+    into preallocated arrays. The responses are kept in a cache bounded by
+    their total size, so that the data read repeatedly (the particle
+    positions, when counting, indexing and reading particles) is only
+    downloaded once.
+
+    Parameters
+    ----------
+    max_connections : int, optional
+        The number of connections kept open, and of requests issued at once.
+    cache_size : int, optional
+        The maximum number of bytes of the responses kept in memory, and in
+        cache_dir. Set it to 0 to disable the cache.
+    cache_dir : str, optional
+        A directory where the responses are also stored, so that they are
+        reused across sessions.
+    """
+
+    def __init__(self, max_connections=8, cache_size=2 ** 28, cache_dir=None):
+        requests = get_requests()
+        if requests is None:
+            raise ImportError("This functionality depends on the requests package")
+        self.max_connections = max(int(max_connections), 1)
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.max_connections, pool_maxsize=self.max_connections
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.total_bytes = 0
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, url, dtype="uint8", byte_range=None):
+        """Returns the array held by url, or by its bytes from byte_range[0]
+        up to (but not including) byte_range[1]. The array is shared with the
+        cache, and should not be modified."""
+        key = (url, byte_range)
+        data = self._get(key)
+        if data is None and byte_range is not None:
+            # The range may be cut from the whole response
+            data = self._get((url, None))
+            if data is not None:
+                return data[byte_range[0] : byte_range[1]].view(dtype)
+        if data is None:
+            data = self._read_cache_file(key)
+        if data is None:
+            data, ranged = self._download(url, byte_range)
+            if not ranged:
+                # The server ignored the range, so the whole response is
+                # kept for the other ranges of url
+                key = (url, None)
+            self._write_cache_file(key, data)
+        data.flags.writeable = False
+        self._add(key, data)
+        if key[1] is None and byte_range is not None:
+            data = data[byte_range[0] : byte_range[1]]
+        return data.view(dtype)
+
+    def fetch_many(self, urls, dtype="uint8", byte_ranges=None):
+        """Returns the arrays of several urls (and byte ranges), which are
+        fetched concurrently."""
+        if byte_ranges is None:
+            byte_ranges = [None] * len(urls)
+        if len(urls) < 2:
+            return [self.fetch(u, dtype, r) for u, r in zip(urls, byte_ranges)]
+        workers = min(self.max_connections, len(urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.fetch, u, dtype, r)
+                for u, r in zip(urls, byte_ranges)
+            ]
+            return [future.result() for future in futures]
+
+    def get_size(self, url):
+        """Returns the size in bytes of the file held by url."""
+        resp = self.session.head(url, allow_redirects=True)
+        if resp.status_code != 200 or "Content-Length" not in resp.headers:
+            raise RuntimeError(
+                "Could not get the size of %s (status %s)" % (url, resp.status_code)
+            )
+        return int(resp.headers["Content-Length"])
+
+    def _download(self, url, byte_range):
+        # Returns the response, and whether it only holds the range
+        headers = {}
+        if byte_range is not None:
+            headers["Range"] = "bytes=%d-%d" % (byte_range[0], byte_range[1] - 1)
+        mylog.debug("Loading URL %s (%s)", url, headers.get("Range", "all"))
+        with self.session.get(url, headers=headers, stream=True) as resp:
+            if resp.status_code not in (200, 206):
+                raise RuntimeError(
+                    "Could not fetch %s (status %s)" % (url, resp.status_code)
+                )
+            size = resp.headers.get("Content-Length")
+            if size is not None:
+                data = np.empty(int(size), dtype="uint8")
+                ind = 0
+                for chunk in resp.iter_content(CHUNK_SIZE):
+                    data[ind : ind + len(chunk)] = np.frombuffer(chunk, "uint8")
+                    ind += len(chunk)
+                if ind != data.size:
+                    raise RuntimeError(
+                        "Expected %s bytes from %s, got %s" % (data.size, url, ind)
+                    )
+            else:
+                data = np.frombuffer(bytearray(resp.content), dtype="uint8")
+        with self._lock:
+            self.total_bytes += data.size
+        return data, byte_range is not None and resp.status_code == 206
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def _add(self, key, data):
+        if data.size > self.cache_size:
+            return
+        with self._lock:
+            if key not in self._cache:
+                self._cache_bytes += data.size
+            self._cache[key] = data
+            while self._cache_bytes > self.cache_size:
+                _, old = self._cache.popitem(last=False)
+                self._cache_bytes -= old.size
+
+    def _cache_filename(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest)
+
+    def _read_cache_file(self, key):
+        if self.cache_dir is None:
+            return None
+        fn = self._cache_filename(key)
+        try:
+            data = np.fromfile(fn, dtype="uint8")
+        except OSError:
+            return None
+        # Recently used files are the last to be pruned
+        os.utime(fn)
+        return data
+
+    def _write_cache_file(self, key, data):
+        if self.cache_dir is None or data.size > self.cache_size:
+            return
+        fn = self._cache_filename(key)
+        tmp = f"{fn}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            data.tofile(tmp)
+            os.replace(tmp, fn)
+        except OSError:
+            return
+        self._prune_cache_dir()
+
+    def _prune_cache_dir(self):
+        # The least recently used files are removed until the directory
+        # fits in the cache size
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.cache_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
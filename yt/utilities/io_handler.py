@@ -1,5 +1,5 @@
 import os
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from contextlib import contextmanager
 from functools import _make_key, lru_cache
 
@@ -19,6 +19,117 @@ def _make_io_key(args, *_args, **kwargs):
     return _make_key((obj.id, field), *_args, **kwargs)
 
 
+def _selection_runs(mask, min_gap):
+    # Return the (start, stop) pairs of the runs of selected elements of
+    # mask, merging runs separated by fewer than min_gap elements
+    edges = np.diff(np.concatenate([[0], mask.view("int8"), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    if starts.size > 1:
+        keep = np.concatenate([[True], starts[1:] - stops[:-1] >= min_gap])
+        starts = starts[keep]
+        stops = stops[np.concatenate([keep[1:], [True]])]
+    return starts, stops
+
+
+def index_runs(indices, min_gap=1, max_size=None):
+    """Group on-disk indices (of blocks, boxes, rows...) into runs that are
+    each read with a single hyperslab read.
+
+    Indices separated by fewer than min_gap are read in the same run, along
+    with those in between, and runs are split to span at most max_size
+    indices.
+
+    Parameters
+    ----------
+    indices : array of int
+        The unique indices to read, in any order.
+    min_gap : int, optional
+        The smallest gap between two runs.
+    max_size : int, optional
+        The largest number of indices a run spans.
+
+    Returns
+    -------
+    A list of (start, stop, positions) tuples, where the run covers the
+    indices from start up to (but not including) stop, and positions are
+    the positions in indices of those it holds, sorted by index.
+    """
+    indices = np.asarray(indices, dtype="int64")
+    if indices.size == 0:
+        return []
+    order = np.argsort(indices, kind="stable")
+    sorted_inds = indices[order]
+    first = sorted_inds[0]
+    mask = np.zeros(sorted_inds[-1] - first + 1, dtype="bool")
+    mask[sorted_inds - first] = True
+    starts, stops = _selection_runs(mask, min_gap)
+    starts += first
+    stops += first
+    if max_size is not None:
+        splits = [np.arange(i0, i1, max_size) for i0, i1 in zip(starts, stops)]
+        stops = np.minimum(
+            np.concatenate(splits) + max_size,
+            np.repeat(stops, [s.size for s in splits]),
+        )
+        starts = np.concatenate(splits)
+    runs = []
+    lefts = np.searchsorted(sorted_inds, starts)
+    rights = np.searchsorted(sorted_inds, stops)
+    for left, right in zip(lefts, rights):
+        if left == right:
+            continue
+        runs.append((sorted_inds[left], sorted_inds[right - 1] + 1, order[left:right]))
+    return runs
+
+
+def read_masked_rows(
+    dset,
+    start,
+    end,
+    mask,
+    column=None,
+    max_fraction=0.25,
+    max_reads=128,
+    min_gap=512,
+):
+    """Read the rows of dset[start:end] selected by a boolean mask.
+
+    Rather than reading the whole range and masking it, the selected rows
+    are read with one hyperslab read per run of selected rows (runs closer
+    than min_gap rows are read together). The whole range is read instead
+    if this would need more than max_reads reads or cover more than
+    max_fraction of the range.
+
+    Parameters
+    ----------
+    dset : h5py.Dataset
+        The dataset to read from.
+    start, end : int
+        The range of rows the mask applies to.
+    mask : array of bool or slice
+        The selected rows, relative to start.
+    column : int, optional
+        If given, only read this column of a 2D dataset.
+    """
+    if column is None:
+        cols = (Ellipsis,)
+    else:
+        cols = (column,)
+    if not isinstance(mask, np.ndarray):
+        return dset[(slice(start, end),) + cols][mask]
+    starts, stops = _selection_runs(mask, min_gap)
+    if starts.size > max_reads or (stops - starts).sum() > max_fraction * mask.size:
+        return dset[(slice(start, end),) + cols][mask]
+    pieces = [
+        dset[(slice(start + i0, start + i1),) + cols][mask[i0:i1]]
+        for i0, i1 in zip(starts, stops)
+    ]
+    if len(pieces) == 0:
+        return dset[(slice(start, start),) + cols]
+    return np.concatenate(pieces)
+
+
 class BaseIOHandler:
     _vector_fields = ()
     _dataset_type = None
@@ -26,6 +137,8 @@ class BaseIOHandler:
     _cache_on = False
     _misses = 0
     _hits = 0
+    # Maximum memory used by the cached particle selection masks, in bytes
+    _max_particle_mask_bytes = 64 * 1024 ** 2
 
     def __init_subclass__(cls, *args, **kwargs):
         super().__init_subclass__(*args, **kwargs)
@@ -43,6 +156,8 @@ class BaseIOHandler:
         self._last_selector_counts = None
         self._array_fields = {}
         self._cached_fields = {}
+        self._particle_masks = OrderedDict()
+        self._particle_mask_bytes = 0
         # Make sure _vector_fields is a dict of fields and their dimension
         # and assume all non-specified vector fields are 3D
         if not isinstance(self._vector_fields, dict):
@@ -156,6 +271,58 @@ class BaseIOHandler:
             psize[ptype] += selector.count_points(x, y, z, 0.0)
         return psize
 
+    def _get_particle_mask(self, selector, data_file, ptype, read_positions):
+        """Return the mask of the particles of a given type in a data file
+        selected by selector, or None if none of them is selected.
+
+        Masks are cached (up to _max_particle_mask_bytes), so that the
+        particle positions are only read once for the counting and reading
+        passes of a selection, and for subsequent reads with the same
+        selector. read_positions is only called on a cache miss and must
+        return the (N, 3) particle positions and their smoothing lengths
+        (or 0 for point particles). If the particles of the index have been
+        sorted, it is passed the mask of the rows to read, so that only the
+        particles close to the selection are read.
+        """
+        try:
+            key = (
+                type(selector).__name__,
+                hash(selector),
+                data_file.filename,
+                data_file.start,
+                data_file.end,
+                ptype,
+            )
+        except NotImplementedError:
+            key = None
+        if key in self._particle_masks:
+            self._particle_masks.move_to_end(key)
+            return self._particle_masks[key]
+        rows = None
+        porder = getattr(self.ds._instantiated_index, "particle_order", None)
+        if porder is not None:
+            rows = porder.select_rows(selector, data_file.file_id, ptype)
+        if rows is None:
+            pos, hsml = read_positions()
+            mask = selector.select_points(pos[:, 0], pos[:, 1], pos[:, 2], hsml)
+        elif not rows.any():
+            mask = None
+        else:
+            pos, hsml = read_positions(rows)
+            sub_mask = selector.select_points(pos[:, 0], pos[:, 1], pos[:, 2], hsml)
+            mask = None
+            if sub_mask is not None:
+                mask = np.zeros(rows.size, dtype="bool")
+                mask[np.flatnonzero(rows)[sub_mask]] = True
+        if key is None:
+            return mask
+        self._particle_masks[key] = mask
+        self._particle_mask_bytes += getattr(mask, "nbytes", 0)
+        while self._particle_mask_bytes > self._max_particle_mask_bytes:
+            _, old_mask = self._particle_masks.popitem(last=False)
+            self._particle_mask_bytes -= getattr(old_mask, "nbytes", 0)
+        return mask
+
     def _read_particle_selection(self, chunks, selector, fields):
         rv = {}
         ind = {}
@@ -648,6 +648,21 @@ cdef class Node:
         assert(self.point_in_node(point))
         return self._find_node(point)
 
+    def find_node_ids(self,
+                      np.float64_t[:, :] points):
+        """
+        Find the ids of the AMRKDTree nodes enclosing an array of positions
+        """
+        cdef Py_ssize_t i
+        cdef Node node
+        cdef np.ndarray[np.int64_t, ndim=1] node_ids
+        node_ids = np.empty(points.shape[0], dtype="int64")
+        for i in range(points.shape[0]):
+            assert(self.point_in_node(points[i]))
+            node = self._find_node(points[i])
+            node_ids[i] = node.node_id
+        return node_ids
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.cdivision(True)
@@ -54,7 +54,7 @@ cdef int set_axes_range(axes_range *axes, int skipaxis):
 @cython.wraparound(False)
 @cython.cdivision(True)
 def generate_smoothing_length(np.float64_t[:, ::1] tree_positions,
-                              PyKDTree kdtree, int n_neighbors):
+                              PyKDTree kdtree, int n_neighbors, pbar=True):
     """Calculate array of distances to the nth nearest neighbor
 
     Parameters
@@ -66,6 +66,8 @@ def generate_smoothing_length(np.float64_t[:, ::1] tree_positions,
     kdtree: A PyKDTree instance
         A kdtree to do nearest neighbors searches with
     n_neighbors: The neighbor number to calculate the distance to
+    pbar: Whether to show a progress bar. Pass None when the calls are
+        reported by a progress bar of the caller.
 
     Returns
     -------
@@ -86,7 +88,8 @@ def generate_smoothing_length(np.float64_t[:, ::1] tree_positions,
     cdef axes_range axes
     set_axes_range(&axes, -1)
 
-    pbar = get_pbar("Generate smoothing length", n_particles)
+    if pbar:
+        pbar = get_pbar("Generate smoothing length", n_particles)
     with nogil:
         for i in range(n_particles):
             # Reset queue to "empty" state, doing it this way avoids
@@ -95,7 +98,8 @@ def generate_smoothing_length(np.float64_t[:, ::1] tree_positions,
 
             if i % CHUNKSIZE == 0:
                 with gil:
-                    pbar.update(i-1)
+                    if pbar:
+                        pbar.update(i-1)
                     PyErr_CheckSignals()
 
             pos = &(tree_positions[i, 0])
@@ -103,8 +107,9 @@ def generate_smoothing_length(np.float64_t[:, ::1] tree_positions,
 
             smoothing_length[i] = sqrt(queue.heap_ptr[0])
 
-    pbar.update(n_particles-1)
-    pbar.finish()
+    if pbar:
+        pbar.update(n_particles-1)
+        pbar.finish()
     return np.asarray(smoothing_length)
 
 @cython.boundscheck(False)
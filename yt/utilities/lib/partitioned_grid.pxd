@@ -25,6 +25,14 @@ cdef class PartitionedGrid:
     cdef np.float64_t star_er
     cdef np.float64_t star_sigma_num
     cdef np.float64_t star_coeff
+    cdef np.int64_t advance_streamline(self, np.float64_t *stream,
+                                       np.float64_t *mag,
+                                       np.int64_t n_steps, np.int64_t step,
+                                       np.float64_t h,
+                                       np.float64_t *domain_left_edge,
+                                       np.float64_t *domain_right_edge) nogil
+    cdef void step_streamline(self, np.float64_t pos[3], np.float64_t h,
+                              np.float64_t *mag, int get_mag) nogil
     cdef void get_vector_field(self, np.float64_t pos[3],
-                               np.float64_t *vel, np.float64_t *vel_mag)
+                               np.float64_t *vel, np.float64_t *vel_mag) nogil
 
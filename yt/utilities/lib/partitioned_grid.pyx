@@ -2,8 +2,8 @@
 # distutils: include_dirs = LIB_DIR
 # distutils: libraries = STD_LIBS
 # distutils: language = c++
-# distutils: extra_compile_args = CPP14_FLAG
-# distutils: extra_link_args = CPP14_FLAG
+# distutils: extra_compile_args = CPP14_FLAG OMP_ARGS
+# distutils: extra_link_args = CPP14_FLAG OMP_ARGS
 """
 Image sampler definitions
 
@@ -16,6 +16,8 @@ import numpy as np
 
 cimport cython
 cimport numpy as np
+from cython.parallel cimport parallel, prange
+from libc.math cimport sqrt
 from libc.stdlib cimport abs, calloc, free, malloc
 
 from .fixed_interpolator cimport offset_interpolate
@@ -74,6 +76,107 @@ cdef class PartitionedGrid:
     @cython.wraparound(False)
     @cython.cdivision(True)
     def integrate_streamline(self, pos, np.float64_t h, mag):
+        cdef np.float64_t cmag[1]
+        cdef np.float64_t newpos[3]
+        cdef int i
+        for i in range(3):
+            newpos[i] = pos[i]
+        self.step_streamline(newpos, h, cmag, mag is not None)
+        for i in range(3):
+            pos[i] = newpos[i]
+        if mag is not None:
+            mag[0] = cmag[0]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    def integrate_streamlines(self,
+                              np.float64_t[:, :, ::1] streams,
+                              np.float64_t[:, ::1] mags,
+                              np.int64_t[::1] seeds,
+                              np.int64_t[::1] steps,
+                              np.float64_t h,
+                              np.float64_t[::1] domain_left_edge,
+                              np.float64_t[::1] domain_right_edge,
+                              int num_threads = 0):
+        """Advance a batch of streamlines through this brick.
+
+        Each streamline is integrated, one step of size h at a time, until
+        it leaves the brick or the domain or until it is complete. The
+        number of steps left for each streamline (zero if it left the
+        domain) is updated in steps.
+
+        Parameters
+        ----------
+        streams : array of floats with shape (n_streamlines, n_steps, 3)
+            The positions along the streamlines.
+        mags : array of floats with shape (n_streamlines, n_steps), or None
+            The magnitude of the vector field along the streamlines.
+        seeds : array of ints
+            The indices of the streamlines that start in this brick.
+        steps : array of ints with shape (n_streamlines, )
+            The number of steps left for each streamline, such that the
+            current position of streamline i is streams[i, -steps[i]].
+        h : float
+            The step size.
+        domain_left_edge, domain_right_edge : arrays of floats
+            The edges of the domain.
+        num_threads : int, optional
+            The number of threads to use.
+        """
+        cdef Py_ssize_t j
+        cdef np.int64_t k
+        cdef np.int64_t n_steps = streams.shape[1]
+        cdef int get_mag = mags is not None
+        with nogil, parallel(num_threads = num_threads):
+            for j in prange(seeds.shape[0], schedule="dynamic"):
+                k = seeds[j]
+                steps[k] = self.advance_streamline(
+                    &streams[k, 0, 0], &mags[k, 0] if get_mag else NULL,
+                    n_steps, steps[k], h,
+                    &domain_left_edge[0], &domain_right_edge[0])
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef np.int64_t advance_streamline(self, np.float64_t *stream,
+                                       np.float64_t *mag,
+                                       np.int64_t n_steps, np.int64_t step,
+                                       np.float64_t h,
+                                       np.float64_t *domain_left_edge,
+                                       np.float64_t *domain_right_edge) nogil:
+        cdef np.float64_t pos[3]
+        cdef np.float64_t cmag[1]
+        cdef np.int64_t row
+        cdef int i, outside
+        cdef VolumeContainer *c = self.container
+        while step > 1:
+            row = n_steps - step + 1
+            for i in range(3):
+                pos[i] = stream[3 * (row - 1) + i]
+            self.step_streamline(pos, h, cmag, mag != NULL)
+            for i in range(3):
+                stream[3 * row + i] = pos[i]
+            if mag != NULL:
+                mag[row] = cmag[0]
+            outside = 0
+            for i in range(3):
+                if pos[i] < domain_left_edge[i] or pos[i] >= domain_right_edge[i]:
+                    return 0
+                if pos[i] < c.left_edge[i] or pos[i] >= c.right_edge[i]:
+                    outside = 1
+            if outside:
+                return step - 1
+            step -= 1
+        return step
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void step_streamline(self, np.float64_t pos[3], np.float64_t h,
+                              np.float64_t *mag, int get_mag) nogil:
+        # Advance pos by one fourth-order Runge-Kutta step, stopping early if
+        # an intermediate position leaves the brick
         cdef np.float64_t cmag[1]
         cdef np.float64_t k1[3]
         cdef np.float64_t k2[3]
@@ -81,17 +184,18 @@ cdef class PartitionedGrid:
         cdef np.float64_t k4[3]
         cdef np.float64_t newpos[3]
         cdef np.float64_t oldpos[3]
+        cdef VolumeContainer *c = self.container
+        cdef int i
         for i in range(3):
             newpos[i] = oldpos[i] = pos[i]
         self.get_vector_field(newpos, k1, cmag)
         for i in range(3):
             newpos[i] = oldpos[i] + 0.5*k1[i]*h
 
-        if not (self.LeftEdge[0] < newpos[0] and newpos[0] < self.RightEdge[0] and \
-                self.LeftEdge[1] < newpos[1] and newpos[1] < self.RightEdge[1] and \
-                self.LeftEdge[2] < newpos[2] and newpos[2] < self.RightEdge[2]):
-            if mag is not None:
-                mag[0] = cmag[0]
+        if not (c.left_edge[0] < newpos[0] and newpos[0] < c.right_edge[0] and \
+                c.left_edge[1] < newpos[1] and newpos[1] < c.right_edge[1] and \
+                c.left_edge[2] < newpos[2] and newpos[2] < c.right_edge[2]):
+            mag[0] = cmag[0]
             for i in range(3):
                 pos[i] = newpos[i]
             return
@@ -100,11 +204,10 @@ cdef class PartitionedGrid:
         for i in range(3):
             newpos[i] = oldpos[i] + 0.5*k2[i]*h
 
-        if not (self.LeftEdge[0] <= newpos[0] and newpos[0] <= self.RightEdge[0] and \
-                self.LeftEdge[1] <= newpos[1] and newpos[1] <= self.RightEdge[1] and \
-                self.LeftEdge[2] <= newpos[2] and newpos[2] <= self.RightEdge[2]):
-            if mag is not None:
-                mag[0] = cmag[0]
+        if not (c.left_edge[0] <= newpos[0] and newpos[0] <= c.right_edge[0] and \
+                c.left_edge[1] <= newpos[1] and newpos[1] <= c.right_edge[1] and \
+                c.left_edge[2] <= newpos[2] and newpos[2] <= c.right_edge[2]):
+            mag[0] = cmag[0]
             for i in range(3):
                 pos[i] = newpos[i]
             return
@@ -113,11 +216,10 @@ cdef class PartitionedGrid:
         for i in range(3):
             newpos[i] = oldpos[i] + k3[i]*h
 
-        if not (self.LeftEdge[0] <= newpos[0] and newpos[0] <= self.RightEdge[0] and \
-                self.LeftEdge[1] <= newpos[1] and newpos[1] <= self.RightEdge[1] and \
-                self.LeftEdge[2] <= newpos[2] and newpos[2] <= self.RightEdge[2]):
-            if mag is not None:
-                mag[0] = cmag[0]
+        if not (c.left_edge[0] <= newpos[0] and newpos[0] <= c.right_edge[0] and \
+                c.left_edge[1] <= newpos[1] and newpos[1] <= c.right_edge[1] and \
+                c.left_edge[2] <= newpos[2] and newpos[2] <= c.right_edge[2]):
+            mag[0] = cmag[0]
             for i in range(3):
                 pos[i] = newpos[i]
             return
@@ -127,24 +229,24 @@ cdef class PartitionedGrid:
         for i in range(3):
             pos[i] = oldpos[i] + h*(k1[i]/6.0 + k2[i]/3.0 + k3[i]/3.0 + k4[i]/6.0)
 
-        if mag is not None:
+        if get_mag:
             for i in range(3):
                 newpos[i] = pos[i]
             self.get_vector_field(newpos, k4, cmag)
-            mag[0] = cmag[0]
+        mag[0] = cmag[0]
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.cdivision(True)
     cdef void get_vector_field(self, np.float64_t pos[3],
-                               np.float64_t *vel, np.float64_t *vel_mag):
+                               np.float64_t *vel, np.float64_t *vel_mag) nogil:
         cdef np.float64_t dp[3]
         cdef int ci[3]
         cdef VolumeContainer *c = self.container # convenience
 
         for i in range(3):
-            ci[i] = (int)((pos[i]-self.LeftEdge[i])/c.dds[i])
-            dp[i] = (pos[i] - ci[i]*c.dds[i] - self.LeftEdge[i])/c.dds[i]
+            ci[i] = (int)((pos[i]-c.left_edge[i])/c.dds[i])
+            dp[i] = (pos[i] - ci[i]*c.dds[i] - c.left_edge[i])/c.dds[i]
 
         cdef int offset = ci[0] * (c.dims[1] + 1) * (c.dims[2] + 1) \
                           + ci[1] * (c.dims[2] + 1) + ci[2]
@@ -153,7 +255,7 @@ cdef class PartitionedGrid:
         for i in range(3):
             vel[i] = offset_interpolate(c.dims, dp, c.data[i] + offset)
             vel_mag[0] += vel[i]*vel[i]
-        vel_mag[0] = np.sqrt(vel_mag[0])
+        vel_mag[0] = sqrt(vel_mag[0])
         if vel_mag[0] != 0.0:
             for i in range(3):
                 vel[i] /= vel_mag[0]
@@ -98,36 +98,103 @@ def pixelize_cartesian(np.float64_t[:,:] buff,
                        np.float64_t line_width = 0.0):
     cdef np.float64_t x_min, x_max, y_min, y_max
     cdef np.float64_t period_x = 0.0, period_y = 0.0
+    x_min = bounds[0]
+    x_max = bounds[1]
+    y_min = bounds[2]
+    y_max = bounds[3]
+    if period is not None:
+        period_x = period[0]
+        period_y = period[1]
+    if px.shape[0] != py.shape[0] or \
+       px.shape[0] != pdx.shape[0] or \
+       px.shape[0] != pdy.shape[0] or \
+       px.shape[0] != data.shape[0]:
+        raise YTPixelizeError("Arrays are not of correct shape.")
+    # The image is pixelized as a single field
+    with nogil:
+        _pixelize_cartesian_cells(buff[:, :, None], px, py, pdx, pdy,
+                                  data[:, None], x_min, x_max, y_min, y_max,
+                                  antialias, period_x, period_y,
+                                  check_period, line_width)
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def pixelize_cartesian_multi(np.float64_t[:,:,::1] buff,
+                             np.float64_t[:] px,
+                             np.float64_t[:] py,
+                             np.float64_t[:] pdx,
+                             np.float64_t[:] pdy,
+                             np.float64_t[:,::1] data,
+                             bounds,
+                             int antialias = 1,
+                             period = None,
+                             int check_period = 1):
+    # This is pixelize_cartesian for several fields at once: buff has shape
+    # (ny, nx, nfields) and data has shape (ncells, nfields).  The overlap
+    # of each cell with the pixels is computed once and used for all the
+    # fields, and each image is identical to the one pixelize_cartesian
+    # would give.
+    cdef np.float64_t x_min, x_max, y_min, y_max
+    cdef np.float64_t period_x = 0.0, period_y = 0.0
+    x_min = bounds[0]
+    x_max = bounds[1]
+    y_min = bounds[2]
+    y_max = bounds[3]
+    if period is not None:
+        period_x = period[0]
+        period_y = period[1]
+    if px.shape[0] != py.shape[0] or \
+       px.shape[0] != pdx.shape[0] or \
+       px.shape[0] != pdy.shape[0] or \
+       px.shape[0] != data.shape[0] or \
+       buff.shape[2] != data.shape[1]:
+        raise YTPixelizeError("Arrays are not of correct shape.")
+    with nogil:
+        _pixelize_cartesian_cells(buff, px, py, pdx, pdy, data, x_min,
+                                  x_max, y_min, y_max, antialias, period_x,
+                                  period_y, check_period, 0.0)
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _pixelize_cartesian_cells(np.float64_t[:,:,:] buff,
+                                           np.float64_t[:] px,
+                                           np.float64_t[:] py,
+                                           np.float64_t[:] pdx,
+                                           np.float64_t[:] pdy,
+                                           np.float64_t[:,:] data,
+                                           np.float64_t x_min,
+                                           np.float64_t x_max,
+                                           np.float64_t y_min,
+                                           np.float64_t y_max,
+                                           int antialias,
+                                           np.float64_t period_x,
+                                           np.float64_t period_y,
+                                           int check_period,
+                                           np.float64_t line_width) nogil:
+    # Deposit the cells into buff, of shape (ny, nx, nfields), from data, of
+    # shape (ncells, nfields).  This is the kernel of pixelize_cartesian and
+    # pixelize_cartesian_multi.
     cdef np.float64_t width, height, px_dx, px_dy, ipx_dx, ipx_dy
     cdef np.float64_t ld_x, ld_y, cx, cy
-    cdef int i, j, p, xi, yi
+    cdef int i, j, p, f, xi, yi, nf
     cdef int lc, lr, rc, rr
     cdef np.float64_t lypx, rypx, lxpx, rxpx, overlap1, overlap2
     # These are the temp vars we get from the arrays
-    cdef np.float64_t oxsp, oysp, xsp, ysp, dxsp, dysp, dsp
+    cdef np.float64_t oxsp, oysp, xsp, ysp, dxsp, dysp
     # Some periodicity helpers
     cdef int xiter[2]
     cdef int yiter[2]
     cdef np.float64_t xiterv[2]
     cdef np.float64_t yiterv[2]
-    if period is not None:
-        period_x = period[0]
-        period_y = period[1]
-    x_min = bounds[0]
-    x_max = bounds[1]
-    y_min = bounds[2]
-    y_max = bounds[3]
     width = x_max - x_min
     height = y_max - y_min
     px_dx = width / (<np.float64_t> buff.shape[1])
     px_dy = height / (<np.float64_t> buff.shape[0])
     ipx_dx = 1.0 / px_dx
     ipx_dy = 1.0 / px_dy
-    if px.shape[0] != py.shape[0] or \
-       px.shape[0] != pdx.shape[0] or \
-       px.shape[0] != pdy.shape[0] or \
-       px.shape[0] != data.shape[0]:
-        raise YTPixelizeError("Arrays are not of correct shape.")
+    nf = buff.shape[2]
     xiter[0] = yiter[0] = 0
     xiterv[0] = yiterv[0] = 0.0
     # Here's a basic outline of what we're going to do here.  The xiter and
@@ -173,92 +240,93 @@ def pixelize_cartesian(np.float64_t[:,:] buff,
     #   So what we want here is to fill an array such that we fill:
     #       first axis : y_min .. y_max
     #       second axis: x_min .. x_max
-    with nogil:
-        for p in range(px.shape[0]):
-            xiter[1] = yiter[1] = 999
-            xiterv[1] = yiterv[1] = 0.0
-            oxsp = px[p]
-            oysp = py[p]
-            dxsp = pdx[p]
-            dysp = pdy[p]
-            dsp = data[p]
-            if check_period == 1:
-                if (oxsp - dxsp < x_min):
-                    xiter[1] = +1
-                    xiterv[1] = period_x
-                elif (oxsp + dxsp > x_max):
-                    xiter[1] = -1
-                    xiterv[1] = -period_x
-                if (oysp - dysp < y_min):
-                    yiter[1] = +1
-                    yiterv[1] = period_y
-                elif (oysp + dysp > y_max):
-                    yiter[1] = -1
-                    yiterv[1] = -period_y
-            overlap1 = overlap2 = 1.0
-            for xi in range(2):
-                if xiter[xi] == 999: continue
-                xsp = oxsp + xiterv[xi]
-                if (xsp + dxsp < x_min) or (xsp - dxsp > x_max): continue
-                for yi in range(2):
-                    if yiter[yi] == 999: continue
-                    ysp = oysp + yiterv[yi]
-                    if (ysp + dysp < y_min) or (ysp - dysp > y_max): continue
-                    lc = <int> fmax(((xsp-dxsp-x_min)*ipx_dx),0)
-                    lr = <int> fmax(((ysp-dysp-y_min)*ipx_dy),0)
-                    # NOTE: This is a different way of doing it than in the C
-                    # routines.  In C, we were implicitly casting the
-                    # initialization to int, but *not* the conditional, which
-                    # was allowed an extra value:
-                    #     for(j=lc;j<rc;j++)
-                    # here, when assigning lc (double) to j (int) it got
-                    # truncated, but no similar truncation was done in the
-                    # comparison of j to rc (double).  So give ourselves a
-                    # bonus row and bonus column here.
-                    rc = <int> fmin(((xsp+dxsp-x_min)*ipx_dx + 1), buff.shape[1])
-                    rr = <int> fmin(((ysp+dysp-y_min)*ipx_dy + 1), buff.shape[0])
-                    # Note that we're iterating here over *y* in the i
-                    # direction.  See the note above about this.
-                    for i in range(lr, rr):
-                        lypx = px_dy * i + y_min
-                        rypx = px_dy * (i+1) + y_min
-                        if antialias == 1:
-                            overlap2 = ((fmin(rypx, ysp+dysp)
-                                       - fmax(lypx, (ysp-dysp)))*ipx_dy)
-                        if overlap2 < 0.0: continue
-                        for j in range(lc, rc):
-                            lxpx = px_dx * j + x_min
-                            rxpx = px_dx * (j+1) + x_min
-                            if line_width > 0:
-                                # Here, we figure out if we're within
-                                # line_width*px_dx of the cell edge
-                                # Midpoint of x:
-                                cx = (rxpx+lxpx)*0.5
-                                ld_x = fmin(fabs(cx - (xsp+dxsp)),
-                                            fabs(cx - (xsp-dxsp)))
-                                ld_x *= ipx_dx
-                                # Midpoint of y:
-                                cy = (rypx+lypx)*0.5
-                                ld_y = fmin(fabs(cy - (ysp+dysp)),
-                                            fabs(cy - (ysp-dysp)))
-                                ld_y *= ipx_dy
-                                if ld_x <= line_width or ld_y <= line_width:
-                                    buff[i,j] = 1.0
-                            elif antialias == 1:
-                                overlap1 = ((fmin(rxpx, xsp+dxsp)
-                                           - fmax(lxpx, (xsp-dxsp)))*ipx_dx)
-                                if overlap1 < 0.0: continue
-                                # This next line is not commented out because
-                                # it's an oddity; we actually want to skip
-                                # depositing if the overlap is zero, and that's
-                                # how it used to work when we were more
-                                # conservative about the iteration indices.
-                                # This will reduce artifacts if we ever move to
-                                # compositing instead of replacing bitmaps.
-                                if overlap1 * overlap2 < 1.e-6: continue
-                                buff[i,j] += (dsp * overlap1) * overlap2
-                            else:
-                                buff[i,j] = dsp
+    for p in range(px.shape[0]):
+        xiter[1] = yiter[1] = 999
+        xiterv[1] = yiterv[1] = 0.0
+        oxsp = px[p]
+        oysp = py[p]
+        dxsp = pdx[p]
+        dysp = pdy[p]
+        if check_period == 1:
+            if (oxsp - dxsp < x_min):
+                xiter[1] = +1
+                xiterv[1] = period_x
+            elif (oxsp + dxsp > x_max):
+                xiter[1] = -1
+                xiterv[1] = -period_x
+            if (oysp - dysp < y_min):
+                yiter[1] = +1
+                yiterv[1] = period_y
+            elif (oysp + dysp > y_max):
+                yiter[1] = -1
+                yiterv[1] = -period_y
+        overlap1 = overlap2 = 1.0
+        for xi in range(2):
+            if xiter[xi] == 999: continue
+            xsp = oxsp + xiterv[xi]
+            if (xsp + dxsp < x_min) or (xsp - dxsp > x_max): continue
+            for yi in range(2):
+                if yiter[yi] == 999: continue
+                ysp = oysp + yiterv[yi]
+                if (ysp + dysp < y_min) or (ysp - dysp > y_max): continue
+                lc = <int> fmax(((xsp-dxsp-x_min)*ipx_dx),0)
+                lr = <int> fmax(((ysp-dysp-y_min)*ipx_dy),0)
+                # NOTE: This is a different way of doing it than in the C
+                # routines.  In C, we were implicitly casting the
+                # initialization to int, but *not* the conditional, which
+                # was allowed an extra value:
+                #     for(j=lc;j<rc;j++)
+                # here, when assigning lc (double) to j (int) it got
+                # truncated, but no similar truncation was done in the
+                # comparison of j to rc (double).  So give ourselves a
+                # bonus row and bonus column here.
+                rc = <int> fmin(((xsp+dxsp-x_min)*ipx_dx + 1), buff.shape[1])
+                rr = <int> fmin(((ysp+dysp-y_min)*ipx_dy + 1), buff.shape[0])
+                # Note that we're iterating here over *y* in the i
+                # direction.  See the note above about this.
+                for i in range(lr, rr):
+                    lypx = px_dy * i + y_min
+                    rypx = px_dy * (i+1) + y_min
+                    if antialias == 1:
+                        overlap2 = ((fmin(rypx, ysp+dysp)
+                                   - fmax(lypx, (ysp-dysp)))*ipx_dy)
+                    if overlap2 < 0.0: continue
+                    for j in range(lc, rc):
+                        lxpx = px_dx * j + x_min
+                        rxpx = px_dx * (j+1) + x_min
+                        if line_width > 0:
+                            # Here, we figure out if we're within
+                            # line_width*px_dx of the cell edge
+                            # Midpoint of x:
+                            cx = (rxpx+lxpx)*0.5
+                            ld_x = fmin(fabs(cx - (xsp+dxsp)),
+                                        fabs(cx - (xsp-dxsp)))
+                            ld_x *= ipx_dx
+                            # Midpoint of y:
+                            cy = (rypx+lypx)*0.5
+                            ld_y = fmin(fabs(cy - (ysp+dysp)),
+                                        fabs(cy - (ysp-dysp)))
+                            ld_y *= ipx_dy
+                            if ld_x <= line_width or ld_y <= line_width:
+                                for f in range(nf):
+                                    buff[i,j,f] = 1.0
+                        elif antialias == 1:
+                            overlap1 = ((fmin(rxpx, xsp+dxsp)
+                                       - fmax(lxpx, (xsp-dxsp)))*ipx_dx)
+                            if overlap1 < 0.0: continue
+                            # This next line is not commented out because
+                            # it's an oddity; we actually want to skip
+                            # depositing if the overlap is zero, and that's
+                            # how it used to work when we were more
+                            # conservative about the iteration indices.
+                            # This will reduce artifacts if we ever move to
+                            # compositing instead of replacing bitmaps.
+                            if overlap1 * overlap2 < 1.e-6: continue
+                            for f in range(nf):
+                                buff[i,j,f] += (data[p,f] * overlap1) * overlap2
+                        else:
+                            for f in range(nf):
+                                buff[i,j,f] = data[p,f]
 
 @cython.cdivision(True)
 @cython.boundscheck(False)
@@ -1214,6 +1282,64 @@ def interpolate_sph_positions_gather(np.float64_t[:] buff,
     if use_normalization:
         normalization_1d_utility(buff, buff_den)
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def interpolate_sph_positions_gather_multi(np.float64_t[:, ::1] buff,
+        np.float64_t[:, ::1] tree_positions, np.float64_t[:, ::1] field_positions,
+        np.float64_t[:] hsml, np.float64_t[:] pmass, np.float64_t[:] pdens,
+        np.float64_t[:, ::1] quantities_to_smooth, PyKDTree kdtree,
+        int use_normalization=1, kernel_name="cubic", int num_neigh=32):
+
+    """
+    This function is interpolate_sph_positions_gather for several fields at
+    once: the nearest neighbors of each position are searched for once, and
+    used for all the fields.
+
+    The quantities to smooth have shape (number of particles, number of
+    fields), and the results are stored in the buffer, buff, of shape
+    (number of positions, number of fields).
+    """
+
+    cdef np.float64_t q_ij, h_j2, ih_j2, prefactor_j, kernel_j, den
+    cdef np.float64_t * pos_ptr
+    cdef int i, f, particle, index
+    cdef int nf = buff.shape[1]
+    cdef BoundedPriorityQueue queue = BoundedPriorityQueue(num_neigh, True)
+    cdef KDTree * ctree = kdtree._tree
+
+    if quantities_to_smooth.shape[1] != nf or \
+       field_positions.shape[0] != buff.shape[0]:
+        raise YTPixelizeError("Arrays are not of correct shape.")
+
+    # Which dimensions shall we use for spatial distances?
+    cdef axes_range axes
+    set_axes_range(&axes, -1)
+
+    kernel_func = get_kernel_func(kernel_name)
+
+    with nogil:
+        for i in range(0, buff.shape[0]):
+            queue.size = 0
+            pos_ptr = &field_positions[i, 0]
+            find_neighbors(pos_ptr, tree_positions, queue, ctree, -1, &axes)
+            h_j2 = queue.heap[0]
+            ih_j2 = 1.0/h_j2
+            den = 0.0
+            for index in range(queue.max_elements):
+                particle = queue.pids[index]
+                prefactor_j = (pmass[particle] / pdens[particle] /
+                               hsml[particle]**3)
+                q_ij = math.sqrt(queue.heap[index]*ih_j2)
+                kernel_j = kernel_func(q_ij)
+                for f in range(nf):
+                    buff[i, f] += (prefactor_j *
+                                   quantities_to_smooth[particle, f] *
+                                   kernel_j)
+                den += prefactor_j * kernel_j
+            if use_normalization and den != 0.0:
+                for f in range(nf):
+                    buff[i, f] /= den
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def interpolate_sph_grid_gather(np.float64_t[:, :, :] buff,
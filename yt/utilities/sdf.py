@@ -4,17 +4,10 @@ from io import StringIO
 import numpy as np
 
 from yt.funcs import mylog
+from yt.utilities.http_fetcher import HTTPFetcher
 
-
-def get_thingking_deps():
-    try:
-        from thingking.arbitrary_page import PageCacheURL
-        from thingking.httpmmap import HTTPArray
-    except ImportError:
-        raise ImportError(
-            "This functionality requires the thingking package to be installed"
-        )
-    return HTTPArray, PageCacheURL
+# Scattered records are fetched in pages of this many bytes
+HTTP_PAGE_SIZE = 2 ** 16
 
 
 _types = {
@@ -211,8 +204,64 @@ class DataStruct:
             return arr[mask]
 
 
+class HTTPArray:
+    """A one-dimensional array of records held in a remote file, from which
+    only the records that are indexed are fetched, with HTTP range requests.
+    """
+
+    def __init__(self, fetcher, url, dtype, shape, offset=0):
+        self.fetcher = fetcher
+        self.url = url
+        self.dtype = np.dtype(dtype)
+        self.shape = int(shape)
+        self.offset = offset
+
+    def _byte_range(self, start, stop):
+        itemsize = self.dtype.itemsize
+        return (self.offset + start * itemsize, self.offset + stop * itemsize)
+
+    def read_ranges(self, starts, stops):
+        """Returns the records from each start up to each stop, which are
+        fetched concurrently."""
+        byte_ranges = [self._byte_range(a, b) for a, b in zip(starts, stops)]
+        return self.fetcher.fetch_many(
+            [self.url] * len(byte_ranges), self.dtype, byte_ranges
+        )
+
+    def _read_records(self, inds):
+        # The pages holding the records are fetched, those that follow one
+        # another in a single request
+        per_page = max(HTTP_PAGE_SIZE // self.dtype.itemsize, 1)
+        pages = np.unique(inds // per_page)
+        breaks = np.flatnonzero(np.diff(pages) != 1) + 1
+        starts = pages[np.r_[0, breaks]] * per_page
+        stops = np.minimum((pages[np.r_[breaks - 1, -1]] + 1) * per_page, self.shape)
+        records = np.concatenate(self.read_ranges(starts, stops))
+        pos = np.cumsum(np.r_[0, stops - starts])
+        which = np.searchsorted(starts, inds, side="right") - 1
+        return records[pos[which] + inds - starts[which]]
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += self.shape
+            return self.read_ranges([key], [key + 1])[0][0]
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.shape)
+            if stop <= start:
+                return np.empty(0, dtype=self.dtype)
+            return self.read_ranges([start], [stop])[0][::step]
+        inds = np.asarray(key)
+        if inds.dtype == bool:
+            inds = np.flatnonzero(inds)
+        inds = np.where(inds < 0, inds + self.shape, inds).astype("int64")
+        if inds.size == 0:
+            return np.empty(inds.shape, dtype=self.dtype)
+        return self._read_records(inds.ravel()).reshape(inds.shape)
+
+
 class RedirectArray:
-    """docstring for RedirectArray"""
+    """A single field of the records of an HTTPArray."""
 
     def __init__(self, http_array, key):
         self.http_array = http_array
@@ -221,45 +270,50 @@ class RedirectArray:
         self.dtype = http_array.dtype[key]
 
     def __getitem__(self, sl):
-        if isinstance(sl, int):
-            return self.http_array[sl][self.key][0]
         return self.http_array[sl][self.key]
 
 
 class HTTPDataStruct(DataStruct):
-    """docstring for HTTPDataStruct"""
+    """A struct of an SDF file hosted on the internet, whose records are
+    fetched with the HTTPFetcher of its HTTPSDFRead."""
 
-    def __init__(self, *args, **kwargs):
-        super(HTTPDataStruct, self).__init__(*args, **kwargs)
-        HTTPArray, PageCacheURL = get_thingking_deps()
-        self.HTTPArray = HTTPArray
-        self.pcu = PageCacheURL(self.filename)
+    fetcher = None
 
     def set_offset(self, offset):
         self._offset = offset
         if self.size == -1:
-            # Read small piece:
-            file_size = self.pcu.total_size
+            file_size = self.fetcher.get_size(self.filename)
             file_size -= offset
             self.size = float(file_size) / self.itemsize
             assert int(self.size) == self.size
+            self.size = int(self.size)
 
     def build_memmap(self):
         assert self.size != -1
         mylog.info(
             "Building memmap with offset: %i and size %i", self._offset, self.size
         )
-        self.handle = self.HTTPArray(
-            self.filename, dtype=self.dtype, shape=self.size, offset=self._offset
+        self.handle = HTTPArray(
+            self.fetcher, self.filename, self.dtype, self.size, self._offset
         )
         for k in self.dtype.names:
             self.data[k] = RedirectArray(self.handle, k)
 
+    def prefetch(self, spans):
+        # Spans that would not fit in the cache are fetched when read instead
+        if sum(b - a for a, b in spans) * self.itemsize <= self.fetcher.cache_size:
+            self.handle.read_ranges(*zip(*spans))
+
 
 class SDFRead(dict):
 
     _eof = "SDF-EO"
     _data_struct = DataStruct
+    # The number of reads of the data that are issued at once, and the
+    # number of records between two chunks of an index below which they are
+    # read together
+    _read_batch = 1
+    _read_gap = 0
 
     def __init__(self, filename=None, header=None):
         r""" Read an SDF file, loading parameters and variables.
@@ -358,7 +412,7 @@ class SDFRead(dict):
     def parse_header(self):
         """docstring for parse_header"""
         # Pre-process
-        ascfile = open(self.header, "r")
+        ascfile = open(self.header, "r", encoding="ISO-8859-1")
         while True:
             l = ascfile.readline()
             if self._eof in l:
@@ -436,6 +490,11 @@ class SDFRead(dict):
             struct.build_memmap()
             self.update(struct.data)
 
+    def prefetch(self, spans, fields):
+        """Reads ahead the records of fields from each (start, stop) of
+        spans, so that they are readily available when indexed."""
+        pass
+
 
 class HTTPSDFRead(SDFRead):
 
@@ -475,18 +534,34 @@ class HTTPSDFRead(SDFRead):
     """
 
     _data_struct = HTTPDataStruct
+    # Records skipped over cost less than another round trip to the server
+    _read_gap = 4096
+
+    def __init__(
+        self,
+        filename=None,
+        header=None,
+        max_connections=8,
+        cache_size=2 ** 28,
+        cache_dir=None,
+    ):
+        self.fetcher = HTTPFetcher(
+            max_connections=max_connections,
+            cache_size=cache_size,
+            cache_dir=cache_dir,
+        )
+        super(HTTPSDFRead, self).__init__(filename, header=header)
 
-    def __init__(self, *args, **kwargs):
-        HTTPArray, _ = get_thingking_deps()
-        self.HTTPArray = HTTPArray
-        super(HTTPSDFRead, self).__init__(*args, **kwargs)
+    @property
+    def _read_batch(self):
+        return self.fetcher.max_connections
 
     def parse_header(self):
         """docstring for parse_header"""
         # Pre-process
-        ascfile = self.HTTPArray(self.header)
         max_header_size = 1024 * 1024
-        lines = StringIO(ascfile[:max_header_size].data[:])
+        header = self.fetcher.fetch(self.header, byte_range=(0, max_header_size))
+        lines = StringIO(header.tobytes().decode("ISO-8859-1"))
         while True:
             l = lines.readline()
             if self._eof in l:
@@ -499,6 +574,20 @@ class HTTPSDFRead(SDFRead):
             hoff = 0
         self.parameters["header_offset"] = hoff
 
+    def set_offsets(self):
+        for struct in self.structs:
+            struct.fetcher = self.fetcher
+        super(HTTPSDFRead, self).set_offsets()
+
+    def prefetch(self, spans, fields):
+        """Fetches the records of fields from each (start, stop) of spans
+        concurrently, into the cache of the fetcher."""
+        if len(spans) == 0:
+            return
+        for struct in self.structs:
+            if not set(fields).isdisjoint(struct.dtype.names):
+                struct.prefetch(spans)
+
 
 def load_sdf(filename, header=None):
     r""" Load an SDF file.
@@ -845,12 +934,7 @@ class SDFIndex:
         # a space.
         if self.valid_indexdata:
             indices = indices[indices < self._max_key]
-            # indices = indices[self.indexdata['len'][indices] > 0]
-            # Faster for sparse lookups. Need better heuristic.
-            new_indices = []
-            for ind in indices:
-                if self.indexdata["len"][ind] > 0:
-                    new_indices.append(ind)
+            # Empty chunks are skipped when the data are read
             indices = np.array(indices, dtype="int64")
 
         # indices = np.array([self.get_key_ijk(x, y, z) for x, y, z in zip(X, Y, Z)])
@@ -885,10 +969,7 @@ class SDFIndex:
         ileft = np.floor((left - self.rmin) / self.domain_width * self.domain_dims)
         iright = np.floor((right - self.rmin) / self.domain_width * self.domain_dims)
         indices = self.get_ibbox(ileft, iright)
-        npart = 0
-        for ind in indices:
-            npart += self.indexdata["len"][ind]
-        return npart
+        return self.indexdata["len"][indices].sum()
 
     def get_data(self, chunk, fields):
         data = {}
@@ -922,47 +1003,64 @@ class SDFIndex:
                 break
         return key
 
-    def iter_data(self, inds, fields):
-        num_inds = len(inds)
-        num_reads = 0
-        mylog.debug("MIDX Reading %i chunks", num_inds)
-        i = 0
-        while i < num_inds:
-            ind = inds[i]
-            base = self.indexdata["base"][ind]
-            length = self.indexdata["len"][ind]
-            # Concatenate aligned reads
-            nexti = i + 1
-            combined = 0
-            while nexti < num_inds:
-                nextind = inds[nexti]
-                # print(
-                #    "b: %i l: %i end: %i  next: %i"
-                #    % (base, length, base + length, self.indexdata["base"][nextind])
-                # )
-                if combined < 1024 and base + length == self.indexdata["base"][nextind]:
-                    length += self.indexdata["len"][nextind]
-                    i += 1
-                    nexti += 1
-                    combined += 1
+    def get_reads(self, inds):
+        """
+        Group the chunks of inds into reads of the sdf data. Each read is a
+        (start, stop, pieces) tuple, where pieces are the (start, stop) of
+        the data of the chunks within the read. Chunks that follow one another
+        within sdfdata._read_gap records are read together, up to 1024 at a
+        time.
+        """
+        inds = np.asarray(inds, dtype="int64")
+        if inds.size == 0:
+            return []
+        # The base and length of all the chunks are read at once
+        bases = np.asarray(self.indexdata["base"][inds], dtype="int64")
+        lengths = np.asarray(self.indexdata["len"][inds], dtype="int64")
+        nonzero = lengths > 0
+        bases = bases[nonzero]
+        ends = bases + lengths[nonzero]
+        max_gap = self.sdfdata._read_gap
+        reads = []
+        combined = 0
+        for base, end in zip(bases.tolist(), ends.tolist()):
+            if reads and combined < 1024 and 0 <= base - reads[-1][1] <= max_gap:
+                read = reads[-1]
+                if base == read[1]:
+                    read[2][-1] = (read[2][-1][0], end)
                 else:
-                    break
+                    read[2].append((base, end))
+                read[1] = end
+                combined += 1
+            else:
+                reads.append([base, end, [(base, end)]])
+                combined = 0
+        return [tuple(read) for read in reads]
 
-            chunk = slice(base, base + length)
+    def iter_data(self, inds, fields):
+        mylog.debug("MIDX Reading %i chunks", len(inds))
+        reads = self.get_reads(inds)
+        batch = self.sdfdata._read_batch
+        for i, (start, stop, pieces) in enumerate(reads):
+            if i % batch == 0:
+                # The next reads are fetched concurrently, for remote data
+                spans = [(a, b) for a, b, _ in reads[i : i + batch]]
+                self.sdfdata.prefetch(spans, fields)
             mylog.debug(
-                "Reading chunk %i of length %i after catting %i starting at %i",
-                i,
-                length,
-                combined,
-                ind,
+                "Reading chunk of length %i from %i, holding %i pieces",
+                stop - start,
+                start,
+                len(pieces),
             )
-            num_reads += 1
-            if length > 0:
-                data = self.get_data(chunk, fields)
-                yield data
-                del data
-            i += 1
-        mylog.debug("Read %i chunks, batched into %i reads", num_inds, num_reads)
+            data = self.get_data(slice(start, stop), fields)
+            if len(pieces) > 1:
+                # The records between the pieces were only read to save
+                # requests
+                keep = np.concatenate([np.arange(a, b) for a, b in pieces]) - start
+                data = {field: data[field][keep] for field in data}
+            yield data
+            del data
+        mylog.debug("Read %i chunks, batched into %i reads", len(inds), len(reads))
 
     def filter_particles(self, myiter, myfilter):
         for data in myiter:
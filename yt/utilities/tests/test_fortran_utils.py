@@ -0,0 +1,70 @@
+import os
+import tempfile
+
+import numpy as np
+
+from yt.testing import assert_equal, assert_raises
+from yt.utilities.cython_fortran_utils import FortranFile
+from yt.utilities.fortran_utils import MemmapFortranFile
+
+
+def _write_records(fname, records, endian="="):
+    with open(fname, "wb") as f:
+        for rec in records:
+            size = np.array([rec.nbytes], dtype=f"{endian}i4").tobytes()
+            f.write(size)
+            f.write(rec.tobytes())
+            f.write(size)
+
+
+def test_memmap_fortran_file():
+    records = [
+        np.array([3], dtype="i4"),
+        np.arange(10, dtype="f8"),
+        np.arange(5, dtype="i4"),
+        np.array([1.5, 2.5], dtype="f4"),
+    ]
+    fd, fname = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        _write_records(fname, records)
+
+        with FortranFile(fname) as ff, MemmapFortranFile(fname) as mf:
+            assert_equal(mf.read_int(), ff.read_int())
+            pos = mf.tell()
+            assert_equal(pos, ff.tell())
+            assert_equal(mf.read_vector("d"), ff.read_vector("d"))
+            mf.skip()
+            ff.skip()
+            assert_equal(mf.tell(), ff.tell())
+            assert_equal(mf.read_vector("f"), ff.read_vector("f"))
+
+            # Random access through the record table
+            offsets, sizes = mf.record_offsets()
+            assert_equal(sizes, [rec.nbytes for rec in records])
+            assert_equal(mf.read_record(2, "i"), records[2])
+            assert_equal(mf.record_index(pos), 1)
+            assert_raises(ValueError, mf.record_index, pos + 1)
+
+            # Records are zero-copy, read-only views
+            mf.seek(pos)
+            v = mf.read_vector("d")
+            assert not v.flags.writeable
+            # Wrong dtype for the record size
+            mf.seek(0)
+            assert_raises(ValueError, mf.read_vector, "d")
+    finally:
+        os.remove(fname)
+
+
+def test_memmap_fortran_file_big_endian():
+    records = [np.arange(4, dtype=">i4"), np.linspace(0, 1, 3).astype(">f8")]
+    fd, fname = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        _write_records(fname, records, endian=">")
+        with MemmapFortranFile(fname, endian=">") as f:
+            assert_equal(f.read_vector("i"), [0, 1, 2, 3])
+            assert_equal(f.read_vector("d"), [0, 0.5, 1])
+    finally:
+        os.remove(fname)
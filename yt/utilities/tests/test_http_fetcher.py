@@ -0,0 +1,98 @@
+import functools
+import os
+import re
+import shutil
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from yt.testing import assert_equal, requires_module
+from yt.utilities.http_fetcher import HTTPFetcher
+
+
+class _RangeRequestHandler(SimpleHTTPRequestHandler):
+    # Connections are kept alive, and byte ranges are served
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Range")))
+        match = re.match(r"bytes=(\d+)-(\d+)$", self.headers.get("Range") or "")
+        path = self.translate_path(self.path)
+        if not self.server.ranges or match is None or not os.path.isfile(path):
+            return super().do_GET()
+        with open(path, "rb") as f:
+            f.seek(int(match.group(1)))
+            data = f.read(int(match.group(2)) - int(match.group(1)) + 1)
+        self.send_response(206)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve_directory(root, ranges=True):
+    """Serve the files of root over HTTP, from a background thread. The
+    server records the requests it receives, and is stopped with shutdown.
+    """
+    handler = functools.partial(_RangeRequestHandler, directory=root)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    httpd.ranges = ranges
+    httpd.url = "http://127.0.0.1:%d" % httpd.server_address[1]
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+@requires_module("requests")
+def test_http_fetcher():
+    tmpdir = tempfile.mkdtemp()
+    data = np.random.random(1000)
+    data.tofile(os.path.join(tmpdir, "data"))
+    for ranges in (True, False):
+        httpd = serve_directory(tmpdir, ranges=ranges)
+        url = httpd.url + "/data"
+        fetcher = HTTPFetcher(max_connections=4)
+        assert_equal(fetcher.fetch(url, "float64", (80, 160)), data[10:20])
+        arrays = fetcher.fetch_many(
+            [url] * 3, "float64", [(0, 80), (80, 160), (160, 800)]
+        )
+        assert_equal(np.concatenate(arrays), data[:100])
+        assert_equal(fetcher.fetch(url, "float64"), data)
+        # Everything is cached after the first request of each range, or of
+        # the whole file if the server does not serve ranges
+        assert_equal(len(httpd.requests), 4 if ranges else 1)
+        httpd.shutdown()
+        httpd.server_close()
+    shutil.rmtree(tmpdir)
+
+
+@requires_module("requests")
+def test_http_fetcher_cache():
+    tmpdir = tempfile.mkdtemp()
+    for i in range(4):
+        np.full(100, i, dtype="float64").tofile(os.path.join(tmpdir, str(i)))
+    httpd = serve_directory(tmpdir)
+    cache_dir = os.path.join(tmpdir, "cache")
+
+    # The cache holds two of the responses, and the oldest are evicted
+    fetcher = HTTPFetcher(cache_size=1600, cache_dir=cache_dir)
+    for i in range(4):
+        assert_equal(fetcher.fetch(f"{httpd.url}/{i}", "float64"), i)
+    assert_equal(len(os.listdir(cache_dir)), 2)
+    fetcher.fetch(f"{httpd.url}/3", "float64")
+    fetcher.fetch(f"{httpd.url}/0", "float64")
+    assert_equal(len(httpd.requests), 5)
+    assert_equal(fetcher.total_bytes, 4000)
+
+    # Responses stored on disk are reused by other fetchers
+    fetcher = HTTPFetcher(cache_size=1600, cache_dir=cache_dir)
+    assert_equal(fetcher.fetch(f"{httpd.url}/3", "float64"), 3)
+    assert_equal(len(httpd.requests), 5)
+    httpd.shutdown()
+    httpd.server_close()
+    shutil.rmtree(tmpdir)
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+
+from yt.testing import assert_equal, fake_random_ds, requires_module
+from yt.utilities.io_handler import BaseIOHandler, index_runs, read_masked_rows
+
+FakeDataFile = namedtuple("FakeDataFile", ["filename", "start", "end"])
+
+
+def test_particle_mask_cache():
+    ds = fake_random_ds(16)
+    io = BaseIOHandler(ds)
+    np.random.seed(0x4D3D3D3)
+    pos = np.random.random((1000, 3))
+    reads = []
+
+    def read_positions():
+        reads.append(1)
+        return pos, 0.0
+
+    data_file = FakeDataFile("fake.dat", 0, 1000)
+    sp1 = ds.sphere("c", 0.25)
+    sp2 = ds.sphere("c", 0.25)
+    mask = io._get_particle_mask(sp1.selector, data_file, "io", read_positions)
+    r = np.sqrt(((pos - 0.5) ** 2).sum(axis=1))
+    assert_equal(mask, r <= 0.25)
+
+    # Masks are reused for the same selection and data file
+    mask2 = io._get_particle_mask(sp2.selector, data_file, "io", read_positions)
+    assert mask2 is mask
+    assert_equal(len(reads), 1)
+    io._get_particle_mask(sp1.selector, data_file, "other", read_positions)
+    io._get_particle_mask(ds.sphere("c", 0.3).selector, data_file, "io", read_positions)
+    assert_equal(len(reads), 3)
+
+    # The cache is bounded
+    io._max_particle_mask_bytes = mask.nbytes
+    io._get_particle_mask(ds.sphere("c", 0.2).selector, data_file, "io", read_positions)
+    assert_equal(len(io._particle_masks), 1)
+    assert_equal(io._particle_mask_bytes, mask.nbytes)
+
+
+@requires_module("h5py")
+def test_read_masked_rows():
+    import h5py
+
+    tmpdir = tempfile.mkdtemp()
+    fn = os.path.join(tmpdir, "test.h5")
+    data = np.arange(30000, dtype="float32").reshape(10000, 3)
+    with h5py.File(fn, mode="w") as f:
+        f.create_dataset("data", data=data)
+    np.random.seed(0x4D3D3D3)
+    try:
+        with h5py.File(fn, mode="r") as f:
+            dset = f["data"]
+            si, ei = 1000, 9000
+            # A few sparse runs, read one by one
+            mask = np.zeros(ei - si, dtype="bool")
+            mask[10:20] = mask[3000:3005] = mask[7990:] = True
+            # Dense random selection, read at once
+            mask2 = np.random.random(ei - si) > 0.5
+            for m in (mask, mask2, slice(None)):
+                assert_equal(read_masked_rows(dset, si, ei, m), data[si:ei][m])
+                assert_equal(
+                    read_masked_rows(dset, si, ei, m, column=1), data[si:ei, 1][m]
+                )
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_index_runs():
+    indices = np.array([12, 3, 4, 5, 40, 9, 41, 100])
+    runs = index_runs(indices)
+    assert_equal(
+        [(r[0], r[1]) for r in runs], [(3, 6), (9, 10), (12, 13), (40, 42), (100, 101)]
+    )
+    for start, stop, positions in runs:
+        assert np.all((indices[positions] >= start) & (indices[positions] < stop))
+    assert_equal(np.sort(np.concatenate([r[2] for r in runs])), np.arange(8))
+
+    # Runs closer than min_gap are merged, and runs are split at max_size
+    runs = index_runs(indices, min_gap=4)
+    assert_equal([(r[0], r[1]) for r in runs], [(3, 13), (40, 42), (100, 101)])
+    assert_equal(indices[runs[0][2]], [3, 4, 5, 9, 12])
+    runs = index_runs(indices, min_gap=4, max_size=4)
+    assert_equal(
+        [(r[0], r[1]) for r in runs], [(3, 6), (9, 10), (12, 13), (40, 42), (100, 101)]
+    )
+    assert_equal(index_runs([]), [])
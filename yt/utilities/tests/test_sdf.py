@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from yt.testing import assert_equal, requires_module
+from yt.utilities.sdf import HTTPSDFRead, SDFIndex, SDFRead, get_keyv
+from yt.utilities.tests.test_http_fetcher import serve_directory
+
+LEVEL = 3
+
+
+def _write_sdf(filename, lines, records):
+    with open(filename, "w", encoding="ISO-8859-1") as f:
+        f.write("# SDF 1.0\n")
+        f.write("parameter byteorder = little;\n")
+        for line in lines:
+            f.write(line + "\n")
+        f.write("struct {\n")
+        for name in records.dtype.names:
+            ctype = {"f4": "float", "i8": "int64_t"}[records.dtype[name].str[1:]]
+            f.write(f"\t{ctype} {name};\n")
+        f.write("}[%i];\n" % records.size)
+        f.write("#\x0c\n")
+        f.write("# SDF-EOH\n")
+    with open(filename, "ab") as f:
+        records.tofile(f)
+
+
+def _fake_sdf(tmpdir, npart=5000):
+    # Particles sorted along the Morton curve, in a unit cube split into
+    # (2**LEVEL)**3 cells, some of them empty
+    dims = 2 ** LEVEL
+    cells = np.random.randint(0, dims, size=(npart, 3))
+    cells = cells[cells[:, 0] != 3]
+    keys = get_keyv(cells.T, LEVEL)
+    order = np.argsort(keys, kind="stable")
+    cells, keys = cells[order], keys[order]
+    pos = (cells + np.random.uniform(0.1, 0.9, cells.shape)) / dims
+    data = np.empty(
+        keys.size, dtype=[("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("ident", "<i8")]
+    )
+    for i, ax in enumerate("xyz"):
+        data[ax] = pos[:, i]
+    data["ident"] = np.arange(keys.size)
+    bounds = [
+        f"double {ax}_{e} = {v};" for ax in "xyz" for e, v in (("min", 0), ("max", 1))
+    ]
+    _write_sdf(os.path.join(tmpdir, "data.sdf"), bounds, data)
+
+    index = np.zeros(
+        dims ** 3, dtype=[("index", "<i8"), ("base", "<i8"), ("len", "<i8")]
+    )
+    index["index"] = np.arange(dims ** 3)
+    index["len"] = np.bincount(keys, minlength=dims ** 3)
+    index["base"] = np.cumsum(index["len"]) - index["len"]
+    lines = ["double midx_version = 1.0;", f"int level = {LEVEL};"]
+    _write_sdf(os.path.join(tmpdir, "data.midx"), lines, index)
+    return data
+
+
+@requires_module("requests")
+def test_http_sdf():
+    tmpdir = tempfile.mkdtemp()
+    data = _fake_sdf(tmpdir)
+    httpd = serve_directory(tmpdir)
+    local = SDFIndex(
+        SDFRead(os.path.join(tmpdir, "data.sdf")),
+        SDFRead(os.path.join(tmpdir, "data.midx")),
+    )
+    remote = SDFIndex(
+        HTTPSDFRead(httpd.url + "/data.sdf"),
+        HTTPSDFRead(httpd.url + "/data.midx", max_connections=4),
+    )
+    assert_equal(remote.sdfdata["ident"][:], data["ident"])
+    assert_equal(remote.sdfdata["x"][-1], data["x"][-1])
+
+    left, right = np.array([0.1, 0.3, 0.2]), np.array([0.8, 0.6, 0.9])
+    ileft, iright = np.array([1, 2, 0]), np.array([6, 7, 5])
+    assert_equal(
+        local.get_nparticles_bbox(left, right), remote.get_nparticles_bbox(left, right)
+    )
+
+    # The chunks of the index are merged into fewer reads, which only yield
+    # the particles of the chunks
+    assert len(remote.get_reads(remote.get_ibbox(ileft, iright))) < len(
+        local.get_reads(local.get_ibbox(ileft, iright))
+    )
+    for index in (local, remote):
+        dd = list(index.iter_ibbox_data(ileft, iright, ["ident"]))
+        idents = np.concatenate([d["ident"] for d in dd])
+        cells = np.floor(np.array([data[ax] for ax in "xyz"]).T * 2 ** LEVEL)
+        inside = np.all((cells >= ileft) & (cells <= iright), axis=1)
+        assert_equal(np.sort(idents), np.flatnonzero(inside))
+
+        dd = list(index.iter_bbox_data(left, right, ["ident"]))
+        idents = np.sort(np.concatenate([d["ident"] for d in dd]))
+        pos = np.array([data[ax] for ax in "xyz"]).T
+        inside = np.all((pos >= left) & (pos < right), axis=1)
+        assert_equal(idents, np.flatnonzero(inside))
+
+    # Everything was read once, over few requests
+    nrequests = len(httpd.requests)
+    assert nrequests < 20
+    list(remote.iter_bbox_data(left, right, ["x", "y", "z", "ident"]))
+    assert_equal(len(httpd.requests), nrequests)
+    httpd.shutdown()
+    httpd.server_close()
+    shutil.rmtree(tmpdir)
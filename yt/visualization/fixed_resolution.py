@@ -93,6 +93,9 @@ class FixedResolutionBuffer:
         ("index", "theta"),
         ("index", "dtheta"),
     )
+    # Whether load_fields pixelizes the fields together; subclasses that
+    # make their images in __getitem__ make them one at a time
+    _batched_pixelization = True
 
     def __init__(self, data_source, bounds, buff_size, antialias=True, periodic=False):
         self.data_source = data_source
@@ -131,45 +134,74 @@ class FixedResolutionBuffer:
     def __getitem__(self, item):
         if item in self.data:
             return self.data[item]
-        mylog.info(
-            "Making a fixed resolution buffer of (%s) %d by %d",
-            item,
-            self.buff_size[0],
-            self.buff_size[1],
-        )
+        self.load_fields([item])
+        return self.data[item]
+
+    def load_fields(self, fields):
+        r"""Pixelize several fields at once.
+
+        The images of all the fields not already in the buffer are made
+        together, which for grid data takes a single pass over the cells of
+        the data source rather than one pass per field.
+
+        Parameters
+        ----------
+        fields : list of fields
+            The fields to pixelize.
+
+        Examples
+        --------
+        >>> sl = ds.slice(2, 0.5)
+        >>> frb = FixedResolutionBuffer(sl, (0.2, 0.3, 0.4, 0.5), (1024, 1024))
+        >>> frb.load_fields(["density", "temperature"])
+        """
+        items = [f for f in dict.fromkeys(iter_fields(fields)) if f not in self.data]
+        if len(items) == 0:
+            return
+        if not self._batched_pixelization:
+            for item in items:
+                self[item]
+            return
+        for item in items:
+            mylog.info(
+                "Making a fixed resolution buffer of (%s) %d by %d",
+                item,
+                self.buff_size[0],
+                self.buff_size[1],
+            )
         bounds = []
         for b in self.bounds:
             if hasattr(b, "in_units"):
                 b = float(b.in_units("code_length"))
             bounds.append(b)
 
-        buff = self.ds.coordinates.pixelize(
+        buffs = self.ds.coordinates.pixelize_fields(
             self.data_source.axis,
             self.data_source,
-            item,
+            items,
             bounds,
             self.buff_size,
             int(self.antialias),
         )
 
-        for name, (args, kwargs) in self._filters:
-            buff = filter_registry[name](*args[1:], **kwargs).apply(buff)
-
-        # FIXME FIXME FIXME we shouldn't need to do this for projections
-        # but that will require fixing data object access for particle
-        # projections
-        try:
-            if hasattr(item, "name"):
-                it = item.name
-            else:
-                it = item
-            units = self.data_source._projected_units[it]
-        except (KeyError, AttributeError):
-            units = self.data_source[item].units
-
-        ia = ImageArray(buff, units=units, info=self._get_info(item))
-        self.data[item] = ia
-        return self.data[item]
+        for item, buff in zip(items, buffs):
+            for name, (args, kwargs) in self._filters:
+                buff = filter_registry[name](*args[1:], **kwargs).apply(buff)
+
+            # FIXME FIXME FIXME we shouldn't need to do this for projections
+            # but that will require fixing data object access for particle
+            # projections
+            try:
+                if hasattr(item, "name"):
+                    it = item.name
+                else:
+                    it = item
+                units = self.data_source._projected_units[it]
+            except (KeyError, AttributeError):
+                units = self.data_source[item].units
+
+            ia = ImageArray(buff, units=units, info=self._get_info(item))
+            self.data[item] = ia
 
     def __setitem__(self, item, val):
         self.data[item] = val
@@ -178,9 +210,13 @@ class FixedResolutionBuffer:
         exclude = self.data_source._key_fields + list(self._exclude_fields)
         fields = getattr(self.data_source, "fields", [])
         fields += getattr(self.data_source, "field_data", {}).keys()
-        for f in fields:
-            if f not in exclude and f[0] not in self.data_source.ds.particle_types:
-                self[f]
+        self.load_fields(
+            [
+                f
+                for f in fields
+                if f not in exclude and f[0] not in self.data_source.ds.particle_types
+            ]
+        )
 
     def _get_info(self, item):
         info = {}
@@ -582,6 +618,8 @@ class CylindricalFixedResolutionBuffer(FixedResolutionBuffer):
     that supports non-aligned input data objects, primarily cutting planes.
     """
 
+    _batched_pixelization = False
+
     def __init__(self, data_source, radius, buff_size, antialias=True):
 
         self.data_source = data_source
@@ -619,6 +657,8 @@ class OffAxisProjectionFixedResolutionBuffer(FixedResolutionBuffer):
     that supports off axis projections.  This calls the volume renderer.
     """
 
+    _batched_pixelization = False
+
     def __init__(self, data_source, bounds, buff_size, antialias=True, periodic=False):
         self.data = {}
         FixedResolutionBuffer.__init__(
@@ -671,6 +711,8 @@ class ParticleImageBuffer(FixedResolutionBuffer):
 
     """
 
+    _batched_pixelization = False
+
     def __init__(self, data_source, bounds, buff_size, antialias=True, periodic=False):
         self.data = {}
         FixedResolutionBuffer.__init__(
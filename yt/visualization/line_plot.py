@@ -2,7 +2,7 @@ from collections import defaultdict
 
 import numpy as np
 
-from yt.funcs import is_sequence, mylog
+from yt.funcs import is_sequence, iter_fields, mylog
 from yt.units.unit_object import Unit
 from yt.units.yt_array import YTArray
 from yt.visualization.base_plot_types import PlotMPL
@@ -63,17 +63,53 @@ class LineBuffer:
     def __getitem__(self, item):
         if item in self.data:
             return self.data[item]
-        mylog.info("Making a line buffer with %d points of %s", self.npoints, item)
-        self.points, self.data[item] = self.ds.coordinates.pixelize_line(
-            item, self.start_point, self.end_point, self.npoints
-        )
-
+        self.load_fields([item])
         return self.data[item]
 
+    def load_fields(self, fields):
+        r"""Sample several fields along the line at once.
+
+        Parameters
+        ----------
+        fields : list of fields
+            The fields to sample.
+
+        Examples
+        --------
+        >>> lb = yt.LineBuffer(ds, (.25, 0, 0), (.25, 1, 0), 100)
+        >>> lb.load_fields(["density", "temperature"])
+        """
+        _load_lines([self], fields)
+
     def __delitem__(self, item):
         del self.data[item]
 
 
+def _load_lines(lines, fields):
+    # Sample the fields missing from several line buffers, locating the
+    # points of all the lines of a dataset with a single query
+    fields = list(iter_fields(fields))
+    lines_by_ds = defaultdict(list)
+    for line in lines:
+        missing = [f for f in fields if f not in line.data]
+        if len(missing) == 0:
+            continue
+        for field in missing:
+            mylog.info("Making a line buffer with %d points of %s", line.npoints, field)
+        lines_by_ds[id(line.ds)].append(line)
+    for ds_lines in lines_by_ds.values():
+        ds = ds_lines[0].ds
+        arc_lengths, values = ds.coordinates.pixelize_lines(
+            fields,
+            [(line.start_point, line.end_point, line.npoints) for line in ds_lines],
+        )
+        for line, x, line_values in zip(ds_lines, arc_lengths, values):
+            line.points = x
+            for field, y in zip(fields, line_values):
+                if field not in line.data:
+                    line.data[field] = y
+
+
 class LinePlotDictionary(PlotDictionary):
     def __init__(self, data_source):
         super(LinePlotDictionary, self).__init__(data_source)
@@ -293,6 +329,7 @@ class LinePlot(PlotContainer):
             return
         for plot in self.plots.values():
             plot.axes.cla()
+        _load_lines(self.lines, self.fields)
         for line in self.lines:
             dimensions_counter = defaultdict(int)
             for field in self.fields:
@@ -305,10 +342,8 @@ class LinePlot(PlotContainer):
                 # get plot instance
                 plot = self._get_plot_instance(field)
 
-                # calculate x and y
-                x, y = self.ds.coordinates.pixelize_line(
-                    field, line.start_point, line.end_point, line.npoints
-                )
+                # get x and y
+                x, y = line.points, line[field]
 
                 # scale x and y to proper units
                 if self._x_unit is None:
@@ -1,4 +1,8 @@
+import hashlib
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from functools import wraps
 
 import bottle
@@ -11,6 +15,9 @@ from yt.visualization.image_writer import apply_colormap
 
 local_dir = os.path.dirname(__file__)
 
+# The size of the tiles, in pixels
+TILE_SIZE = 256
+
 
 def exc_writeout(f):
     import traceback
@@ -27,10 +34,126 @@ def exc_writeout(f):
     return func
 
 
+class TileCache:
+    """A least-recently-used cache of rendered tiles.
+
+    Parameters
+    ----------
+    max_tiles : int, optional
+        The maximum number of tiles kept in memory.
+    cache_dir : str, optional
+        If set, the tiles are also written to this directory, so that they
+        survive restarts of the server.
+    """
+
+    def __init__(self, max_tiles=1024, cache_dir=None):
+        self.max_tiles = max_tiles
+        self.cache_dir = cache_dir
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._tiles or (
+            self.cache_dir is not None and os.path.exists(self._path(key))
+        )
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, *[str(k) for k in key]) + ".png"
+
+    def _store(self, key, tile):
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+
+    def get(self, key):
+        """Return a tile, or None if it is not cached."""
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                tile = f.read()
+        except OSError:
+            return None
+        self._store(key, tile)
+        return tile
+
+    def set(self, key, tile):
+        self._store(key, tile)
+        if self.cache_dir is None:
+            return
+        fn = self._path(key)
+        tmp_fname = f"{fn}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(fn), exist_ok=True)
+            with open(tmp_fname, "wb") as f:
+                f.write(tile)
+            os.replace(tmp_fname, fn)
+        except OSError:
+            # The tile is still cached in memory, so pass if writing it
+            # fails.
+            if os.path.exists(tmp_fname):
+                os.remove(tmp_fname)
+
+
 class PannableMapServer:
+    """Serve the tiles of a slice or projection to a Leaflet map.
+
+    The tiles are rendered by a pool of threads and kept in a
+    :class:`TileCache`, and concurrent requests for the same tile share the
+    same rendering.
+
+    Parameters
+    ----------
+    data : YTSelectionContainer2D
+        The slice or projection to serve.
+    field : str or tuple of str
+        The field initially displayed.
+    takelog : bool
+        Whether to use a logarithmic color scale.
+    cmap : str
+        The name of the colormap.
+    route_prefix : str, optional
+        The prefix of the routes of the server.
+    cache_dir : str, optional
+        A directory where rendered tiles are stored, in a subdirectory
+        specific to the dataset file and to the parameters of data.
+    max_tiles : int, optional
+        The maximum number of tiles cached in memory.
+    nworkers : int, optional
+        The number of threads rendering tiles. Defaults to the number of
+        CPUs.
+
+    The image cache of the dataset (see ``Dataset.image_cache``) is enabled
+    if the configuration leaves it disabled. Call :meth:`shutdown` to stop
+    the threads rendering tiles once the server has stopped.
+    """
+
     _widget_name = "pannable_map"
+    # The size of the image cache of the dataset, in bytes, when it is not
+    # enabled by the configuration
+    _image_cache_size = 128 * 1024 ** 2
+    # The number of tiles along each side of the blocks pixelized at once
+    # by precompute
+    _precompute_block = 8
 
-    def __init__(self, data, field, takelog, cmap, route_prefix=""):
+    def __init__(
+        self,
+        data,
+        field,
+        takelog,
+        cmap,
+        route_prefix="",
+        cache_dir=None,
+        max_tiles=1024,
+        nworkers=None,
+    ):
         self.data = data
         self.ds = data.ds
         self.field = field
@@ -48,7 +171,21 @@ class PannableMapServer:
         bottle.route(f"{route_prefix}/static/:path", "GET")(self.static)
 
         self.takelog = takelog
-        self._lock = False
+        # Tiles reuse the images of the blocks pixelized by precompute and
+        # of the neighbouring tiles
+        if not self.ds.image_cache.enabled:
+            self.ds.image_cache.max_bytes = self._image_cache_size
+        # Protects the data object, which is not thread-safe, so the data is
+        # only read while holding it
+        self._lock = threading.Lock()
+        self._color_bounds = {}
+
+        if cache_dir is not None:
+            cache_dir = os.path.join(cache_dir, self._cache_key())
+        self.tiles = TileCache(max_tiles=max_tiles, cache_dir=cache_dir)
+        self._executor = ThreadPoolExecutor(max_workers=nworkers)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
 
         for unit in ["Gpc", "Mpc", "kpc", "pc"]:
             v = self.ds.domain_width[0].in_units(unit).value
@@ -57,62 +194,156 @@ class PannableMapServer:
         self.unit = unit
         self.px2unit = self.ds.domain_width[0].in_units(unit).value / 256
 
-    def lock(self):
-        import time
+    def _cache_key(self):
+        # The tiles depend on the file the dataset was read from and on the
+        # parameters of the data object and of the data sources it was
+        # selected from
+        s = [os.path.abspath(self.ds.parameter_filename), self.ds._hash()]
+        data = self.data
+        while data is not None:
+            s.append(repr(data))
+            data = getattr(data, "data_source", getattr(data, "_data_source", None))
+        return hashlib.md5(";".join(s).encode("utf-8")).hexdigest()
 
-        while self._lock:
-            time.sleep(0.01)
-        self._lock = True
+    def shutdown(self, wait=True):
+        """Stop the threads rendering tiles."""
+        self._executor.shutdown(wait=wait)
+
+    def lock(self):
+        self._lock.acquire()
 
     def unlock(self):
-        self._lock = False
+        self._lock.release()
 
-    def map(self, field, L, x, y):
-        if "," in field:
-            field = tuple(field.split(","))
-        cmap = self.cmap
-        dd = 1.0 / (2.0 ** (int(L)))
-        relx = int(x) * dd
-        rely = int(y) * dd
+    def _tile_key(self, field, L, x, y):
+        if isinstance(field, tuple):
+            field = ",".join(field)
+        scale = "log" if self.takelog else "linear"
+        return (field, f"{self.cmap}_{scale}", L, x, y)
+
+    def _get_color_bounds(self, field, L):
+        # The color bounds only depend on the level, so they are shared by
+        # all the tiles of a level
+        with self._lock:
+            if (field, L) not in self._color_bounds:
+                dd = 1.0 / (2.0 ** L)
+                DW = self.ds.domain_right_edge - self.ds.domain_left_edge
+                self._color_bounds[field, L] = get_color_bounds(
+                    self.data["px"],
+                    self.data["py"],
+                    self.data["pdx"],
+                    self.data["pdy"],
+                    self.data[field],
+                    self.ds.domain_left_edge[0],
+                    self.ds.domain_right_edge[0],
+                    self.ds.domain_left_edge[1],
+                    self.ds.domain_right_edge[1],
+                    dd * DW[0] / (64 * 256),
+                    dd * DW[0],
+                )
+            return self._color_bounds[field, L]
+
+    def _pixelize(self, field, L, x, y, ntiles=1):
+        # Pixelize a square of ntiles by ntiles tiles, starting at tile (x, y)
+        dd = 1.0 / (2.0 ** L)
         DW = self.ds.domain_right_edge - self.ds.domain_left_edge
-        xl = self.ds.domain_left_edge[0] + relx * DW[0]
-        yl = self.ds.domain_left_edge[1] + rely * DW[1]
-        xr = xl + dd * DW[0]
-        yr = yl + dd * DW[1]
-        try:
-            self.lock()
-            w = 256  # pixels
-            data = self.data[field]
-            frb = FixedResolutionBuffer(self.data, (xl, xr, yl, yr), (w, w))
-            cmi, cma = get_color_bounds(
-                self.data["px"],
-                self.data["py"],
-                self.data["pdx"],
-                self.data["pdy"],
-                data,
-                self.ds.domain_left_edge[0],
-                self.ds.domain_right_edge[0],
-                self.ds.domain_left_edge[1],
-                self.ds.domain_right_edge[1],
-                dd * DW[0] / (64 * 256),
-                dd * DW[0],
-            )
-        finally:
-            self.unlock()
+        xl = self.ds.domain_left_edge[0] + x * dd * DW[0]
+        yl = self.ds.domain_left_edge[1] + y * dd * DW[1]
+        xr = xl + ntiles * dd * DW[0]
+        yr = yl + ntiles * dd * DW[1]
+        self._get_color_bounds(field, L)
+        w = ntiles * TILE_SIZE
+        frb = FixedResolutionBuffer(self.data, (xl, xr, yl, yr), (w, w))
+        # The colormapping and the encoding of the tiles run concurrently
+        with self._lock:
+            return frb[field]
 
+    def _render_tile(self, key, field, L, image):
+        cmi, cma = self._get_color_bounds(field, L)
         if self.takelog:
             cmi = np.log10(cmi)
             cma = np.log10(cma)
             to_plot = apply_colormap(
-                np.log10(frb[field]), color_bounds=(cmi, cma), cmap_name=cmap
+                np.log10(image), color_bounds=(cmi, cma), cmap_name=self.cmap
             )
         else:
             to_plot = apply_colormap(
-                frb[field], color_bounds=(cmi, cma), cmap_name=cmap
+                image, color_bounds=(cmi, cma), cmap_name=self.cmap
             )
+        tile = write_png_to_string(to_plot)
+        self.tiles.set(key, tile)
+        return tile
+
+    def get_tile(self, field, L, x, y):
+        """Return the PNG image of a tile, rendering it if needed."""
+        key = self._tile_key(field, L, x, y)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            return tile
+        with self._pending_lock:
+            future = self._pending.get(key)
+            submitted = future is None
+            if submitted:
+                future = self._executor.submit(
+                    lambda: self._render_tile(
+                        key, field, L, self._pixelize(field, L, x, y)
+                    )
+                )
+                self._pending[key] = future
+        # The callback runs right away if the tile is already rendered, so it
+        # is only added once the lock is released
+        if submitted:
+            future.add_done_callback(lambda _: self._pop_pending(key))
+        return future.result()
 
-        rv = write_png_to_string(to_plot)
-        return rv
+    def _pop_pending(self, key):
+        with self._pending_lock:
+            self._pending.pop(key, None)
+
+    def precompute(self, max_level, field=None):
+        """Render all the tiles of the levels up to max_level.
+
+        The levels are pixelized in blocks of at most _precompute_block by
+        _precompute_block tiles, whose tiles are then rendered by the pool
+        of threads. Tiles already cached are skipped.
+        """
+        if field is None:
+            field = self.field
+        for L in range(max_level + 1):
+            ntiles = 2 ** L
+            nblock = min(self._precompute_block, ntiles)
+            for bx in range(0, ntiles, nblock):
+                for by in range(0, ntiles, nblock):
+                    self._precompute_block_tiles(field, L, bx, by, nblock)
+
+    def _precompute_block_tiles(self, field, L, bx, by, nblock):
+        todo = [
+            (x, y)
+            for x in range(bx, bx + nblock)
+            for y in range(by, by + nblock)
+            if self._tile_key(field, L, x, y) not in self.tiles
+        ]
+        if not todo:
+            return
+        image = self._pixelize(field, L, bx, by, ntiles=nblock)
+        futures = []
+        for x, y in todo:
+            tile = image[
+                (y - by) * TILE_SIZE : (y - by + 1) * TILE_SIZE,
+                (x - bx) * TILE_SIZE : (x - bx + 1) * TILE_SIZE,
+            ]
+            key = self._tile_key(field, L, x, y)
+            futures.append(
+                self._executor.submit(self._render_tile, key, field, L, tile)
+            )
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def map(self, field, L, x, y):
+        if "," in field:
+            field = tuple(field.split(","))
+        return self.get_tile(field, int(L), int(x), int(y))
 
     def index(self, field=None):
         if field is not None:
@@ -299,6 +299,7 @@ class PlotWindow(ImagePlotContainer):
             self._frb._get_data_source_fields()
         else:
             # Restore the old fields
+            self._frb.load_fields(old_fields)
             for key, unit in zip(old_fields, old_units):
                 self._frb[key]
                 equiv = self._equivalencies[key]
@@ -905,7 +906,10 @@ class PWViewerMPL(PlotWindow):
             self._recreate_frb()
             self._data_valid = True
         self._colorbar_valid = True
-        for f in list(set(self.data_source._determine_fields(self.fields))):
+        fields = list(set(self.data_source._determine_fields(self.fields)))
+        # Make the images of all the plotted fields at once
+        self.frb.load_fields(fields)
+        for f in fields:
             axis_index = self.data_source.axis
 
             xc, yc = self._setup_origin()
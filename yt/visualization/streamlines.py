@@ -1,7 +1,7 @@
 import numpy as np
 
 from yt.data_objects.construction_data_containers import YTStreamline
-from yt.funcs import get_pbar
+from yt.funcs import get_num_threads, get_pbar
 from yt.units.yt_array import YTArray
 from yt.utilities.amr_kdtree.api import AMRKDTree
 from yt.utilities.parallel_tools.parallel_analysis_interface import (
@@ -142,18 +142,39 @@ class Streamlines(ParallelAnalysisInterface):
         my_rank = self.comm.rank
         self.streamlines[my_rank::nprocs, 0, :] = self.start_positions[my_rank::nprocs]
 
-        pbar = get_pbar("Streamlining", self.N)
-        for i, stream in enumerate(self.streamlines[my_rank::nprocs]):
-            thismag = None
-            if self.get_magnitude:
-                thismag = self.magnitudes[i, :]
-            step = self.steps
-            while step > 1:
-                this_node = self.volume.locate_node(stream[-step, :])
-                step = self._integrate_through_brick(
-                    this_node, stream, step, mag=thismag
+        LE = self.ds.domain_left_edge.d
+        RE = self.ds.domain_right_edge.d
+        num_threads = int(get_num_threads())
+        # The number of steps left for each streamline, so that the current
+        # position of streamline i is self.streamlines[i, -steps[i]]
+        steps = np.full(self.N, self.steps, dtype="int64")
+        seeds = np.arange(my_rank, self.N, nprocs, dtype="int64")
+        pbar = get_pbar("Streamlining", seeds.size)
+        nseeds = seeds.size
+        seeds = seeds[steps[seeds] > 1]
+        while seeds.size > 0:
+            # Group the streamlines by the brick containing their current
+            # position, and advance each group until it leaves its brick
+            pos = self.streamlines[seeds, self.steps - steps[seeds]]
+            node_ids = self.volume.tree.trunk.find_node_ids(pos)
+            order = np.argsort(node_ids, kind="stable")
+            node_ids, starts = np.unique(node_ids[order], return_index=True)
+            for node_id, node_seeds in zip(
+                node_ids, np.split(seeds[order], starts[1:])
+            ):
+                brick = self.volume.get_brick_data(self.volume.get_node(node_id))
+                brick.integrate_streamlines(
+                    self.streamlines,
+                    self.magnitudes,
+                    node_seeds,
+                    steps,
+                    self.direction * self.dx,
+                    LE,
+                    RE,
+                    num_threads=num_threads,
                 )
-            pbar.update(i)
+            seeds = seeds[steps[seeds] > 1]
+            pbar.update(nseeds - seeds.size)
         pbar.finish()
 
         self._finalize_parallel(None)
@@ -169,35 +190,6 @@ class Streamlines(ParallelAnalysisInterface):
         if self.get_magnitude:
             self.magnitudes = self.comm.mpi_allreduce(self.magnitudes, op="sum")
 
-    def _integrate_through_brick(self, node, stream, step, periodic=False, mag=None):
-        LE = self.ds.domain_left_edge.d
-        RE = self.ds.domain_right_edge.d
-        while step > 1:
-            self.volume.get_brick_data(node)
-            brick = node.data
-            stream[-step + 1] = stream[-step]
-            if mag is None:
-                brick.integrate_streamline(
-                    stream[-step + 1], self.direction * self.dx, None
-                )
-            else:
-                marr = [mag]
-                brick.integrate_streamline(
-                    stream[-step + 1], self.direction * self.dx, marr
-                )
-                mag[-step + 1] = marr[0]
-
-            cur_stream = stream[-step + 1, :]
-            if np.sum(np.logical_or(cur_stream < LE, cur_stream >= RE)):
-                return 0
-
-            nLE = node.get_left_edge()
-            nRE = node.get_right_edge()
-            if np.sum(np.logical_or(cur_stream < nLE, cur_stream >= nRE)):
-                return step - 1
-            step -= 1
-        return step
-
     def clean_streamlines(self):
         temp = np.empty(self.N, dtype="object")
         temp2 = np.empty(self.N, dtype="object")
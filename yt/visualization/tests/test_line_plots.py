@@ -2,7 +2,13 @@ from nose.plugins.attrib import attr
 from nose.tools import assert_raises
 
 import yt
-from yt.testing import ANSWER_TEST_TAG, assert_equal, fake_random_ds
+from yt.testing import (
+    ANSWER_TEST_TAG,
+    assert_allclose_units,
+    assert_equal,
+    fake_amr_ds,
+    fake_random_ds,
+)
 from yt.utilities.answer_testing.framework import GenericImageTest
 from yt.visualization.line_plot import _validate_point
 
@@ -75,6 +81,26 @@ def test_line_buffer():
     assert_equal(set(lb.keys()), set(["density"]))
 
 
+def test_line_buffer_sampling():
+    # Lines sampled together match the values sampled from rays
+    from yt.geometry.coordinates.cartesian_coordinates import _sample_ray
+
+    ds = fake_amr_ds(fields=["density", "velocity_x"])
+    fields = [("stream", "density"), ("stream", "velocity_x")]
+    lines = [
+        yt.LineBuffer(ds, (0.1, 0.13, 0.2), (0.9, 0.71, 0.6), 100),
+        yt.LineBuffer(ds, (0.43, 0.05, 0.91), (0.57, 0.97, 0.11), 150),
+    ]
+    lines[0].load_fields(fields[:1])
+    plot = yt.LinePlot.from_lines(ds, fields, lines)
+    for line in plot.lines:
+        ray = ds.ray(line.start_point, line.end_point)
+        for field in fields:
+            x, y = _sample_ray(ray, line.npoints, field)
+            assert_allclose_units(line.points, x)
+            assert_equal(line[field], y)
+
+
 def test_validate_point():
     ds = fake_random_ds(3)
     with assert_raises(RuntimeError) as ex:
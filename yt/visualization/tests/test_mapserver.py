@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+from yt.testing import assert_equal, fake_random_ds, requires_module
+
+
+@requires_module("bottle")
+def test_precompute_tiles():
+    from yt.visualization.mapserver.pannable_map import PannableMapServer
+
+    ds = fake_random_ds(16)
+    proj = ds.proj("density", 2)
+    server = PannableMapServer(proj, "density", True, "viridis", max_tiles=64)
+    server._precompute_block = 2
+    server.precompute(2)
+    assert_equal(len(server.tiles._tiles), 1 + 4 + 16)
+
+    # The precomputed tiles are the ones rendered on demand
+    fresh = PannableMapServer(proj, "density", True, "viridis")
+    for L, x, y in ((0, 0, 0), (1, 1, 0), (2, 0, 3), (2, 3, 1)):
+        key = server._tile_key("density", L, x, y)
+        assert_equal(fresh.get_tile("density", L, x, y), server.tiles.get(key))
+
+    # and are served again from the cache, without being rendered
+    def _pixelize(*args, **kwargs):
+        raise RuntimeError("The tile should be cached")
+
+    fresh._pixelize = _pixelize
+    fresh.get_tile("density", 2, 3, 1)
+
+
+@requires_module("bottle")
+def test_tile_cache_dir():
+    from yt.visualization.mapserver.pannable_map import PannableMapServer
+
+    # Projections of different data sources do not share their tiles
+    ds = fake_random_ds(16)
+    projs = [
+        ds.proj("density", 2),
+        ds.proj("density", 2, data_source=ds.box([0.0] * 3, [0.5] * 3)),
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        servers = [
+            PannableMapServer(proj, "density", True, "viridis", cache_dir=tmpdir)
+            for proj in projs
+        ]
+        assert servers[0].tiles.cache_dir != servers[1].tiles.cache_dir
+        for server in servers:
+            server.get_tile("density", 0, 0, 0)
+            server.shutdown()
+        assert_equal(len(os.listdir(tmpdir)), 2)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from yt.loaders import load_uniform_grid
+from yt.testing import assert_array_almost_equal, assert_equal
+from yt.visualization.api import Streamlines
+
+
+def _uniform_field_streamlines(nprocs, pos):
+    shape = (16, 16, 16)
+    data = {
+        "velocity_x": (np.ones(shape), "cm/s"),
+        "velocity_y": (np.zeros(shape), "cm/s"),
+        "velocity_z": (np.zeros(shape), "cm/s"),
+    }
+    ds = load_uniform_grid(data, shape, nprocs=nprocs)
+    streamlines = Streamlines(
+        ds,
+        pos,
+        "velocity_x",
+        "velocity_y",
+        "velocity_z",
+        length=0.5,
+        get_magnitude=True,
+    )
+    streamlines.integrate_through_volume()
+    return streamlines
+
+
+def test_streamlines_uniform_field():
+    # Streamlines of a uniform field are straight lines, which stop once
+    # they leave the domain
+    pos = np.array([[0.1, 0.2, 0.3], [0.55, 0.5, 0.5], [0.9, 0.7, 0.1]])
+    streamlines = _uniform_field_streamlines(1, pos)
+    dx = streamlines.dx
+    for stream, mag, p in zip(streamlines.streamlines.d, streamlines.magnitudes.d, pos):
+        expected = np.tile(p, (streamlines.steps, 1))
+        expected[:, 0] += dx * np.arange(streamlines.steps)
+        inside = expected[:, 0] < 1.0
+        assert_array_almost_equal(stream[inside], expected[inside])
+        assert_array_almost_equal(mag[1:][inside[1:]], 1.0)
+        assert_equal(stream[inside.sum() + 1 :], 0.0)
+
+    # Streamlines crossing several bricks are integrated through all of them
+    streamlines = _uniform_field_streamlines(8, pos)
+    for stream, p in zip(streamlines.streamlines.d, pos):
+        stream = stream[np.all(stream != 0.0, axis=1)]
+        assert_equal(stream[:, 1:], np.tile(p[1:], (stream.shape[0], 1)))
+        assert np.all(np.diff(stream[:, 0]) > 0)
+        assert stream.shape[0] == streamlines.steps or stream[-1, 0] >= 1.0